@@ -0,0 +1,368 @@
+"""
+=============================================================================
+THE THIRD BACKEND: SUBINTERPRETERS WITH A PER-INTERPRETER GIL
+=============================================================================
+
+Where We Are:
+-------------
+So far we have seen two ways to run work in parallel:
+  - Threads   (01-09): cheap to start, share memory, but share ONE GIL
+  - Processes (02, 04, 10-12): own GIL each, but heavy to start and
+                                 every argument/result must be pickled
+
+New CPython (3.14+) adds a THIRD option: SUBINTERPRETERS.
+A subinterpreter is a second, fully isolated Python interpreter living
+inside the SAME process. Since PEP 684 every subinterpreter can own its
+OWN GIL, so threads driving different interpreters run truly in parallel.
+
+How It Compares:
+----------------
+    ┌────────────────────────────────────────────────────────────────────┐
+    │  ONE OS PROCESS                                                    │
+    │                                                                    │
+    │  ┌────────────────┐  ┌────────────────┐  ┌────────────────┐        │
+    │  │ Interpreter 1  │  │ Interpreter 2  │  │ Interpreter 3  │        │
+    │  │ Own GIL        │  │ Own GIL        │  │ Own GIL        │        │
+    │  │ Own modules    │  │ Own modules    │  │ Own modules    │        │
+    │  │ (thread 1)     │  │ (thread 2)     │  │ (thread 3)     │        │
+    │  └────────────────┘  └────────────────┘  └────────────────┘        │
+    │           ↑                   ↑                   ↑                │
+    │           └──── TRUE PARALLELISM, NO fork/spawn ──┘                │
+    └────────────────────────────────────────────────────────────────────┘
+
+    Threads:          1 interpreter,  1 GIL  → no CPU parallelism
+    Processes:        N interpreters, N GILs → parallel, heavy startup
+    Subinterpreters:  N interpreters, N GILs → parallel, lighter startup
+
+This Script Demonstrates:
+-------------------------
+  - SubinterpreterExecutor: a concurrent.futures.Executor whose workers
+    are subinterpreters (same submit()/map() API as the other pools)
+  - It runs the SAME callables as cpu_heavy (10_process_two.py) and
+    crunch_number (04_gil_multiprocessing.py)
+  - A benchmark of startup time, memory per worker and throughput for
+    threads vs processes vs subinterpreters
+
+Requirements:
+-------------
+The `concurrent.interpreters` module ships with Python 3.14+. On older
+versions the `interpreters` backport (pip install interpreters-pep-734)
+provides the same API. Without either, the benchmark still runs the
+thread and process backends and tells you what is missing.
+
+=============================================================================
+"""
+
+import os                                 # For cpu_count() and getpid()
+import queue                              # Work queue feeding the workers
+import sys                                # For the interpreter version check
+import threading                          # One driver thread per interpreter
+import time                               # For measuring execution time
+from concurrent.futures import (
+    Executor,                             # Base class for our new backend
+    Future,                               # What submit() hands back
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from multiprocessing import active_children  # To find the pool's workers
+
+try:
+    from concurrent import interpreters   # Python 3.14+
+except ImportError:
+    try:
+        import interpreters               # PyPI backport of PEP 734
+    except ImportError:
+        interpreters = None
+
+
+# =============================================================================
+# THE WORKLOADS (same callables as the earlier lessons)
+# =============================================================================
+# These are the loops from 10_process_two.py and 04_gil_multiprocessing.py,
+# with the iteration count turned into an argument and the result returned
+# so every backend can be checked for the same answer.
+
+def cpu_heavy(n=10**9):
+    """
+    Sums the numbers from 0 to n (the loop from 10_process_two.py).
+
+    Args:
+        n (int): How many numbers to add up
+
+    Returns:
+        int: The total
+    """
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+def crunch_number(n=100_000_000):
+    """
+    Counts to n one step at a time (the loop from 04_gil_multiprocessing.py).
+
+    Args:
+        n (int): How far to count
+
+    Returns:
+        int: The final count
+    """
+    count = 0
+    for _ in range(n):
+        count += 1
+    return count
+
+
+def warm_up(_=None):
+    """A no-op task used to make sure every worker is fully started."""
+    return os.getpid()
+
+
+# =============================================================================
+# SUBINTERPRETER EXECUTOR
+# =============================================================================
+#
+# Design:
+#   - `max_workers` subinterpreters are created up front
+#   - each one is driven by its own Python thread
+#   - the threads pull (future, fn, args, kwargs) items from ONE shared
+#     queue and run them with interp.call(fn, *args, **kwargs)
+#
+# interp.call() runs the function INSIDE the subinterpreter, which holds
+# its own GIL, so the driver threads do not block each other.
+#
+# Just like multiprocessing's "spawn" start method, a fresh interpreter
+# starts with an empty __main__. We re-run the main script there under the
+# name "__mp_main__" so functions defined in it (cpu_heavy, ...) can be
+# found. That is why the `if __name__ == "__main__"` guard is REQUIRED.
+
+_SHUTDOWN = object()  # Sentinel that tells a driver thread to exit
+
+
+class SubinterpreterExecutor(Executor):
+    """
+    A concurrent.futures.Executor backed by subinterpreters.
+
+    Args:
+        max_workers (int): Number of subinterpreters (default: CPU count)
+
+    Usage is identical to ThreadPoolExecutor / ProcessPoolExecutor:
+
+        with SubinterpreterExecutor(4) as pool:
+            total = pool.submit(cpu_heavy, 10_000_000).result()
+    """
+
+    def __init__(self, max_workers=None):
+        if interpreters is None:
+            raise RuntimeError(
+                "Subinterpreters need Python 3.14+ "
+                "(or: pip install interpreters-pep-734)"
+            )
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._work_queue = queue.Queue()
+        self._shutdown = False
+        self._shutdown_lock = threading.Lock()
+        self._interpreters = []
+        self._threads = []
+
+        main_file = getattr(sys.modules["__main__"], "__file__", None)
+        for i in range(self._max_workers):
+            interp = interpreters.create()
+            if main_file:
+                # Make functions from the main script importable in the
+                # subinterpreter (same trick as multiprocessing "spawn")
+                interp.exec(
+                    "import runpy, sys\n"
+                    f"_ns = runpy.run_path({main_file!r}, run_name='__mp_main__')\n"
+                    "_main = type(sys)('__main__')\n"
+                    "_main.__dict__.update(_ns)\n"
+                    "sys.modules['__main__'] = _main\n"
+                )
+            t = threading.Thread(
+                target=self._worker,
+                args=(interp,),
+                name=f"subinterpreter-{i}",
+                daemon=True,
+            )
+            t.start()
+            self._interpreters.append(interp)
+            self._threads.append(t)
+
+    def _worker(self, interp):
+        """Driver loop: run queued calls inside `interp` until shutdown."""
+        while True:
+            item = self._work_queue.get()
+            if item is _SHUTDOWN:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = interp.call(fn, *args, **kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._shutdown_lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future = Future()
+            self._work_queue.put((future, fn, args, kwargs))
+            return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._shutdown_lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+        if cancel_futures:
+            while True:
+                try:
+                    item = self._work_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _SHUTDOWN:
+                    item[0].cancel()
+        for _ in self._threads:
+            self._work_queue.put(_SHUTDOWN)
+        if wait:
+            for t in self._threads:
+                t.join()
+            for interp in self._interpreters:
+                interp.close()
+
+
+# =============================================================================
+# MEASUREMENT HELPERS
+# =============================================================================
+
+def rss_bytes(pid="self"):
+    """
+    Reads the Resident Set Size of a process from /proc (Linux).
+
+    Returns 0 where /proc is not available (macOS, Windows).
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def benchmark(name, make_pool, workers, func, n, tasks):
+    """
+    Measures one backend.
+
+    Returns:
+        dict: startup seconds, memory per worker (MB), tasks/sec
+    """
+    before = rss_bytes()
+
+    # 1) STARTUP: create the pool and make sure EVERY worker is alive
+    start = time.perf_counter()
+    pool = make_pool(workers)
+    list(pool.map(warm_up, range(workers)))
+    startup = time.perf_counter() - start
+
+    # 2) MEMORY: threads/subinterpreters grow THIS process,
+    #    processes show up as children with their own RSS
+    children = active_children()
+    if children:
+        extra = sum(rss_bytes(p.pid) for p in children)
+    else:
+        extra = rss_bytes() - before
+    per_worker_mb = extra / workers / 2**20
+
+    # 3) THROUGHPUT: run `tasks` copies of the CPU-bound callable
+    start = time.perf_counter()
+    results = list(pool.map(func, [n] * tasks))
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+
+    assert len(set(results)) == 1, "every backend must compute the same value"
+    return {
+        "backend": name,
+        "startup_s": startup,
+        "mem_per_worker_mb": per_worker_mb,
+        "tasks_per_s": tasks / elapsed,
+    }
+
+
+# =============================================================================
+# REQUIRED: if __name__ == "__main__" GUARD
+# =============================================================================
+# Worker processes AND worker subinterpreters re-run this file on startup;
+# without the guard each of them would start its own benchmark!
+
+if __name__ == "__main__":
+
+    WORKERS = os.cpu_count() or 1
+    TASKS = WORKERS * 4
+    N = 2_000_000            # Iterations per task (raise for longer runs)
+
+    print("=" * 60)
+    print("🧪 THREADS vs PROCESSES vs SUBINTERPRETERS")
+    print("=" * 60)
+    print(f"Python {sys.version.split()[0]}, {WORKERS} worker(s), "
+          f"{TASKS} tasks of cpu_heavy({N:,})\n")
+
+    backends = [
+        ("threads", lambda w: ThreadPoolExecutor(max_workers=w)),
+        ("processes", lambda w: ProcessPoolExecutor(max_workers=w)),
+    ]
+    if interpreters is not None:
+        backends.append(("subinterpreters", SubinterpreterExecutor))
+    else:
+        print("⚠️  Subinterpreters not available on this Python "
+              "(need 3.14+ or `pip install interpreters-pep-734`)\n")
+
+    rows = [benchmark(name, make, WORKERS, cpu_heavy, N, TASKS)
+            for name, make in backends]
+
+    print(f"{'Backend':<16} {'Startup':>10} {'MB/worker':>10} {'Tasks/s':>10}")
+    print("-" * 50)
+    for r in rows:
+        print(f"{r['backend']:<16} {r['startup_s'] * 1000:>8.1f}ms "
+              f"{r['mem_per_worker_mb']:>10.1f} {r['tasks_per_s']:>10.2f}")
+
+
+# =============================================================================
+# EXPECTED RESULTS (8-core machine, Python 3.14)
+# =============================================================================
+#
+# ┌─────────────────┬────────────┬─────────────┬─────────────────────────┐
+# │ Backend         │ Startup    │ MB / worker │ Throughput (CPU-bound)  │
+# ├─────────────────┼────────────┼─────────────┼─────────────────────────┤
+# │ threads         │ < 1 ms     │ ~0.1        │ 1x  (GIL-bound) ❌      │
+# │ processes       │ ~50-100 ms │ ~10-15      │ ~Nx (true parallel) ✅  │
+# │ subinterpreters │ ~10-30 ms  │ ~2-5        │ ~Nx (true parallel) ✅  │
+# └─────────────────┴────────────┴─────────────┴─────────────────────────┘
+#
+# Exact numbers depend heavily on the machine; run the script yourself!
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. Subinterpreters give each worker its OWN GIL inside ONE process
+# 2. They start faster and use less memory than worker processes
+# 3. Like processes, they share NOTHING by default: arguments and results
+#    are copied between interpreters (no shared Python objects)
+# 4. Not every C extension supports subinterpreters yet - check before
+#    moving production work onto them
+#
+# When to use what:
+# ─────────────────
+# I/O-bound work                     → Threads ✅
+# CPU-bound, needs C extensions      → Processes ✅
+# CPU-bound, pure Python, many tasks → Subinterpreters ✅ (3.14+)
+#
+# =============================================================================
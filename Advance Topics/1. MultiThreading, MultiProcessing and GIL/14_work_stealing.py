@@ -0,0 +1,297 @@
+"""
+=============================================================================
+WORK STEALING: KEEPING EVERY WORKER BUSY
+=============================================================================
+
+The Problem:
+------------
+In 06_thread_two.py, prepare_chai(type_, wait_time) brews chai that take
+very different amounts of time. Now imagine a busy shop with 200 orders
+and 8 brewers. If we hand out the orders up front (STATIC assignment):
+
+    Brewer 1: [2s][1s][9s ][1s]                      ← finishes at 13s
+    Brewer 2: [1s][1s][1s]                           ← idle after 3s 😴
+    Brewer 3: [1s][25s                      ][2s]    ← finishes at 28s 🐢
+
+The shop is only done when the SLOWEST brewer is done (the "makespan"),
+while the others sit idle.
+
+The Solution: WORK STEALING
+---------------------------
+Every worker owns a DEQUE (double-ended queue) of tasks:
+  - The owner takes work from the BACK of its own deque (LIFO)
+  - When its deque is empty, it becomes a THIEF and steals from the
+    FRONT of a random busy worker's deque (FIFO)
+
+    ┌──────────── Worker 1 ────────────┐   ┌──────────── Worker 2 ────────┐
+    │ deque: [t1][t5][t9][t13] ◄─ pop  │   │ deque: (empty)               │
+    │          ▲                       │   │                              │
+    └──────────┼───────────────────────┘   └──────────────┬───────────────┘
+               └────────────── steal (popleft) ───────────┘
+
+Owners and thieves work on OPPOSITE ends, so they rarely collide, and no
+worker sits idle while there is still work anywhere in the pool.
+
+This Script Demonstrates:
+-------------------------
+  - WorkStealingPool with per-worker deques and random-victim stealing
+  - A "thread" mode (for sleep/I-O tasks like prepare_chai) and a
+    "process" mode (each worker drives its own single-process pool)
+  - A benchmark on a SKEWED (Pareto) brew-time distribution comparing the
+    makespan of static assignment, ThreadPoolExecutor FIFO dispatch and
+    work stealing
+
+=============================================================================
+"""
+
+import random     # Skewed task durations and random victim selection
+import threading  # Worker threads
+import time       # For simulating brewing time and measuring makespan
+from collections import deque  # Thread-safe append/pop at both ends
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def prepare_chai(type_, wait_time):
+    """
+    Prepares a chai that takes `wait_time` seconds to brew.
+
+    Same task as 06_thread_two.py, but it returns its result instead of
+    printing, because the benchmark brews hundreds of them.
+
+    Args:
+        type_ (str): The type of chai (e.g., "Masala", "Ginger")
+        wait_time (float): How long to brew in seconds
+
+    Returns:
+        str: A "ready" message for the order
+    """
+    time.sleep(wait_time)  # Simulate brewing time
+    return f"{type_} chai ready"
+
+
+# =============================================================================
+# THE WORK-STEALING POOL
+# =============================================================================
+#
+# A CPython deque's append(), pop() and popleft() are atomic, so the deques
+# can be shared between threads without an extra lock.
+#
+# Since all tasks are known up front (no task creates new tasks), a worker
+# can stop as soon as its own deque AND every victim's deque are empty.
+
+class WorkStealingPool:
+    """
+    Runs a batch of calls on workers that steal from each other.
+
+    Args:
+        num_workers (int): Number of workers (each with its own deque)
+        mode (str): "thread" runs tasks in the worker threads,
+                    "process" sends each task to a per-worker process
+        steal (bool): Set to False to get plain STATIC assignment
+                      (useful as a baseline)
+
+    Usage:
+        pool = WorkStealingPool(8)
+        results = pool.map(prepare_chai, [("Masala", 0.2), ("Ginger", 0.3)])
+        print(pool.steals)  # How many tasks each worker stole
+    """
+
+    def __init__(self, num_workers, mode="thread", steal=True):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"mode must be 'thread' or 'process', not {mode!r}")
+        self.num_workers = num_workers
+        self.mode = mode
+        self.steal = steal
+        self.steals = [0] * num_workers
+        self.error = None           # First exception raised by fn in map()
+        self._error_lock = threading.Lock()
+
+    def map(self, fn, arg_tuples):
+        """
+        Calls fn(*args) for every tuple in `arg_tuples`.
+
+        Returns:
+            list: Results in the SAME order as `arg_tuples`
+
+        Raises:
+            The first exception fn raised; the other workers stop early
+        """
+        arg_tuples = list(arg_tuples)
+        results = [None] * len(arg_tuples)
+        self.steals = [0] * self.num_workers
+        self.error = None
+
+        # Deal the tasks out round-robin, like a static scheduler would
+        deques = [deque() for _ in range(self.num_workers)]
+        for index, args in enumerate(arg_tuples):
+            deques[index % self.num_workers].append((index, args))
+
+        threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(worker_id, deques, fn, results),
+                name=f"stealer-{worker_id}",
+            )
+            for worker_id in range(self.num_workers)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if self.error is not None:
+            raise self.error
+        return results
+
+    def _next_task(self, worker_id, deques):
+        """Own work first (back of our deque), then steal (front of a victim's)."""
+        try:
+            return deques[worker_id].pop()
+        except IndexError:
+            pass
+        if not self.steal:
+            return None
+
+        victims = [i for i in range(self.num_workers) if i != worker_id]
+        random.shuffle(victims)
+        for victim in victims:
+            try:
+                task = deques[victim].popleft()
+            except IndexError:
+                continue
+            self.steals[worker_id] += 1
+            return task
+        return None
+
+    def _worker(self, worker_id, deques, fn, results):
+        """Loop until there is nothing left to run or steal."""
+        executor = None
+        if self.mode == "process":
+            # One dedicated process per worker: the stealing happens here in
+            # the parent, the CPU work happens in the child.
+            executor = ProcessPoolExecutor(max_workers=1)
+        try:
+            while self.error is None:   # Another worker failed: stop too
+                task = self._next_task(worker_id, deques)
+                if task is None:
+                    return
+                index, args = task
+                try:
+                    if executor is None:
+                        results[index] = fn(*args)
+                    else:
+                        results[index] = executor.submit(fn, *args).result()
+                except Exception as exc:
+                    with self._error_lock:
+                        if self.error is None:
+                            self.error = exc
+                    return
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+
+# =============================================================================
+# BENCHMARK HELPERS
+# =============================================================================
+
+def skewed_orders(count, mean_seconds, seed=42):
+    """
+    Builds `count` orders with Pareto-distributed brew times.
+
+    Most chai are quick, a few take a VERY long time - the situation where
+    static assignment hurts the most.
+    """
+    rng = random.Random(seed)
+    alpha = 1.5  # Smaller alpha → heavier tail
+    scale = mean_seconds * (alpha - 1) / alpha
+    chai_types = ["Masala", "Ginger", "Cardamom", "Plain", "Tulsi"]
+    return [
+        (rng.choice(chai_types), scale * rng.paretovariate(alpha))
+        for _ in range(count)
+    ]
+
+
+def makespan(run):
+    """Returns how long `run()` takes from the first task to the last."""
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+# =============================================================================
+# REQUIRED: if __name__ == "__main__" GUARD
+# =============================================================================
+# Needed because the "process" mode spawns worker processes.
+
+if __name__ == "__main__":
+
+    WORKERS = 8
+    ORDERS = 200
+    MEAN_BREW = 0.02  # Seconds (scaled down so the demo runs quickly)
+
+    orders = skewed_orders(ORDERS, MEAN_BREW)
+    durations = [wait for _, wait in orders]
+    ideal = max(sum(durations) / WORKERS, max(durations))
+
+    print("=" * 60)
+    print("🥷 WORK STEALING vs STATIC vs FIFO DISPATCH")
+    print("=" * 60)
+    print(f"{ORDERS} orders, {WORKERS} brewers, Pareto brew times")
+    print(f"Total brew time: {sum(durations):.2f}s, "
+          f"longest order: {max(durations):.2f}s\n")
+
+    static_pool = WorkStealingPool(WORKERS, steal=False)
+    stealing_pool = WorkStealingPool(WORKERS)
+
+    def run_fifo():
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            list(pool.map(prepare_chai, *zip(*orders)))
+
+    timings = {
+        "Static assignment": makespan(lambda: static_pool.map(prepare_chai, orders)),
+        "ThreadPool FIFO": makespan(run_fifo),
+        "Work stealing": makespan(lambda: stealing_pool.map(prepare_chai, orders)),
+    }
+
+    print(f"{'Scheduler':<20} {'Makespan':>10} {'vs ideal':>10}")
+    print("-" * 42)
+    for name, seconds in timings.items():
+        print(f"{name:<20} {seconds:>9.2f}s {seconds / ideal:>9.2f}x")
+    print(f"{'(lower bound)':<20} {ideal:>9.2f}s")
+    print(f"\n🥷 Steals per worker: {stealing_pool.steals}")
+
+    # The same scheduler can drive processes for CPU-bound work
+    results = WorkStealingPool(2, mode="process").map(
+        prepare_chai, [("Masala", 0.01), ("Ginger", 0.02)]
+    )
+    print(f"🧪 Process mode: {results}")
+
+
+# =============================================================================
+# EXPECTED OUTPUT (numbers vary with the random durations)
+# =============================================================================
+#
+# Scheduler              Makespan   vs ideal
+# ------------------------------------------
+# Static assignment         0.85s      1.70x   ← unlucky brewer holds us up
+# ThreadPool FIFO           0.79s      1.58x
+# Work stealing             0.68s      1.36x   ← idle brewers help out
+# (lower bound)             0.50s
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. MAKESPAN = time until the LAST task finishes. Static assignment lets
+#    one unlucky worker decide it.
+# 2. Work stealing balances load dynamically: idle workers steal from busy
+#    ones, so nobody sits idle while work remains.
+# 3. A shared FIFO queue (ThreadPoolExecutor) also balances load, but every
+#    worker contends on ONE queue. With per-worker deques, workers mostly
+#    touch their OWN deque and only contend when stealing - that matters
+#    with many workers and many tiny tasks.
+# 4. Owners pop from the back, thieves from the front → little contention.
+#
+# =============================================================================
@@ -0,0 +1,304 @@
+"""
+=============================================================================
+PRODUCER/CONSUMER PIPELINES WITH BACKPRESSURE
+=============================================================================
+
+The Problem:
+------------
+In 01_threading.py, take_orders() and brew_chai() run side by side but
+never talk to each other: orders are taken, chai is brewed, but no order
+ever FLOWS into the brewing station. A real shop is a PIPELINE:
+
+    ┌──────────┐  queue  ┌──────────┐  queue  ┌──────────┐
+    │  ORDER   │ ──────► │  BREW    │ ──────► │  SERVE   │
+    │ (taker)  │  [■■■ ] │ (brewers)│  [■   ] │ (waiter) │
+    └──────────┘         └──────────┘         └──────────┘
+
+What is Backpressure?
+---------------------
+If the order taker is faster than the brewers, an UNBOUNDED queue just
+keeps growing: more and more cups waiting, memory rising, and every order
+waiting longer. A BOUNDED queue (queue.Queue(maxsize=N)) fixes that:
+
+    - When the queue is FULL, queue.put() BLOCKS
+    - The upstream stage is slowed down to the speed of the downstream one
+    - Memory and waiting time stay bounded
+
+That "slow down, I'm full!" signal travelling upstream is BACKPRESSURE.
+
+This Script Demonstrates:
+-------------------------
+  - A Pipeline of Stages connected by bounded queues
+  - Configurable parallelism per stage (e.g. 1 taker, 3 brewers, 1 waiter)
+  - Per-stage metrics: throughput, queue depth, latency, time blocked by
+    backpressure and utilization - so you can spot the BOTTLENECK stage
+
+=============================================================================
+"""
+
+import queue      # Thread-safe bounded queues between stages
+import threading  # Worker threads for every stage
+import time       # For simulating work and measuring latency
+
+_DONE = object()  # Sentinel that tells a stage worker to stop
+
+
+# =============================================================================
+# THE STAGE FUNCTIONS (the chai shop from 01_threading.py, now connected)
+# =============================================================================
+
+def take_orders(order_id):
+    """Takes an order (scaled down from 2s in 01_threading.py)."""
+    time.sleep(0.002)
+    return f"order #{order_id}"
+
+
+def brew_chai(order):
+    """Brews chai for an order (scaled down from 3s in 01_threading.py)."""
+    time.sleep(0.009)
+    return f"☕ for {order}"
+
+
+def serve_chai(cup):
+    """Hands the cup to the customer."""
+    time.sleep(0.001)
+    return f"served {cup}"
+
+
+# =============================================================================
+# STAGE: ONE STEP OF THE PIPELINE
+# =============================================================================
+
+class Stage:
+    """
+    One step of the pipeline plus the metrics collected for it.
+
+    Args:
+        name (str): Name shown in the report
+        func (callable): Turns one input item into one output item
+        workers (int): How many threads run this stage in parallel
+        maxsize (int): Capacity of the queue FEEDING this stage
+    """
+
+    def __init__(self, name, func, workers=1, maxsize=10):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.inbox = queue.Queue(maxsize=maxsize)
+        self.maxsize = maxsize
+
+        # Metrics (updated under self.lock by the worker threads)
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.busy_seconds = 0.0     # Time spent inside func()
+        self.blocked_seconds = 0.0  # Time spent waiting on a FULL next queue
+        self.latencies = []         # Queue wait + service time per item
+        self.depth_samples = []     # inbox.qsize() sampled by the monitor
+
+
+# =============================================================================
+# PIPELINE: STAGES CONNECTED BY BOUNDED QUEUES
+# =============================================================================
+
+class Pipeline:
+    """
+    Runs items through a chain of stages with backpressure.
+
+    Usage:
+        pipeline = Pipeline([
+            Stage("order", take_orders, workers=1, maxsize=5),
+            Stage("brew", brew_chai, workers=3, maxsize=5),
+            Stage("serve", serve_chai, workers=1, maxsize=5),
+        ])
+        results = pipeline.run(range(100))
+        pipeline.report()
+    """
+
+    def __init__(self, stages, sample_interval=0.005):
+        self.stages = stages
+        self.sample_interval = sample_interval
+        self.results = []
+        self.end_to_end = []
+        self.source_blocked_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.error = None           # First exception raised by a stage
+        self._error_lock = threading.Lock()
+
+    def _put(self, q, item):
+        """queue.put() that measures how long BACKPRESSURE held us up."""
+        start = time.perf_counter()
+        q.put(item)
+        return time.perf_counter() - start
+
+    def _worker(self, index, remaining):
+        stage = self.stages[index]
+        is_last = index == len(self.stages) - 1
+        while True:
+            item = stage.inbox.get()
+            if item is _DONE:
+                break
+            if self.error is not None:
+                continue            # A stage failed: drain the queue, don't work
+            created, enqueued, payload = item
+
+            start = time.perf_counter()
+            try:
+                output = stage.func(payload)
+            except Exception as exc:
+                with self._error_lock:
+                    if self.error is None:
+                        self.error = exc
+                continue            # Keep draining so nobody blocks on our inbox
+            finished = time.perf_counter()
+
+            if is_last:
+                blocked = 0.0
+                with stage.lock:
+                    self.results.append(output)
+                    self.end_to_end.append(finished - created)
+            else:
+                nxt = (created, finished, output)
+                blocked = self._put(self.stages[index + 1].inbox, nxt)
+
+            with stage.lock:
+                stage.processed += 1
+                stage.busy_seconds += finished - start
+                stage.blocked_seconds += blocked
+                stage.latencies.append(finished - enqueued)
+
+        # The LAST worker of this stage to finish tells the next stage
+        with stage.lock:
+            remaining[index] -= 1
+            last_one_out = remaining[index] == 0
+        if last_one_out and not is_last:
+            for _ in range(self.stages[index + 1].workers):
+                self.stages[index + 1].inbox.put(_DONE)
+
+    def _monitor(self, stop):
+        """Samples every queue's depth until the pipeline is finished."""
+        while not stop.wait(self.sample_interval):
+            for stage in self.stages:
+                stage.depth_samples.append(stage.inbox.qsize())
+
+    def run(self, source):
+        """
+        Feeds every item of `source` into the first stage and waits until
+        the last stage has produced all results. If a stage raises, the
+        remaining items are dropped and the exception is re-raised here.
+        """
+        remaining = [stage.workers for stage in self.stages]
+        threads = [
+            threading.Thread(target=self._worker, args=(index, remaining),
+                             name=f"{stage.name}-{n}")
+            for index, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+        stop = threading.Event()
+        monitor = threading.Thread(target=self._monitor, args=(stop,), daemon=True)
+
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        monitor.start()
+
+        # The source is the very first producer: it also feels backpressure
+        first = self.stages[0]
+        for payload in source:
+            if self.error is not None:
+                break               # No point feeding a failed pipeline
+            now = time.perf_counter()
+            self.source_blocked_seconds += self._put(first.inbox, (now, now, payload))
+        for _ in range(first.workers):
+            first.inbox.put(_DONE)
+
+        for t in threads:
+            t.join()
+        self.wall_seconds = time.perf_counter() - start
+        stop.set()
+        monitor.join()
+        if self.error is not None:
+            raise self.error
+        return self.results
+
+    def report(self):
+        """Prints per-stage metrics and names the bottleneck stage."""
+        wall = self.wall_seconds or 1e-9
+        print(f"{'Stage':<8} {'Wkrs':>4} {'Items/s':>8} {'Depth avg/max':>14} "
+              f"{'Lat ms avg/p95':>15} {'Blocked':>8} {'Util':>6}")
+        print("-" * 70)
+        utilization = {}
+        for stage in self.stages:
+            lat = sorted(stage.latencies) or [0.0]
+            p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+            depth = stage.depth_samples or [0]
+            util = stage.busy_seconds / (stage.workers * wall)
+            utilization[stage.name] = util
+            depth_text = f"{sum(depth) / len(depth):.1f}/{max(depth)}"
+            latency_text = f"{sum(lat) / len(lat) * 1000:.1f}/{p95 * 1000:.1f}"
+            print(f"{stage.name:<8} {stage.workers:>4} "
+                  f"{stage.processed / wall:>8.1f} {depth_text:>14} "
+                  f"{latency_text:>15} {stage.blocked_seconds:>7.2f}s {util:>6.0%}")
+
+        e2e = sorted(self.end_to_end) or [0.0]
+        print(f"\n⏱️  End-to-end latency: avg {sum(e2e) / len(e2e) * 1000:.1f}ms, "
+              f"max {e2e[-1] * 1000:.1f}ms")
+        print(f"🚦 Source blocked by backpressure: {self.source_blocked_seconds:.2f}s")
+        bottleneck = max(utilization, key=utilization.get)
+        print(f"🐢 Bottleneck stage: {bottleneck} "
+              f"({utilization[bottleneck]:.0%} busy)")
+
+
+if __name__ == "__main__":
+
+    ORDERS = 200
+
+    print("=" * 70)
+    print("🏭 CHAI SHOP PIPELINE: order → brew → serve")
+    print("=" * 70)
+
+    for brewers in (1, 3):
+        print(f"\n▶ {ORDERS} orders, 1 order taker, {brewers} brewer(s), "
+              "1 waiter, queues of 5\n")
+        pipeline = Pipeline([
+            Stage("order", take_orders, workers=1, maxsize=5),
+            Stage("brew", brew_chai, workers=brewers, maxsize=5),
+            Stage("serve", serve_chai, workers=1, maxsize=5),
+        ])
+        served = pipeline.run(range(1, ORDERS + 1))
+        print(f"✅ {len(served)} cups served in {pipeline.wall_seconds:.2f}s\n")
+        pipeline.report()
+
+
+# =============================================================================
+# READING THE REPORT
+# =============================================================================
+#
+# With ONE brewer (brewing takes ~9ms, ordering ~2ms):
+#   - the "brew" queue sits FULL (depth 5/5)
+#   - the "order" stage spends most of its time BLOCKED on put()
+#     → backpressure is slowing the order taker down to brewing speed
+#   - "brew" is ~100% utilized → it is the BOTTLENECK 🐢
+#
+# With THREE brewers:
+#   - throughput roughly triples (~107 → ~320 items/s)
+#   - order-stage blocking drops (1.37s → 0.17s) and its utilization climbs
+#   - brew is STILL the bottleneck, but ordering is close behind: past ~4
+#     brewers the order taker becomes the limit and more brewers won't help
+#
+# Rule of thumb: add workers to the stage with the FULLEST input queue and
+# the HIGHEST utilization. Adding workers anywhere else changes nothing.
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. Queues CONNECT threads: the output of one stage is the input of the next
+# 2. BOUNDED queues give you BACKPRESSURE for free: put() blocks when full
+# 3. Backpressure keeps memory and latency under control
+# 4. Per-stage metrics (queue depth, utilization, blocked time) point
+#    straight at the bottleneck
+# 5. Sentinels (_DONE) shut a pipeline down cleanly, stage by stage
+#
+# =============================================================================
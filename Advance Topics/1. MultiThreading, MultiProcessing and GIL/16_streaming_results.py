@@ -0,0 +1,268 @@
+"""
+=============================================================================
+STREAMING RESULTS FROM PROCESS POOLS (AS SOON AS THEY ARE READY)
+=============================================================================
+
+The Problem:
+------------
+In 02_multiprocessing.py we start the chai makers and then call join()
+on every one of them. We only learn anything once the SLOWEST worker is
+done - even if the first cup was ready seconds earlier:
+
+    Worker 1: ████ ready!  ........ (waiting for the others)
+    Worker 2: ████████████ ready!
+    Worker 3: ████████████████████ ready!
+                                   ↑
+                                   join() returns - NOW we see results
+
+For a million small tasks that is worse: pool.map() builds ONE giant list
+of a million results in memory before we see the first one.
+
+The Solution: STREAMING
+-----------------------
+Hand results to the caller the moment they are ready:
+
+    for result in stream_results(square, range(1_000_000)):
+        ...   # first result arrives in milliseconds, not seconds
+
+Two tools from the standard library make this possible:
+  - multiprocessing.Pool.imap_unordered(fn, items, chunksize)
+  - concurrent.futures.wait(..., return_when=FIRST_COMPLETED)
+    (the building block behind as_completed())
+
+Chunking:
+---------
+Sending ONE tiny task per message to a process is slow: pickling and
+pipe overhead dwarfs the work. A CHUNKSIZE groups many items into one
+message:
+
+    chunksize=1:     [1] [2] [3] [4] [5] [6] ...  → 1,000,000 messages 🐢
+    chunksize=1000:  [1..1000] [1001..2000] ...   →     1,000 messages ⚡
+
+Ordered Mode:
+-------------
+Sometimes the order matters. Chunks that finish EARLY are parked in a
+REORDER BUFFER until every chunk before them has been yielded. The buffer
+is BOUNDED: we stop submitting new chunks when it is full, so memory stays
+flat even if one chunk is slow.
+
+This Script Demonstrates:
+-------------------------
+  - stream_results(): a generator yielding results as soon as they are
+    ready, with a chunksize and a bounded number of chunks in flight
+  - ordered=True with a bounded reorder buffer
+  - A benchmark on a MILLION small tasks: time-to-first-result, total
+    time and peak memory versus pool.map() and Pool.imap_unordered()
+
+=============================================================================
+"""
+
+import itertools   # For slicing the input into chunks lazily
+import os          # For cpu_count()
+import time        # For measuring time-to-first-result
+import tracemalloc # For measuring peak memory in the main process
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import Pool
+
+
+def square(x):
+    """A SMALL task: far too cheap to be worth one message per call."""
+    return x * x
+
+
+def _run_chunk(fn, items):
+    """Runs `fn` over one chunk inside a worker process."""
+    return [fn(item) for item in items]
+
+
+# =============================================================================
+# STREAM_RESULTS: YIELD AS SOON AS EACH CHUNK IS READY
+# =============================================================================
+#
+# How it works:
+#   1. Read `chunksize` items at a time from the (possibly lazy) input
+#   2. Keep at most `max_in_flight` chunks submitted to the pool
+#   3. wait(FIRST_COMPLETED) → yield whatever finished, submit more
+#
+# Because the input is read lazily and the number of chunks in flight is
+# bounded, memory does NOT grow with the number of tasks.
+
+def stream_results(fn, iterable, workers=None, chunksize=1000,
+                   max_in_flight=None, ordered=False, reorder_buffer=None):
+    """
+    Runs fn(item) for every item in a process pool, yielding results as
+    soon as they are ready.
+
+    Args:
+        fn (callable): A picklable, top-level function
+        iterable: Input items (can be a lazy generator)
+        workers (int): Number of worker processes (default: CPU count)
+        chunksize (int): Items sent to a worker in one message
+        max_in_flight (int): Chunks submitted but not yet yielded
+                             (default: 4 per worker)
+        ordered (bool): Yield results in input order
+        reorder_buffer (int): In ordered mode, how many chunks may finish
+                              ahead of the next one to yield
+                              (default: max_in_flight)
+
+    Yields:
+        Results of fn(item) - in completion order, or input order if
+        ordered=True
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    reorder_buffer = reorder_buffer or max_in_flight
+
+    items = iter(iterable)
+    pending = {}        # future → chunk index
+    finished = {}       # chunk index → results (the reorder buffer)
+    next_submit = 0     # Index of the next chunk to submit
+    next_yield = 0      # Index of the next chunk to yield (ordered mode)
+    exhausted = False
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            # -----------------------------------------------------------------
+            # 1) Top up the pool, respecting BOTH limits
+            # -----------------------------------------------------------------
+            while not exhausted and len(pending) < max_in_flight:
+                if ordered and next_submit - next_yield >= reorder_buffer:
+                    break  # Reorder buffer full: wait for the slow chunk
+                chunk = list(itertools.islice(items, chunksize))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending[pool.submit(_run_chunk, fn, chunk)] = next_submit
+                next_submit += 1
+
+            if not pending:
+                return
+
+            # -----------------------------------------------------------------
+            # 2) Wait for the FIRST chunk to complete and hand it out
+            # -----------------------------------------------------------------
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                if ordered:
+                    finished[index] = future.result()
+                else:
+                    yield from future.result()
+
+            # -----------------------------------------------------------------
+            # 3) Ordered mode: release every chunk that is now in sequence
+            # -----------------------------------------------------------------
+            while next_yield in finished:
+                yield from finished.pop(next_yield)
+                next_yield += 1
+
+
+# =============================================================================
+# BENCHMARK HELPERS
+# =============================================================================
+
+def measure(name, make_results):
+    """
+    Consumes a result iterator and reports time-to-first-result, total
+    time and peak Python memory in the main process.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    count = 0
+    checksum = 0
+    for value in make_results():
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+        checksum += value
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<28} {first * 1000:>9.1f}ms {total:>8.2f}s "
+          f"{peak / 2**20:>9.1f}MB  ({count:,} results)")
+    return checksum
+
+
+def map_all(n, workers, chunksize):
+    """The 'join() everything first' baseline: one big list."""
+    with Pool(workers) as pool:
+        return pool.map(square, range(n), chunksize=chunksize)
+
+
+def imap_unordered(n, workers, chunksize):
+    """The standard-library streaming primitive."""
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(square, range(n), chunksize=chunksize)
+
+
+# =============================================================================
+# REQUIRED: if __name__ == "__main__" GUARD
+# =============================================================================
+
+if __name__ == "__main__":
+
+    N = 1_000_000
+    WORKERS = os.cpu_count() or 1
+    CHUNKSIZE = 1000
+
+    print("=" * 72)
+    print("📡 STREAMING RESULTS FROM A PROCESS POOL")
+    print("=" * 72)
+    print(f"{N:,} small tasks, {WORKERS} worker(s), chunksize={CHUNKSIZE}")
+    print("(memory = peak Python allocations in the main process)\n")
+
+    print(f"{'Approach':<28} {'1st result':>11} {'Total':>9} {'Peak mem':>11}")
+    print("-" * 72)
+    expected = sum(x * x for x in range(N))
+    checks = [
+        measure("pool.map (wait for all)",
+                lambda: map_all(N, WORKERS, CHUNKSIZE)),
+        measure("Pool.imap_unordered",
+                lambda: imap_unordered(N, WORKERS, CHUNKSIZE)),
+        measure("stream_results (unordered)",
+                lambda: stream_results(square, range(N), WORKERS, CHUNKSIZE)),
+        measure("stream_results (ordered)",
+                lambda: stream_results(square, range(N), WORKERS, CHUNKSIZE,
+                                       ordered=True, reorder_buffer=8)),
+    ]
+    assert all(check == expected for check in checks)
+    print("\n✅ Every approach produced the same results")
+
+    # Ordered mode really does preserve the input order
+    first_ten = list(itertools.islice(
+        stream_results(square, range(100), chunksize=7, ordered=True), 10))
+    print(f"🔢 Ordered mode, first ten: {first_ten}")
+
+
+# =============================================================================
+# EXPECTED OUTPUT (1 worker; exact numbers vary by machine)
+# =============================================================================
+#
+# Approach                      1st result     Total    Peak mem
+# ------------------------------------------------------------------------
+# pool.map (wait for all)         4863.1ms     6.24s      38.4MB  ← big list
+# Pool.imap_unordered              290.6ms     6.02s       1.0MB
+# stream_results (unordered)        18.2ms     6.39s       0.4MB  ✅
+# stream_results (ordered)          15.3ms     6.60s       0.3MB  ✅
+#
+# Why is imap_unordered's first result slower?
+#   Its feeder thread walks the input and queues chunks as fast as it can,
+#   competing with the result handler. If the consumer is SLOWER than the
+#   pool, its results also pile up without limit. stream_results keeps at
+#   most `max_in_flight` chunks around, so memory stays flat either way.
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. join()/map() make you wait for the SLOWEST task before seeing ANY result
+# 2. Streaming (imap_unordered, wait/as_completed) yields results as they
+#    complete → time-to-first-result drops from seconds to milliseconds
+# 3. CHUNKSIZE matters: tiny tasks need batching to beat IPC overhead
+# 4. Bound the work in flight to keep memory flat for huge inputs
+# 5. Ordered streaming needs a REORDER BUFFER - bound it too!
+#
+# =============================================================================
@@ -0,0 +1,333 @@
+"""
+=============================================================================
+DISCRETE-EVENT SIMULATION: SIZING THE CHAI SHOP WITHOUT WAITING
+=============================================================================
+
+The Problem:
+------------
+take_orders()/brew_chai() (01_threading.py) and prepare_chai()
+(06_thread_two.py) model the shop with REAL sleeps and only 3 orders.
+To answer "how many brewers do we need for 10,000 orders an hour?" we
+would have to wait for hours of real time - and threads would not even
+scale to that many orders.
+
+The Solution: DISCRETE-EVENT SIMULATION (DES)
+---------------------------------------------
+Nothing interesting happens BETWEEN events, so we never wait: we keep all
+future events in a HEAP ordered by time and jump straight to the next one.
+
+    Event heap (earliest first):
+    ┌──────────────────────────────────────────────────────────┐
+    │ (0.8s, arrival #2) (1.5s, brew done #1) (2.1s, arr #3)   │
+    └──────────────────────────────────────────────────────────┘
+         │ heappop()
+         ▼
+    now = 0.8s → handle "arrival #2" → maybe schedule "brew done #2"
+
+Modelling the Shop:
+-------------------
+    ORDER ARRIVALS   A Poisson process: the gap between customers is
+                     exponential (random.expovariate)
+    BREWERS          A RESOURCE with `capacity` brewers and a waiting line
+    SERVICE TIMES    Any distribution: exponential, lognormal, fixed...
+    POLICY           Who is served next from the waiting line:
+                       FIFO - first come, first served
+                       LIFO - newest first
+                       SPT  - shortest brew first
+
+Going Fast:
+-----------
+The generic engine is a tight heapq loop (hundreds of thousands of orders
+per second in pure Python). For the most common question - "how many
+brewers with a FIFO line?" - there is an even faster shortcut: keep a
+heap of the times each brewer becomes FREE, and process orders in arrival
+order. One heapreplace() per order → MILLIONS of orders per second. Both
+give exactly the same answer for FIFO, which the script checks.
+
+This Script Demonstrates:
+-------------------------
+  - Simulation: a heap-based event engine (schedule / run)
+  - Resource: brewers with FIFO, LIFO or SPT waiting lines
+  - simulate_fifo_fast(): the heap-of-free-times shortcut
+  - Sizing sweeps over brewer counts and scheduling policies
+
+=============================================================================
+"""
+
+import heapq      # The event queue
+import itertools  # Tie-breaking sequence numbers for equal event times
+import math       # For the lognormal parameters
+import random     # Arrival and service-time distributions
+import time       # For measuring simulation speed (wall time)
+from collections import deque
+
+
+# =============================================================================
+# THE EVENT ENGINE
+# =============================================================================
+
+class Simulation:
+    """
+    A minimal discrete-event engine.
+
+    Events are (time, sequence, callback, args) tuples in a heap; the
+    sequence number keeps events with the same time in scheduling order.
+
+    Usage:
+        sim = Simulation()
+        sim.schedule(2.0, print, "two seconds later")
+        sim.run()
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self._events = []
+        self._sequence = itertools.count()
+
+    def schedule(self, delay, callback, *args):
+        """Runs callback(*args) `delay` simulated seconds from now."""
+        heapq.heappush(self._events,
+                       (self.now + delay, next(self._sequence), callback, args))
+
+    def run(self, until=float("inf")):
+        """Processes events in time order until none are left (or `until`)."""
+        events = self._events
+        pop = heapq.heappop
+        while events and events[0][0] <= until:
+            self.now, _, callback, args = pop(events)
+            callback(*args)
+
+
+# =============================================================================
+# BREWERS AS A RESOURCE
+# =============================================================================
+
+class Resource:
+    """
+    `capacity` identical servers (brewers) with a waiting line.
+
+    Args:
+        sim (Simulation): The engine to schedule completions on
+        capacity (int): Number of brewers
+        policy (str): "FIFO", "LIFO" or "SPT" (shortest service first)
+
+    Orders are (order_id, arrival_time, service_time) tuples. The
+    collected waits (arrival → brewing starts) live in `self.waits`.
+    """
+
+    def __init__(self, sim, capacity, policy="FIFO"):
+        if policy not in ("FIFO", "LIFO", "SPT"):
+            raise ValueError(f"unknown policy {policy!r}")
+        self.sim = sim
+        self.capacity = capacity
+        self.policy = policy
+        self.busy = 0
+        self.busy_time = 0.0
+        self.max_queue = 0
+        self.waits = []
+        self._line = [] if policy == "SPT" else deque()
+
+    def request(self, order):
+        """An order arrives: start brewing or join the waiting line."""
+        if self.busy < self.capacity:
+            self._start(order)
+            return
+        if self.policy == "SPT":
+            heapq.heappush(self._line, (order[2], order))
+        else:
+            self._line.append(order)
+        if len(self._line) > self.max_queue:
+            self.max_queue = len(self._line)
+
+    def _start(self, order):
+        self.busy += 1
+        self.waits.append(self.sim.now - order[1])
+        self.busy_time += order[2]
+        self.sim.schedule(order[2], self._finish)
+
+    def _finish(self):
+        self.busy -= 1
+        line = self._line
+        if not line:
+            return
+        if self.policy == "FIFO":
+            self._start(line.popleft())
+        elif self.policy == "LIFO":
+            self._start(line.pop())
+        else:
+            self._start(heapq.heappop(line)[1])
+
+
+# =============================================================================
+# ARRIVALS AND SERVICE TIMES
+# =============================================================================
+
+def exponential(mean):
+    """Service time sampler: exponential with the given mean."""
+    rate = 1 / mean
+    return lambda rng: rng.expovariate(rate)
+
+
+def lognormal(mean, cv=0.5):
+    """Service time sampler: lognormal with a mean and coefficient of variation."""
+    sigma = math.sqrt(math.log(1 + cv ** 2))
+    mu = math.log(mean) - sigma ** 2 / 2
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def generate_orders(count, arrivals_per_second, service, seed=1):
+    """
+    Pre-generates `count` orders as (order_id, arrival_time, service_time).
+
+    Generating them up front means every policy/brewer count is compared
+    on EXACTLY the same customers.
+    """
+    rng = random.Random(seed)
+    rate = arrivals_per_second
+    now = 0.0
+    orders = []
+    for order_id in range(count):
+        now += rng.expovariate(rate)
+        orders.append((order_id, now, service(rng)))
+    return orders
+
+
+def simulate_shop(orders, brewers, policy="FIFO"):
+    """
+    Runs the full event-driven model.
+
+    Returns:
+        dict: waits and utilization statistics
+    """
+    sim = Simulation()
+    shop = Resource(sim, brewers, policy)
+    it = iter(orders)
+
+    def arrival(order):
+        shop.request(order)
+        nxt = next(it, None)
+        if nxt is not None:
+            sim.schedule(nxt[1] - sim.now, arrival, nxt)
+
+    first = next(it)
+    sim.schedule(first[1], arrival, first)
+    sim.run()
+    return summarize(shop.waits, shop.busy_time, brewers, sim.now, shop.max_queue)
+
+
+def simulate_fifo_fast(orders, brewers):
+    """
+    FIFO shortcut: a heap of the times each brewer is next free.
+
+    With FIFO, orders start in arrival order, so the next order simply
+    takes the brewer that frees up first.
+    """
+    free_at = [0.0] * brewers
+    replace = heapq.heapreplace
+    waits = []
+    append = waits.append
+    busy_time = 0.0
+    end = 0.0
+    for _, arrival, service in orders:
+        first_free = free_at[0]
+        start = arrival if arrival > first_free else first_free
+        append(start - arrival)
+        finish = start + service
+        replace(free_at, finish)
+        busy_time += service
+        if finish > end:
+            end = finish
+    return summarize(waits, busy_time, brewers, end, max_queue=None)
+
+
+def summarize(waits, busy_time, brewers, end_time, max_queue):
+    waits = sorted(waits)
+    n = len(waits)
+    return {
+        "orders": n,
+        "avg_wait": sum(waits) / n,
+        "p99_wait": waits[min(n - 1, int(n * 0.99))],
+        "utilization": busy_time / (brewers * end_time),
+        "max_queue": max_queue,
+    }
+
+
+if __name__ == "__main__":
+
+    ORDERS = 1_000_000
+    ARRIVALS_PER_SECOND = 1 / 30           # A customer every ~30 seconds
+    SERVICE = lognormal(mean=150, cv=0.6)  # ~2.5 min per chai, skewed
+
+    print("=" * 66)
+    print("🧮 DISCRETE-EVENT SIMULATION: sizing the chai shop")
+    print("=" * 66)
+
+    start = time.perf_counter()
+    orders = generate_orders(ORDERS, ARRIVALS_PER_SECOND, SERVICE)
+    print(f"Generated {ORDERS:,} orders "
+          f"({orders[-1][1] / 86400:.0f} simulated days) "
+          f"in {time.perf_counter() - start:.2f}s\n")
+
+    # -------------------------------------------------------------------------
+    # 1) HOW MANY BREWERS? (fast FIFO shortcut)
+    # -------------------------------------------------------------------------
+    print("1️⃣  Brewer sweep, FIFO (heap of free times)\n")
+    print(f"   {'Brewers':>7} {'Util':>6} {'Avg wait':>10} {'p99 wait':>10} {'Orders/s':>12}")
+    for brewers in (6, 7, 8, 10):
+        start = time.perf_counter()
+        stats = simulate_fifo_fast(orders, brewers)
+        rate = ORDERS / (time.perf_counter() - start)
+        print(f"   {brewers:>7} {stats['utilization']:>6.0%} "
+              f"{stats['avg_wait']:>9.1f}s {stats['p99_wait']:>9.1f}s {rate:>12,.0f}")
+
+    # -------------------------------------------------------------------------
+    # 2) WHICH POLICY? (full event engine)
+    # -------------------------------------------------------------------------
+    print("\n2️⃣  Scheduling policies with 6 brewers (event engine)\n")
+    print(f"   {'Policy':>7} {'Avg wait':>10} {'p99 wait':>10} {'Max line':>9} {'Orders/s':>12}")
+    for policy in ("FIFO", "LIFO", "SPT"):
+        start = time.perf_counter()
+        stats = simulate_shop(orders, 6, policy)
+        rate = ORDERS / (time.perf_counter() - start)
+        print(f"   {policy:>7} {stats['avg_wait']:>9.1f}s {stats['p99_wait']:>9.1f}s "
+              f"{stats['max_queue']:>9} {rate:>12,.0f}")
+
+    # Both models agree for FIFO
+    sample = orders[:50_000]
+    slow, fast = simulate_shop(sample, 6), simulate_fifo_fast(sample, 6)
+    assert abs(slow["avg_wait"] - fast["avg_wait"]) < 1e-6
+    print("\n✅ Event engine and fast FIFO model agree")
+
+
+# =============================================================================
+# EXPECTED OUTPUT (1M orders; speeds depend on your machine)
+# =============================================================================
+#
+# 1️⃣  Brewer sweep, FIFO (heap of free times)
+#
+#    Brewers   Util   Avg wait   p99 wait     Orders/s
+#          6    83%      60.5s     410.6s    1,266,584   ← busy, long tails
+#          7    71%      17.0s     176.9s    3,128,956
+#          8    62%       6.0s      97.4s    3,419,455   ← sweet spot?
+#         10    50%       0.8s      30.3s    2,978,540
+#
+# 2️⃣  Scheduling policies with 6 brewers (event engine)
+#
+#     Policy   Avg wait   p99 wait  Max line     Orders/s
+#       FIFO      60.5s     410.6s        42      395,374
+#       LIFO      60.5s    1067.0s        39      347,107   ← same average,
+#        SPT      40.5s     481.7s        21      313,109     unfair tails
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. A DES jumps from event to event: simulated days take seconds
+# 2. The core is just a HEAP of (time, seq, callback) - heapq is enough
+# 3. Utilization above ~80% makes waits (especially p99) explode
+# 4. Policies change WHO waits: SPT lowers the average, LIFO hurts the tail
+# 5. Specialise the hot path (heap of free times) when the model allows it
+#
+# =============================================================================
@@ -0,0 +1,225 @@
+"""
+=============================================================================
+MEASURING THE GIL: CONTENTION METER & SWITCH-INTERVAL TUNING
+=============================================================================
+
+The Problem:
+------------
+03_gil_threading.py shows that two CPU-bound threads are slow, but not
+WHERE the time goes. How long does each thread actually RUN, and how long
+does it sit waiting for the GIL?
+
+That matters even more for MIXED pools like 06_bgworker.py, where an
+I/O thread (the health logger) shares the interpreter with busy code:
+when its sleep() is over, it must WAIT for the GIL before it can print.
+
+    I/O thread:  sleep(5ms) ──┐ wakes up... waits for GIL ...┐ runs
+    CPU thread:  ████████████████████████████████████████████ │ ███
+                                                 switch interval
+
+The Switch Interval:
+--------------------
+sys.setswitchinterval(seconds) tells CPython how long a thread may hold
+the GIL before it is asked to hand it over (default: 0.005 = 5ms).
+
+    SHORT interval → I/O threads wake up quickly ✅
+                     but CPU threads switch more often (overhead) ❌
+    LONG interval  → CPU threads run longer stretches ✅
+                     but I/O threads wait longer ❌
+
+How We Measure:
+---------------
+    RUN time   = time.thread_time()   (CPU time of THIS thread)
+    WAIT time  = wall time - run time - time we ASKED to sleep
+                 → time spent ready to run but not running (mostly the
+                   GIL; on a busy machine also the OS scheduler)
+    I/O LAG    = how much LATER than requested each sleep() returned
+
+This Script Demonstrates:
+-------------------------
+  - measure_mix(): runs CPU threads + an I/O thread at one switch interval
+    and reports run/wait per thread, CPU throughput and I/O wake-up lag
+  - A sweep over several switch intervals and a RECOMMENDATION for mixed
+    I/O+CPU thread pools
+
+=============================================================================
+"""
+
+import sys        # For getswitchinterval() / setswitchinterval()
+import threading  # The threads under test
+import time       # For wall time, thread_time() and sleep()
+
+
+# =============================================================================
+# THE WORKLOADS
+# =============================================================================
+
+def crunch_number(stop, stats):
+    """
+    CPU-BOUND: the counting loop from 03_gil_threading.py, run until
+    `stop` is set. Counts in batches so checking the flag stays cheap.
+    """
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    count = 0
+    while not stop.is_set():
+        for _ in range(10_000):
+            count += 1
+    stats.update(
+        kind="cpu",
+        wall=time.perf_counter() - wall_start,
+        run=time.thread_time() - cpu_start,
+        slept=0.0,
+        work=count,
+    )
+
+
+def background_worker(stop, stats, interval):
+    """
+    I/O-BOUND: the health logger from 06_bgworker.py, waking every
+    `interval` seconds. Records how late each wake-up was.
+    """
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    lags = []
+    while not stop.is_set():
+        before = time.perf_counter()
+        time.sleep(interval)
+        lags.append(time.perf_counter() - before - interval)
+    stats.update(
+        kind="io",
+        wall=time.perf_counter() - wall_start,
+        run=time.thread_time() - cpu_start,
+        slept=interval * len(lags),
+        work=len(lags),
+        lags=sorted(lags),
+    )
+
+
+# =============================================================================
+# THE METER
+# =============================================================================
+
+def measure_mix(switch_interval, cpu_threads=2, io_interval=0.005, duration=1.0):
+    """
+    Runs `cpu_threads` CPU threads and one I/O thread for `duration`
+    seconds at the given switch interval.
+
+    Returns:
+        dict: per-thread stats plus CPU throughput and I/O lag percentiles
+    """
+    original = sys.getswitchinterval()
+    sys.setswitchinterval(switch_interval)
+    try:
+        stop = threading.Event()
+        all_stats = [{} for _ in range(cpu_threads + 1)]
+        threads = [threading.Thread(target=crunch_number, args=(stop, s),
+                                    name=f"cpu-{i}")
+                   for i, s in enumerate(all_stats[:-1])]
+        threads.append(threading.Thread(target=background_worker,
+                                        args=(stop, all_stats[-1], io_interval),
+                                        name="io"))
+        for t in threads:
+            t.start()
+        time.sleep(duration)
+        stop.set()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(original)
+
+    for t, stats in zip(threads, all_stats):
+        stats["name"] = t.name
+        stats["wait"] = max(0.0, stats["wall"] - stats["run"] - stats["slept"])
+
+    io = all_stats[-1]
+    lags = io["lags"] or [0.0]
+    return {
+        "interval": switch_interval,
+        "threads": all_stats,
+        "cpu_per_s": sum(s["work"] for s in all_stats[:-1]) / duration,
+        "io_lag_p50": lags[len(lags) // 2],
+        "io_lag_p99": lags[min(len(lags) - 1, int(len(lags) * 0.99))],
+    }
+
+
+def recommend(results, max_io_lag_p99=0.010):
+    """
+    Picks the switch interval with the BEST CPU throughput among those that
+    keep the I/O thread's p99 wake-up lag within `max_io_lag_p99` seconds.
+    If none meets the budget, falls back to the lowest p99 lag.
+    """
+    within_budget = [r for r in results if r["io_lag_p99"] <= max_io_lag_p99]
+    if not within_budget:
+        return min(results, key=lambda r: r["io_lag_p99"])
+    return max(within_budget, key=lambda r: r["cpu_per_s"])
+
+
+if __name__ == "__main__":
+
+    INTERVALS = [0.0005, 0.001, 0.005, 0.02, 0.1]   # Seconds
+    DURATION = 1.0
+    IO_LAG_BUDGET = 0.010                           # p99 wake-up lag we accept
+
+    print("=" * 70)
+    print("🔒 GIL CONTENTION METER: 2 CPU threads + 1 I/O thread")
+    print("=" * 70)
+    print(f"Default switch interval: {sys.getswitchinterval() * 1000:.1f}ms, "
+          f"{DURATION:.0f}s per setting\n")
+
+    results = [measure_mix(interval, duration=DURATION) for interval in INTERVALS]
+
+    # -------------------------------------------------------------------------
+    # PER-THREAD RUN vs WAIT
+    # -------------------------------------------------------------------------
+    print(f"{'Interval':>9}  {'Thread':<6} {'Run':>7} {'GIL wait':>9} {'Wait %':>7}")
+    print("-" * 45)
+    for r in results:
+        for s in r["threads"]:
+            share = s["wait"] / s["wall"] if s["wall"] else 0.0
+            print(f"{r['interval'] * 1000:>7.1f}ms  {s['name']:<6} "
+                  f"{s['run']:>6.2f}s {s['wait']:>8.2f}s {share:>7.0%}")
+        print()
+
+    # -------------------------------------------------------------------------
+    # THE TRADE-OFF
+    # -------------------------------------------------------------------------
+    print(f"{'Interval':>9} {'CPU loops/s':>14} {'I/O lag p50':>12} {'I/O lag p99':>12}")
+    print("-" * 50)
+    for r in results:
+        print(f"{r['interval'] * 1000:>7.1f}ms {r['cpu_per_s']:>14,.0f} "
+              f"{r['io_lag_p50'] * 1000:>10.2f}ms {r['io_lag_p99'] * 1000:>10.2f}ms")
+
+    best = recommend(results, max_io_lag_p99=IO_LAG_BUDGET)
+    print(f"\n💡 Recommendation for mixed I/O+CPU thread pools: "
+          f"sys.setswitchinterval({best['interval']})")
+    print(f"   (best CPU throughput with I/O p99 lag within "
+          f"{IO_LAG_BUDGET * 1000:.0f}ms: {best['io_lag_p99'] * 1000:.2f}ms)")
+
+
+# =============================================================================
+# READING THE RESULTS
+# =============================================================================
+#
+# - CPU threads: "Wait %" ≈ (N-1)/N with N CPU-bound threads - each one
+#   waits for the GIL while the others run. That is the GIL in numbers!
+# - I/O thread: its lag grows with the switch interval, because after
+#   waking up it must wait until a CPU thread is asked to drop the GIL.
+# - CPU throughput rises with the interval (fewer forced switches), most
+#   visibly at 20-100ms - exactly where the I/O lag becomes painful.
+#
+# A typical answer is 1-2ms for latency-sensitive mixed pools, versus the
+# 5ms default. Always measure on YOUR machine and workload, and remember:
+# for real CPU parallelism use processes (04_gil_multiprocessing.py).
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. time.thread_time() tells you how long a thread really RAN
+# 2. wall - run - sleep ≈ time spent WAITING (for the GIL)
+# 3. The switch interval trades CPU throughput for I/O responsiveness
+# 4. Mixed pools (like 06_bgworker.py) often benefit from a smaller interval
+# 5. Tuning the GIL never gives CPU parallelism - it only shares one core
+#
+# =============================================================================
@@ -0,0 +1,387 @@
+"""
+=============================================================================
+PICKLE PROTOCOL 5: MOVING BIG PAYLOADS BETWEEN PROCESSES WITH ONE COPY
+=============================================================================
+
+The Problem:
+------------
+queue.put() in 11_process_queue.py and run_in_executor(pool, encrypt, ...)
+in 05_process_async.py PICKLE everything they send. For a short string
+that's free. For a 500 MB image it means the bytes are copied again and
+again:
+
+    Sender                                     Receiver
+    ┌────────┐  pickle.dumps  ┌─────────┐ pipe ┌─────────┐  loads  ┌────────┐
+    │ data   │ ─────────────► │ pickle  │ ───► │ read    │ ──────► │ data'  │
+    │ 500 MB │    COPY #1     │ 500 MB  │      │ buffers │ COPY #3 │ 500 MB │
+    └────────┘                └─────────┘      │ COPY #2 │         └────────┘
+                                               └─────────┘
+
+The Solution: OUT-OF-BAND BUFFERS (pickle protocol 5, PEP 574)
+-------------------------------------------------------------
+With protocol 5, objects can hand their raw memory to pickle as a
+PickleBuffer. With a buffer_callback, pickle does NOT copy that memory
+into the stream - it gives it back to us and only writes a tiny header:
+
+    header, buffers = dumps(obj, protocol=5, buffer_callback=...)
+         │               └─► [PickleBuffer → the ORIGINAL memory]
+         └─► a few hundred bytes: "an object of type Blob, data = buffer #0"
+
+We then move the buffers ourselves, with at most ONE copy:
+
+    PIPE:           sendall(original memory) → recv_into(preallocated buffer)
+                    (the kernel moves it; one copy lands in the receiver)
+
+    SHARED MEMORY:  copy once INTO a SharedMemory segment; the receiver
+                    unpickles straight from the shared pages (zero copies)
+
+This Script Demonstrates:
+-------------------------
+  - Blob: a bytes wrapper that pickles its data out-of-band
+  - dumps_oob() / loads_oob(): protocol-5 pickling with separate buffers
+  - send_oob() / recv_oob(): a socket-pair transport with one copy
+  - SharedPayload: a tiny picklable handle to shared memory, usable with
+    Queue.put() AND run_in_executor()
+  - A benchmark from 1 KB to 1 GB: throughput and memory copied per path
+
+(NumPy arrays already support protocol 5, so the same transport moves
+ them without the Blob wrapper.)
+
+=============================================================================
+"""
+
+import asyncio                  # run_in_executor() with a shared payload
+import os                       # For sysconf() - available memory
+import pickle                   # Protocol 5, PickleBuffer
+import socket                   # socketpair(): the pipe transport
+import struct                   # Length prefix for the pipe header
+import time                     # Throughput measurement
+import tracemalloc              # How much memory each path copies
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Pipe, Process, Queue
+from multiprocessing import shared_memory
+
+
+# =============================================================================
+# OUT-OF-BAND PICKLING
+# =============================================================================
+
+class Blob:
+    """
+    A binary payload that pickles its data OUT-OF-BAND with protocol 5
+    (and falls back to normal in-band pickling with older protocols).
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5:
+            return Blob, (pickle.PickleBuffer(self.data),)
+        return Blob, (bytes(self.data),)
+
+
+def dumps_oob(obj):
+    """
+    Pickles obj with protocol 5.
+
+    Returns:
+        tuple: (header bytes, list of contiguous memoryviews). The views
+               point at the ORIGINAL memory - nothing has been copied yet.
+    """
+    buffers = []
+    header = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    return header, [b.raw() for b in buffers]
+
+
+def loads_oob(header, buffers):
+    """Rebuilds an object from its header and (any buffer-like) buffers."""
+    return pickle.loads(header, buffers=buffers)
+
+
+# =============================================================================
+# TRANSPORT 1: A PIPE (socket pair) WITH ONE COPY
+# =============================================================================
+#
+# multiprocessing's Connection.recv_bytes() reads into temporary objects
+# and copies again, so we use a plain socket pair: sendall() straight from
+# the original memory, recv_into() straight into the final buffer.
+
+def send_oob(sock, obj):
+    """Sends obj: a small pickled header, then each raw buffer as-is."""
+    header, views = dumps_oob(obj)
+    meta = pickle.dumps((header, [v.nbytes for v in views]))
+    sock.sendall(struct.pack("!Q", len(meta)) + meta)
+    for view in views:
+        sock.sendall(view)          # No copy in user space
+
+
+def _recv_into(sock, view):
+    while view.nbytes:
+        n = sock.recv_into(view)
+        if n == 0:
+            raise EOFError("connection closed")
+        view = view[n:]
+
+
+def recv_oob(sock):
+    """Receives an object sent with send_oob(): ONE copy per buffer."""
+    size = bytearray(8)
+    _recv_into(sock, memoryview(size))
+    meta = bytearray(struct.unpack("!Q", size)[0])
+    _recv_into(sock, memoryview(meta))
+    header, sizes = pickle.loads(meta)
+    buffers = []
+    for n in sizes:
+        buf = bytearray(n)          # The one and only copy lands here
+        _recv_into(sock, memoryview(buf))
+        buffers.append(buf)
+    return loads_oob(header, buffers)
+
+
+# =============================================================================
+# TRANSPORT 2: SHARED MEMORY, ZERO COPIES ON THE RECEIVING SIDE
+# =============================================================================
+
+class SharedPayload:
+    """
+    Copies an object's out-of-band buffers ONCE into shared memory and
+    pickles as a tiny handle (header + segment names). Send the handle
+    through Queue.put() or run_in_executor() like any other argument.
+
+    The creator owns the segments: use it as a context manager (or call
+    close()) once every receiver is done. A receiver calls apply(fn): the
+    object is rebuilt ON the shared pages and is only valid inside fn.
+
+    Usage:
+        # sender
+        with SharedPayload(Blob(big_bytes)) as ref:
+            queue.put(ref)                  # a few hundred bytes travel
+            done.get()                      # wait until the receiver is done
+
+        # receiver
+        ref = queue.get()
+        digest = ref.apply(lambda blob: hashlib.sha256(blob.data).digest())
+        done.put(True)
+    """
+
+    def __init__(self, obj):
+        self.header, views = dumps_oob(obj)
+        self.segments = []
+        self._owned = []
+        for view in views:
+            shm = shared_memory.SharedMemory(create=True, size=max(1, view.nbytes))
+            shm.buf[:view.nbytes] = view            # The one copy
+            self._owned.append(shm)
+            self.segments.append((shm.name, view.nbytes))
+
+    def __getstate__(self):
+        return {"header": self.header, "segments": self.segments, "_owned": []}
+
+    def apply(self, fn, unlink=False):
+        """
+        Attaches to the segments, rebuilds the object without copying and
+        returns fn(obj). With unlink=True the segments are removed
+        afterwards (for one-way hand-offs where the sender doesn't wait).
+        """
+        attached = [shared_memory.SharedMemory(name=name) for name, _ in self.segments]
+        views = [shm.buf[:n] for shm, (_, n) in zip(attached, self.segments)]
+        try:
+            obj = loads_oob(self.header, views)
+            result = fn(obj)
+            del obj
+        finally:
+            for view in views:
+                view.release()
+            for shm in attached:
+                shm.close()
+                if unlink:
+                    shm.unlink()
+        return result
+
+    def close(self):
+        for shm in self._owned:
+            shm.close()
+            shm.unlink()
+        self._owned = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =============================================================================
+# THE EXISTING PATHS, WITH SHARED PAYLOADS
+# =============================================================================
+
+def encrypt_shared(ref):
+    """encrypt() from 05_process_async.py, reading its input from shared memory."""
+    return ref.apply(lambda blob: f"🔒 {bytes(blob.data[-16:])[::-1].hex()}")
+
+
+async def encrypt_big(data):
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=1) as pool, SharedPayload(Blob(data)) as ref:
+        return await loop.run_in_executor(pool, encrypt_shared, ref)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def consume(payload):
+    """What the receiver does: look at the payload without copying it."""
+    return len(payload)
+
+
+def consumer(method, channel, acks, count, measure):
+    """Child process: receive `count` payloads, ack each one."""
+    if measure:
+        tracemalloc.start()
+    for _ in range(count):
+        if method == "queue":
+            result = consume(channel.get())
+        elif method == "pipe":
+            result = consume(recv_oob(channel))
+        else:
+            result = channel.get().apply(consume)
+        acks.send(result)
+    acks.send(tracemalloc.get_traced_memory()[1] if measure else 0)
+
+
+def run_method(method, size, count, measure=False):
+    """
+    Sends `count` payloads of `size` bytes to a child process.
+
+    Returns:
+        tuple: (seconds, sender peak heap bytes, receiver peak heap bytes)
+    """
+    if method == "pipe":
+        send_end, channel = socket.socketpair()
+    else:
+        channel = Queue()
+    acks, child_acks = Pipe()
+    child = Process(target=consumer, args=(method, channel, child_acks, count, measure))
+    child.start()
+
+    data = b"\x42" * size
+    if measure:
+        tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(count):
+        if method == "queue":
+            channel.put(data)                       # Default pickling
+            acks.recv()
+        elif method == "pipe":
+            send_oob(send_end, Blob(data))
+            acks.recv()
+        else:
+            with SharedPayload(Blob(data)) as ref:
+                channel.put(ref)
+                acks.recv()                         # Receiver is done with it
+    elapsed = time.perf_counter() - start
+    sender_peak = 0
+    if measure:
+        sender_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    receiver_peak = acks.recv()
+    child.join()
+    if method == "pipe":
+        send_end.close()
+        channel.close()
+    return elapsed, sender_peak, receiver_peak
+
+
+def human(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.0f} TB"
+
+
+if __name__ == "__main__":
+
+    SIZES = [1 << 10, 1 << 20, 64 << 20, 1 << 30]        # 1 KB ... 1 GB
+    METHODS = [
+        ("queue", "Queue.put (pickle)", "3"),
+        ("pipe", "pipe + protocol 5", "1"),
+        ("shm", "shared memory + p5", "1"),
+    ]
+    available = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+
+    print("=" * 78)
+    print("📦 PICKLE-5 OUT-OF-BAND TRANSPORT vs DEFAULT PICKLING")
+    print("=" * 78)
+
+    # 1) The existing run_in_executor path, with a 64 MB payload
+    print(f"run_in_executor + SharedPayload: {asyncio.run(encrypt_big(b'chai' * (16 << 20)))}\n")
+
+    print(f"{'Size':>6}  {'Path':<20} {'Copies':>6} {'MB/s':>9} {'ms/msg':>9} "
+          f"{'Heap copied':>12}")
+    print("-" * 78)
+    for size in SIZES:
+        count = max(1, min(1000, (256 << 20) // size))
+        for method, label, copies in METHODS:
+            # Default pickling holds ~4 copies at once on the way through
+            if method == "queue" and size * 5 > available:
+                print(f"{human(size):>6}  {label:<20} {copies:>6} "
+                      f"{'skipped: needs ~' + human(size * 5) + ' RAM':>32}")
+                continue
+            elapsed, _, _ = run_method(method, size, count)
+            _, sent, received = run_method(method, size, 1, measure=True)
+            print(f"{human(size):>6}  {label:<20} {copies:>6} "
+                  f"{size * count / elapsed / 1e6:>9,.0f} {elapsed / count * 1000:>9.2f} "
+                  f"{(sent + received) / size:>11.1f}×")
+        print()
+
+
+# =============================================================================
+# EXPECTED OUTPUT (numbers vary by machine; 6 GB RAM box)
+# =============================================================================
+#
+#   Size  Path                 Copies      MB/s    ms/msg  Heap copied
+# ------------------------------------------------------------------------------
+#   1 KB  Queue.put (pickle)        3        22      0.05        21.8×
+#   1 KB  pipe + protocol 5         1        38      0.03        14.0×
+#   1 KB  shared memory + p5        1         3      0.29        22.9×
+#
+#   1 MB  Queue.put (pickle)        3       582      1.80         3.1×
+#   1 MB  pipe + protocol 5         1     4,735      0.22         1.0×
+#   1 MB  shared memory + p5        1     1,068      0.98         0.0×
+#
+#  64 MB  Queue.put (pickle)        3       328    204.51         3.1×
+#  64 MB  pipe + protocol 5         1     1,127     59.55         1.0×
+#  64 MB  shared memory + p5        1     1,148     58.47         0.0×
+#
+#   1 GB  Queue.put (pickle)        3         skipped: needs ~5 GB RAM
+#   1 GB  pipe + protocol 5         1       172   6257.59         1.0×
+#   1 GB  shared memory + p5        1     1,057   1016.12         0.0×
+#
+# "Copies" counts user-space copies by design. "Heap copied" is the measured
+# tracemalloc peak of sender + receiver divided by the payload size (copies
+# into shared memory are not on the heap, so they don't show there). At
+# 1 KB the "heap" is just bookkeeping: per-message overhead dominates, and
+# creating a shared memory segment per message is the slowest option.
+# From ~1 MB up, protocol 5 is 3-8× faster; at 1 GB, allocating a fresh
+# receive buffer hurts the pipe, while shared memory keeps its speed.
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. Default pickling copies a payload ~3 times on its way to a process
+# 2. Protocol 5 + buffer_callback separates the tiny header from the data
+# 3. Move the raw buffers yourself: recv_into() or shared memory = 1 copy
+# 4. Small messages: per-message overhead dominates - a pipe is as good as
+#    anything, and a shared memory segment per message is the slowest
+# 5. A picklable HANDLE to shared memory works with Queue AND executors
+#
+# =============================================================================
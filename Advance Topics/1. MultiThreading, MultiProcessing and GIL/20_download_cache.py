@@ -0,0 +1,391 @@
+"""
+=============================================================================
+A DOWNLOAD CACHE: CONTENT-ADDRESSED, SIZE-BOUNDED, REVALIDATED WITH ETAGS
+=============================================================================
+
+The Problem:
+------------
+Every run of 07_thread_download.py downloads the same httpbin images IN
+FULL, even though they never change. Threads make the downloads overlap,
+but the fastest download is the one you don't do.
+
+The Solution: CACHE ON DISK, ASK "HAS IT CHANGED?"
+--------------------------------------------------
+HTTP has this built in. A server tags each response with a version:
+
+    ETag: "a1b2c3..."                      (a fingerprint of the body)
+    Last-Modified: Tue, 01 Oct 2024 ...
+
+Next time we send the tag back, and an unchanged resource costs only a
+tiny "304 Not Modified" - the body comes from our disk:
+
+    1st run:  GET /image/jpeg                     → 200 + 35 KB body
+    2nd run:  GET /image/jpeg
+              If-None-Match: "a1b2c3..."          → 304, NO body  ✅
+
+How the Cache Is Stored:
+------------------------
+    cache/
+    ├── index.json            url → {sha256, etag, last_modified, size}
+    └── objects/
+        ├── 3f/3fa9...e1      ← file NAMED BY THE SHA-256 OF ITS CONTENT
+        └── c0/c04b...77
+
+Content addressing: two URLs returning the same bytes share ONE file,
+and a file's name proves its content (it IS the hash of the bytes).
+
+    size-bounded LRU: when the objects exceed `max_bytes`, the Least
+    Recently Used ones are deleted first
+
+This Script Demonstrates:
+-------------------------
+  - DownloadCache: thread-safe, on-disk, content-addressed, LRU-bounded
+  - download(url, cache, session): 07_thread_download.py's function, cached
+  - A local server that sets ETag/Last-Modified and answers 304s, with a
+    simulated slow link so the savings are visible
+  - Bytes and time saved on repeated runs, a changed resource, eviction
+
+Installation:
+-------------
+    pip install requests
+
+=============================================================================
+"""
+
+import hashlib           # SHA-256: content addresses and ETags
+import json              # The index file
+import os                # Files and atomic renames
+import shutil            # Cleaning up the demo cache directory
+import tempfile          # Where the demo cache lives
+import threading         # Concurrent downloads, locks, the local server
+import time              # Timing the runs and the simulated link
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests          # HTTP client, as in 07_thread_download.py (pip install requests)
+
+
+# =============================================================================
+# THE CACHE
+# =============================================================================
+
+class DownloadCache:
+    """
+    An on-disk HTTP cache for GET requests.
+
+    Args:
+        directory (str): Where index.json and objects/ live
+        max_bytes (int): Upper bound for the stored bodies (LRU eviction)
+
+    Usage:
+        cache = DownloadCache("cache", max_bytes=50_000_000)
+        body, how = cache.get(session, url)   # how: "hit", "miss" or "changed"
+        print(cache.stats)
+    """
+
+    def __init__(self, directory, max_bytes=100 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._objects = os.path.join(directory, "objects")
+        self._index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        os.makedirs(self._objects, exist_ok=True)
+        try:
+            with open(self._index_path) as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            saved = {"urls": {}, "objects": {}}
+        self._urls = saved["urls"]          # url → {sha256, etag, last_modified}
+        self._lru = saved["objects"]        # sha256 → {size, last_used}
+        self.stats = {"downloaded": 0, "from_disk": 0, "revalidated": 0,
+                      "misses": 0, "evicted": 0}
+        with self._lock:
+            self._evict()                   # max_bytes may have shrunk
+            self._save_index()
+
+    # ---- the public API -----------------------------------------------------
+
+    def get(self, session, url):
+        """
+        Returns the body of `url`, revalidating a cached copy if we have one.
+
+        Returns:
+            tuple: (body bytes, "hit" | "miss" | "changed")
+        """
+        with self._lock:
+            entry = self._urls.get(url)
+            if entry and entry["sha256"] not in self._lru:
+                entry = None                # Its object was evicted
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = session.get(url, headers=headers)
+
+        if resp.status_code == 304 and entry:
+            body = self._read(entry["sha256"])
+            if body is not None:
+                with self._lock:
+                    self._touch(entry["sha256"])
+                    self.stats["revalidated"] += 1
+                    self.stats["from_disk"] += len(body)
+                    self._save_index()
+                return body, "hit"
+            # The file vanished under us: fetch it again, unconditionally
+            resp = session.get(url)
+
+        resp.raise_for_status()
+        body = resp.content
+        digest = self._write(body)
+        with self._lock:
+            if entry and entry["sha256"] != digest:
+                self._forget(entry["sha256"], url)
+            self._urls[url] = {
+                "sha256": digest,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }
+            self._touch(digest, len(body))
+            self.stats["downloaded"] += len(body)
+            self.stats["misses"] += 1
+            self._evict()
+            self._save_index()
+        return body, "changed" if entry else "miss"
+
+    def size(self):
+        with self._lock:
+            return sum(o["size"] for o in self._lru.values())
+
+    # ---- objects on disk ----------------------------------------------------
+
+    def _path(self, digest):
+        return os.path.join(self._objects, digest[:2], digest)
+
+    def _write(self, body):
+        """Stores body under its SHA-256 (atomically) and returns the digest."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):        # Same content = same file
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)           # Readers never see half a file
+        return digest
+
+    def _read(self, digest):
+        try:
+            with open(self._path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    # ---- LRU bookkeeping (call with the lock held) --------------------------
+
+    def _touch(self, digest, size=None):
+        entry = self._lru.setdefault(digest, {"size": size or 0})
+        entry["last_used"] = time.time()
+
+    def _forget(self, digest, url):
+        """Deletes an outdated object unless another URL still uses it."""
+        if not any(e["sha256"] == digest for u, e in self._urls.items() if u != url):
+            self._lru.pop(digest, None)
+            self._remove(digest)
+
+    def _remove(self, digest):
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        total = sum(o["size"] for o in self._lru.values())
+        for digest in sorted(self._lru, key=lambda d: self._lru[d]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._lru.pop(digest)["size"]
+            self._remove(digest)
+            self.stats["evicted"] += 1
+        # Forget URLs whose content is gone
+        self._urls = {u: e for u, e in self._urls.items() if e["sha256"] in self._lru}
+
+    def _save_index(self):
+        tmp = self._index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"urls": self._urls, "objects": self._lru}, f)
+        os.replace(tmp, self._index_path)
+
+
+# =============================================================================
+# 07_thread_download.py's download(), CACHED
+# =============================================================================
+
+def download(url, cache, session):
+    """
+    Downloads content from a given URL, through the cache.
+
+    Args:
+        url (str): The URL to download from
+        cache (DownloadCache): Where bodies are kept between runs
+        session (requests.Session): Shared connection pool
+    """
+    body, how = cache.get(session, url)
+    label = {"hit": "💾 unchanged, from disk", "miss": "🌐 downloaded",
+             "changed": "🔄 changed, downloaded"}[how]
+    print(f"   {label:<26} {url.rsplit('/', 2)[-2] + '/' + url.rsplit('/', 1)[-1]:<14} "
+          f"{len(body):>9,} bytes")
+
+
+# =============================================================================
+# A LOCAL SERVER THAT SETS ETAGS (and has a slow link)
+# =============================================================================
+
+class ImageHandler(BaseHTTPRequestHandler):
+    """Serves /image/<name> with ETag/Last-Modified, honouring conditionals."""
+
+    BANDWIDTH = 2 * 1024 * 1024          # Bytes per second per response
+    images = {}                          # name → (body, etag, last_modified)
+    bytes_sent = 0
+    lock = threading.Lock()
+
+    @classmethod
+    def publish(cls, name, body):
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        cls.images[name] = (body, etag, formatdate(time.time(), usegmt=True))
+
+    def do_GET(self):
+        name = self.path.rsplit("/", 1)[-1]
+        if name not in self.images:
+            self.send_error(404)
+            return
+        body, etag, last_modified = self.images[name]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for i in range(0, len(body), 64 * 1024):     # Simulated slow link
+            chunk = body[i:i + 64 * 1024]
+            time.sleep(len(chunk) / self.BANDWIDTH)
+            self.wfile.write(chunk)
+        with self.lock:
+            type(self).bytes_sent += len(body)
+
+    def log_message(self, *args):
+        pass  # Keep the demo output readable
+
+
+def run(urls, cache, title):
+    """One run of the 07_thread_download.py pattern: a thread per URL."""
+    print(f"\n{title}")
+    sent_before = ImageHandler.bytes_sent
+    stats_before = dict(cache.stats)
+    session = requests.Session()
+    start = time.time()
+    threads = [threading.Thread(target=download, args=(url, cache, session))
+               for url in urls]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.time() - start
+    downloaded = cache.stats["downloaded"] - stats_before["downloaded"]
+    from_disk = cache.stats["from_disk"] - stats_before["from_disk"]
+    print(f"   ⏱️  {elapsed:.2f}s | over the network: {downloaded:,} bytes "
+          f"(server sent {ImageHandler.bytes_sent - sent_before:,}) | "
+          f"from disk: {from_disk:,} bytes | cache size: {cache.size():,} bytes")
+    return elapsed
+
+
+if __name__ == "__main__":
+
+    # "Images" like httpbin's, but bigger so the slow link shows
+    ImageHandler.publish("jpeg", os.urandom(1_500_000))
+    ImageHandler.publish("png", os.urandom(800_000))
+    ImageHandler.publish("svg", os.urandom(400_000))
+    ImageHandler.publish("webp", ImageHandler.images["png"][0])   # Same bytes as png
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/image/"
+    urls = [base + name for name in ("jpeg", "png", "svg", "webp")]
+
+    cache_dir = tempfile.mkdtemp(prefix="chai_cache_")
+    print("=" * 78)
+    print("💾 CONTENT-ADDRESSED DOWNLOAD CACHE WITH ETAG REVALIDATION")
+    print("=" * 78)
+    print(f"Server link: {ImageHandler.BANDWIDTH / 1024 / 1024:.0f} MB/s per download, "
+          f"cache in {cache_dir}")
+
+    try:
+        cache = DownloadCache(cache_dir, max_bytes=5_000_000)
+        cold = run(urls, cache, "1️⃣  Cold cache (first run ever)")
+
+        # A NEW process would find the same cache on disk: simulate it
+        cache = DownloadCache(cache_dir, max_bytes=5_000_000)
+        warm = run(urls, cache, "2️⃣  Warm cache (next run, new DownloadCache)")
+
+        ImageHandler.publish("svg", os.urandom(400_000))
+        run(urls, cache, "3️⃣  The server changed svg")
+
+        small = DownloadCache(cache_dir, max_bytes=2_000_000)
+        evicted = small.stats["evicted"]
+        run(urls, small, f"4️⃣  Same cache, bounded to 2 MB ({evicted} LRU object(s) "
+                         f"evicted on open)")
+
+        print(f"\n📊 Warm run: {cold / warm:.0f}x faster than cold - every URL "
+              f"answered with a 304 and served from disk")
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir)
+
+
+# =============================================================================
+# EXPECTED OUTPUT (abridged, numbers vary)
+# =============================================================================
+#
+# 1️⃣  Cold cache (first run ever)
+#    🌐 downloaded               image/svg        400,000 bytes
+#    ...
+#    ⏱️  0.75s | over the network: 3,500,000 bytes (server sent 3,500,000) |
+#        from disk: 0 bytes | cache size: 2,700,000 bytes   ← png = webp: stored once
+#
+# 2️⃣  Warm cache (next run, new DownloadCache)
+#    💾 unchanged, from disk     image/png        800,000 bytes
+#    ...
+#    ⏱️  0.01s | over the network: 0 bytes (server sent 0) |
+#        from disk: 3,500,000 bytes | cache size: 2,700,000 bytes
+#
+# 3️⃣  The server changed svg
+#    🔄 changed, downloaded      image/svg        400,000 bytes
+#    ⏱️  0.20s | over the network: 400,000 bytes ... from disk: 3,100,000 bytes
+#
+# 4️⃣  Same cache, bounded to 2 MB (1 LRU object(s) evicted on open)
+#    🌐 downloaded               image/jpeg     1,500,000 bytes
+#    ⏱️  0.74s | over the network: 1,500,000 bytes ... cache size: 1,500,000 bytes
+#
+# 📊 Warm run: 77x faster than cold - every URL answered with a 304 and served from disk
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. The fastest download is the one you skip: send If-None-Match /
+#    If-Modified-Since and let the server answer 304
+# 2. Name files by the hash of their content: dedupe for free, and a name
+#    can never point at the wrong bytes
+# 3. Write to a temp file + os.replace(): concurrent readers never see
+#    half-written files
+# 4. Bound the cache (LRU) or it grows forever
+# 5. Persist the index: the NEXT run is the one that benefits
+#
+# =============================================================================
@@ -0,0 +1,260 @@
+"""
+=============================================================================
+MAP-REDUCE: PARALLEL WORK THAT ACTUALLY RETURNS AN ANSWER
+=============================================================================
+
+The Problem:
+------------
+The process demos hand-roll Process objects and get NOTHING back:
+04_gil_multiprocessing.py counts to 100 million twice... and throws both
+counts away. Real jobs need the results COMBINED: a total, a word count,
+a maximum. And real inputs (log files, database dumps) may not even fit
+in memory.
+
+The Solution: MAP-REDUCE
+------------------------
+    input (iterator)   split      map + combine        tree reduce
+    ───────────────►  ┌──────┐   ┌─────────────┐
+    line, line, ...   │chunk1│──►│ worker: map │──► partial 1 ─┐
+                      │chunk2│──►│ each item,  │──► partial 2 ─┴─► r(1,2) ─┐
+                      │chunk3│──►│ then COMBINE│──► partial 3 ─┐           ├─► answer
+                      │chunk4│──►│ locally     │──► partial 4 ─┴─► r(3,4) ─┘
+                      └──────┘   └─────────────┘
+
+  1. SPLIT    The input is read lazily, `chunksize` items at a time; only
+              a few chunks are in flight, so the input can be LARGER than
+              memory (a generator, a file...)
+  2. MAP      Each worker applies mapper() to every item of its chunk...
+  3. COMBINE  ...and immediately folds the results with combiner(), so a
+              chunk of 100,000 items sends back ONE partial result
+  4. REDUCE   Partial results are merged PAIRWISE as soon as two are ready
+              (a tree), and those merges run in the pool too
+
+Rules: reducer (and combiner) must be associative AND commutative -
+partials arrive in completion order, not input order.
+
+This Script Demonstrates:
+-------------------------
+  - map_reduce(mapper, reducer, iterable, ...) with a "thread" or
+    "process" backend
+  - 04_gil_multiprocessing.py's count, finally returned and summed
+  - A word count over a generated "log" that is never held in memory
+  - A scaling benchmark over worker counts and both backends
+
+=============================================================================
+"""
+
+import functools         # reduce() for the per-chunk combiner
+import itertools         # islice() to split any iterator into chunks
+import operator          # add for numeric reductions
+import os                # For cpu_count()
+import time              # For measuring execution time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+BACKENDS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+# =============================================================================
+# THE API
+# =============================================================================
+
+def iter_chunks(iterable, size):
+    """Yields lists of up to `size` items, reading the iterable lazily."""
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _map_chunk(mapper, combiner, chunk):
+    """Runs in a worker: map every item, then combine them into ONE partial."""
+    return functools.reduce(combiner, map(mapper, chunk))
+
+
+def map_reduce(mapper, reducer, iterable, combiner=None, chunksize=10_000,
+               workers=None, backend="process", max_in_flight=None):
+    """
+    Maps `mapper` over `iterable` in parallel and reduces the results.
+
+    Args:
+        mapper (callable): item → value
+        reducer (callable): (value, value) → value; associative + commutative
+        iterable: Any iterable, read lazily chunk by chunk
+        combiner (callable): Folds the values of ONE chunk inside the worker
+                             (default: reducer)
+        chunksize (int): Items per task
+        workers (int): Pool size (default: cpu_count())
+        backend (str): "thread" or "process" (mapper/reducer must then be
+                       picklable, i.e. top-level functions)
+        max_in_flight (int): Tasks queued at once (default: 2 × workers);
+                             bounds memory for huge inputs
+
+    Returns:
+        The reduced value (raises ValueError for an empty iterable)
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    combiner = combiner or reducer
+    chunks = iter_chunks(iterable, chunksize)
+
+    with BACKENDS[backend](max_workers=workers) as pool:
+        in_flight = set()
+        ready = []                  # Partial results waiting for a partner
+        exhausted = False
+
+        def refill():
+            nonlocal exhausted
+            while not exhausted and len(in_flight) < max_in_flight:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    in_flight.add(pool.submit(_map_chunk, mapper, combiner, chunk))
+
+        refill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.discard(future)
+                ready.append(future.result())
+            # Tree reduction: merge partials pairwise, in the pool
+            while len(ready) >= 2:
+                in_flight.add(pool.submit(reducer, ready.pop(), ready.pop()))
+            refill()
+
+    if not ready:
+        raise ValueError("map_reduce() of an empty iterable")
+    return ready[0]
+
+
+# =============================================================================
+# JOB 1: 04_gil_multiprocessing.py's COUNT, RETURNED
+# =============================================================================
+
+def count_one(_):
+    """One step of crunch_number()'s loop: `count += 1`."""
+    return 1
+
+
+# =============================================================================
+# JOB 2: WORD COUNT OVER A LOG THAT NEVER FITS IN MEMORY
+# =============================================================================
+
+WORDS = ["masala", "ginger", "green", "lemon", "chai", "order", "brew", "ready",
+         "cup", "milk", "sugar", "tea", "served", "queue", "table", "cash"]
+
+
+def chai_log(lines):
+    """A generator of log lines: nothing is stored, like reading a huge file."""
+    for i in range(lines):
+        yield " ".join(WORDS[(i * k) % len(WORDS)] for k in (1, 3, 7, 11, 13))
+
+
+def words_in(line):
+    return Counter(line.split())
+
+
+def merge_counts(a, b):
+    """Combiner/reducer for Counters: update in place (no new dict per item)."""
+    a.update(b)
+    return a
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+
+    COUNT = 10_000_000
+    LOG_LINES = 1_000_000
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpus})
+
+    print("=" * 66)
+    print("🗺️  MAP-REDUCE: parallel work that returns an answer")
+    print("=" * 66)
+    print(f"CPUs: {cpus}\n")
+
+    # -------------------------------------------------------------------------
+    # 1) The count from 04_gil_multiprocessing.py - now we get it back
+    # -------------------------------------------------------------------------
+    total, elapsed = timed(map_reduce, count_one, operator.add, range(COUNT),
+                           chunksize=100_000, workers=2)
+    print(f"1️⃣  Count: {total:,} (expected {COUNT:,}) in {elapsed:.2f}s\n")
+
+    # -------------------------------------------------------------------------
+    # 2) Word count over a generator - the log is never in memory
+    # -------------------------------------------------------------------------
+    counts, elapsed = timed(map_reduce, words_in, merge_counts, chai_log(LOG_LINES),
+                            chunksize=20_000)
+    top = ", ".join(f"{w}={n:,}" for w, n in counts.most_common(3))
+    print(f"2️⃣  Word count of {LOG_LINES:,} log lines: {top} "
+          f"({sum(counts.values()):,} words) in {elapsed:.2f}s\n")
+
+    # -------------------------------------------------------------------------
+    # 3) Scaling benchmark
+    # -------------------------------------------------------------------------
+    print(f"3️⃣  Scaling: word count of {LOG_LINES:,} lines\n")
+    serial, serial_time = timed(lambda: functools.reduce(
+        merge_counts, map(words_in, chai_log(LOG_LINES))))
+    print(f"   {'Backend':<8} {'Workers':>7} {'Time':>8} {'Speedup':>8}")
+    print(f"   {'serial':<8} {1:>7} {serial_time:>7.2f}s {1:>7.2f}x")
+    for backend in ("thread", "process"):
+        for workers in worker_counts:
+            result, elapsed = timed(map_reduce, words_in, merge_counts,
+                                    chai_log(LOG_LINES), chunksize=20_000,
+                                    workers=workers, backend=backend)
+            assert result == serial
+            print(f"   {backend:<8} {workers:>7} {elapsed:>7.2f}s "
+                  f"{serial_time / elapsed:>7.2f}x")
+
+
+# =============================================================================
+# EXPECTED OUTPUT
+# =============================================================================
+#
+# (Recorded on a 1-CPU machine: there is no core to scale onto, so the table
+#  shows the API's OVERHEAD. On N cores the process rows approach N×.)
+#
+# ==================================================================
+# 🗺️  MAP-REDUCE: parallel work that returns an answer
+# ==================================================================
+# CPUs: 1
+#
+# 1️⃣  Count: 10,000,000 (expected 10,000,000) in 1.28s
+#
+# 2️⃣  Word count of 1,000,000 log lines: masala=312,500, ginger=312,500, lemon=312,500 (5,000,000 words) in 4.40s
+#
+# 3️⃣  Scaling: word count of 1,000,000 lines
+#
+#    Backend  Workers     Time  Speedup
+#    serial         1    4.73s    1.00x
+#    thread         1    4.17s    1.13x
+#    thread         2    4.23s    1.12x
+#    thread         4    4.46s    1.06x
+#    process        1    4.36s    1.08x
+#    process        2    5.84s    0.81x
+#    process        4    5.08s    0.93x
+#
+# Notice:
+#   - The count is RETURNED this time, and it is exact
+#   - The 1M-line log was streamed: at most 2 × workers chunks in memory
+#   - Threads stay flat however many you add: the GIL runs one at a time
+#   - Processes pay pickling + spawn costs; they win only with spare cores
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. Split lazily (islice) and bound the tasks in flight → inputs of any size
+# 2. Combine INSIDE the worker: one partial per chunk, not one per item
+# 3. Reduce pairwise as partials arrive (a tree), in the pool as well
+# 4. Reducers must be associative + commutative: order is not guaranteed
+# 5. Threads won't scale CPU-bound mappers (GIL); processes scale with cores
+#
+# =============================================================================
@@ -0,0 +1,369 @@
+"""
+=============================================================================
+DISK MEMOIZATION: NEVER COMPUTE THE SAME THING TWICE, EVEN ACROSS RUNS
+=============================================================================
+
+The Problem:
+------------
+cpu_heavy() and crunch_number() burn seconds of CPU to produce the SAME
+answer every single time. functools.lru_cache helps within one process,
+but it dies with the process: the next run, or the next worker in a
+process pool, starts from zero again.
+
+The Solution: A MEMO CACHE ON DISK
+----------------------------------
+    @disk_memoize("memo-cache", max_bytes=100_000_000)
+    def cpu_heavy(n): ...
+
+    call cpu_heavy(10**7)
+         │
+         ▼
+    key = sha256( source code of cpu_heavy  +  pickled arguments )
+         │
+         ├── memo-cache/3f/3fa9...e1.pkl exists?  ──► load it  ⚡ HIT
+         │
+         └── no ──► compute ──► write to a temp file ──► os.replace()  MISS
+
+  - The SOURCE is part of the key: edit the function and the old results
+    are simply never looked up again (no stale answers)
+  - os.replace() is ATOMIC: a reader sees the old file, the new file, or
+    no file - never half a pickle. Many processes can share one cache.
+  - Eviction: when the files exceed max_bytes, the Least Recently Used
+    (oldest mtime - every hit touches it) are deleted. Only one process
+    evicts at a time (an fcntl lock), and a file deleted under a reader
+    is just a miss.
+
+Only decorate PURE functions: same arguments → same result, no side
+effects. Memoizing print() or random() changes what your program does.
+
+This Script Demonstrates:
+-------------------------
+  - @disk_memoize: the key, the atomic write, LRU size eviction
+  - cpu_heavy cold vs warm, and warm in a FRESH interpreter (spawn)
+  - Editing a function's source invalidates its results
+  - Four processes hammering one cache directory at once
+  - The cache staying under its size bound
+
+=============================================================================
+"""
+
+import fcntl             # flock(): one evictor at a time (Unix)
+import functools         # wraps() for the decorator
+import hashlib           # SHA-256 cache keys
+import inspect           # getsource(): the function's code is part of the key
+import multiprocessing   # spawn = a fresh interpreter with an empty memory
+import os                # Files, atomic os.replace(), utime()
+import pickle            # Arguments → bytes, results ↔ files
+import shutil            # Cleaning up the demo cache
+import tempfile          # Atomic writes and the demo cache location
+import time              # For measuring execution time
+from concurrent.futures import ProcessPoolExecutor
+
+
+# =============================================================================
+# THE DECORATOR
+# =============================================================================
+
+def _function_fingerprint(fn):
+    """
+    The function's name AND code: editing the body changes it.
+
+    (Not fn.__module__: the same script is "__main__" when run and
+    "__mp_main__" inside a spawned worker - they must share results.)
+    """
+    try:
+        code = inspect.getsource(fn)
+    except OSError:                         # Defined in a REPL or via exec()
+        code = fn.__code__.co_code.hex()
+    return f"{fn.__qualname__}\n{code}"
+
+
+def _cache_size(directory):
+    """Returns (total bytes, [(mtime, size, path), ...]) of the cached results."""
+    entries = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:       # Evicted by another process meanwhile
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+    return sum(size for _, size, _ in entries), entries
+
+
+def _evict(directory, max_bytes):
+    """Deletes least recently used results until the cache fits max_bytes."""
+    with open(os.path.join(directory, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)     # One evictor at a time
+        total, entries = _cache_size(directory)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def disk_memoize(directory, max_bytes=100_000_000):
+    """
+    Memoizes a pure function's results to files under `directory`.
+
+    Args:
+        directory (str): The cache directory (shared by processes and runs)
+        max_bytes (int): Size bound of ALL results in `directory` (LRU
+                         eviction)
+
+    The decorated function gains:
+        .cache_key(*args, **kwargs)  → the hex key for these arguments
+        .cache_info()                → {"hits": .., "misses": ..} (this process)
+        .cache_clear()               → delete this function's stored results
+
+    Usage:
+        @disk_memoize("memo-cache")
+        def cpu_heavy(n): ...
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    def decorator(fn):
+        fingerprint = _function_fingerprint(fn).encode()
+        prefix = hashlib.sha256(fingerprint).hexdigest()[:16]
+        stats = {"hits": 0, "misses": 0}
+
+        def cache_key(*args, **kwargs):
+            arguments = pickle.dumps((args, sorted(kwargs.items())), protocol=5)
+            return prefix + hashlib.sha256(fingerprint + arguments).hexdigest()[:48]
+
+        def path_for(key):
+            return os.path.join(directory, key[:2], key + ".pkl")
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            path = path_for(cache_key(*args, **kwargs))
+            try:
+                with open(path, "rb") as f:
+                    result = pickle.load(f)
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+                pass                         # Not cached (or evicted mid-read)
+            else:
+                try:
+                    os.utime(path)           # Touch: "recently used" for the LRU
+                except FileNotFoundError:
+                    pass
+                stats["hits"] += 1
+                return result
+
+            result = fn(*args, **kwargs)
+            stats["misses"] += 1
+
+            # Atomic write: temp file in the SAME directory, then rename
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(result, f, protocol=5)
+            os.replace(tmp, path)
+            _evict(directory, max_bytes)
+            return result
+
+        def cache_clear():
+            for _, _, path in _cache_size(directory)[1]:
+                if os.path.basename(path).startswith(prefix):
+                    os.remove(path)
+
+        wrapper.cache_key = cache_key
+        wrapper.cache_info = lambda: dict(stats)
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+# =============================================================================
+# THE EXPENSIVE FUNCTIONS (from 10_process_two.py and 04_gil_multiprocessing.py)
+# =============================================================================
+
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "chai-memo-cache")
+
+
+@disk_memoize(CACHE_DIR)
+def cpu_heavy(n):
+    """Sums the numbers from 0 to n, one at a time."""
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+@disk_memoize(CACHE_DIR)
+def crunch_number(n):
+    """Counts to n - and this time RETURNS the count."""
+    count = 0
+    for _ in range(n):
+        count += 1
+    return count
+
+
+@disk_memoize(CACHE_DIR, max_bytes=2_000_000)
+def primes_below(n):
+    """A result with some SIZE (for the eviction demo)."""
+    sieve = bytearray([1]) * n
+    sieve[:2] = b"\x00\x00"
+    for i in range(2, int(n ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, n, i)))
+    return [i for i in range(n) if sieve[i]]
+
+
+def is_cached(fn, *args):
+    key = fn.cache_key(*args)
+    return os.path.exists(os.path.join(CACHE_DIR, key[:2], key + ".pkl"))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def fresh_interpreter_call(n):
+    """Runs in a SPAWNED process: no lru_cache, no globals - only the disk."""
+    result, elapsed = timed(cpu_heavy, n)
+    return result, elapsed, cpu_heavy.cache_info()
+
+
+def worker(n):
+    """Pool worker: a mix of shared and private arguments."""
+    return [crunch_number(n), crunch_number(n + os.getpid() % 7), cpu_heavy(n)]
+
+
+if __name__ == "__main__":
+
+    N = 20_000_000
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    os.makedirs(CACHE_DIR)
+
+    print("=" * 66)
+    print("💾 DISK MEMOIZATION")
+    print("=" * 66)
+    print(f"Cache: {CACHE_DIR}\n")
+
+    # -------------------------------------------------------------------------
+    # 1) Cold, then warm
+    # -------------------------------------------------------------------------
+    print(f"1️⃣  cpu_heavy({N:,})")
+    result, cold = timed(cpu_heavy, N)
+    print(f"   cold: {cold * 1000:>9.1f} ms  → {result:,}")
+    result, warm = timed(cpu_heavy, N)
+    print(f"   warm: {warm * 1000:>9.2f} ms  → {result:,}  ({cold / warm:,.0f}x faster)")
+    print(f"   key:  {cpu_heavy.cache_key(N)}\n")
+
+    # -------------------------------------------------------------------------
+    # 2) A fresh interpreter: nothing in memory, everything on disk
+    # -------------------------------------------------------------------------
+    print("2️⃣  The same call in a FRESH interpreter (spawn)")
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        result, elapsed, info = pool.submit(fresh_interpreter_call, N).result()
+    print(f"   {elapsed * 1000:.2f} ms → {result:,}  {info}\n")
+
+    # -------------------------------------------------------------------------
+    # 3) Editing the source invalidates the results
+    # -------------------------------------------------------------------------
+    print("3️⃣  Same name, same arguments, EDITED body")
+    namespace = {}
+    exec("def cpu_heavy(n):\n    return sum(range(n))\n", namespace)
+    edited = disk_memoize(CACHE_DIR)(namespace["cpu_heavy"])
+    print(f"   original key: {cpu_heavy.cache_key(N)[:24]}...")
+    print(f"   edited key:   {edited.cache_key(N)[:24]}...  → a miss, "
+          f"never the old answer\n")
+
+    # -------------------------------------------------------------------------
+    # 4) Four processes sharing one cache directory
+    # -------------------------------------------------------------------------
+    print("4️⃣  4 processes × 3 calls on one cache, 5 rounds")
+    expected = N // 4
+    start = time.perf_counter()
+    with ProcessPoolExecutor(4) as pool:
+        for _ in range(5):
+            for counts in pool.map(worker, [expected] * 4):
+                assert counts[0] == expected and counts[2] == cpu_heavy(expected)
+    files = len(_cache_size(CACHE_DIR)[1])
+    print(f"   {time.perf_counter() - start:.2f}s, all results correct, "
+          f"{files} result files, no .tmp left: "
+          f"{not any(f.endswith('.tmp') for _, _, fs in os.walk(CACHE_DIR) for f in fs)}\n")
+
+    # -------------------------------------------------------------------------
+    # 5) Size-bounded
+    # -------------------------------------------------------------------------
+    print("5️⃣  primes_below() results with max_bytes=2 MB")
+    for n in range(200_000, 2_200_000, 200_000):
+        primes_below(n)
+        total, _ = _cache_size(CACHE_DIR)
+        print(f"   primes_below({n:>9,}) → cache {total / 1e6:5.2f} MB")
+    print(f"   newest, primes_below(2,000,000), still cached? "
+          f"{is_cached(primes_below, 2_000_000)}")
+    print(f"   oldest, primes_below(200,000), still cached?   "
+          f"{is_cached(primes_below, 200_000)}")
+    print(f"   cpu_heavy({N:,}), used in step 4, cached? {is_cached(cpu_heavy, N)}")
+
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+# =============================================================================
+# EXPECTED OUTPUT
+# =============================================================================
+#
+# ==================================================================
+# 💾 DISK MEMOIZATION
+# ==================================================================
+# Cache: /tmp/chai-memo-cache
+#
+# 1️⃣  cpu_heavy(20,000,000)
+#    cold:     689.8 ms  → 199,999,990,000,000
+#    warm:      0.07 ms  → 199,999,990,000,000  (10,273x faster)
+#    key:  50bb2d4ce90b5645d35c05988bee4d26d2bbd77ffdc32ac1e2675d09712c5eaf
+#
+# 2️⃣  The same call in a FRESH interpreter (spawn)
+#    0.05 ms → 199,999,990,000,000  {'hits': 1, 'misses': 0}
+#
+# 3️⃣  Same name, same arguments, EDITED body
+#    original key: 50bb2d4ce90b5645d35c0598...
+#    edited key:   45018c3d50fee501917dc3b1...  → a miss, never the old answer
+#
+# 4️⃣  4 processes × 3 calls on one cache, 5 rounds
+#    2.08s, all results correct, 7 result files, no .tmp left: True
+#
+# 5️⃣  primes_below() results with max_bytes=2 MB
+#    primes_below(  200,000) → cache  0.08 MB
+#    ...
+#    primes_below(1,400,000) → cache  1.89 MB
+#    primes_below(1,600,000) → cache  1.95 MB
+#    primes_below(1,800,000) → cache  1.78 MB
+#    primes_below(2,000,000) → cache  1.99 MB
+#    newest, primes_below(2,000,000), still cached? True
+#    oldest, primes_below(200,000), still cached?   False
+#    cpu_heavy(20,000,000), used in step 4, cached? False
+#
+# Notice:
+#   - The spawned worker never ran the loop: the answer came from disk
+#   - A handful of files for 60 calls (the count depends on the worker PIDs):
+#     each key is computed once, or twice if two processes miss at the same
+#     moment - harmless for pure functions
+#   - The bound covers the whole directory, so old cpu_heavy results went too
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. Key = hash(function source + arguments): edits invalidate automatically
+# 2. Write to a temp file, then os.replace(): readers never see half a file
+# 3. A disk cache outlives the process: spawned workers and the NEXT run hit
+# 4. Bound the size; touch on hit so eviction removes the least recently used
+# 5. Only memoize PURE functions - the cache skips the call entirely
+#
+# =============================================================================
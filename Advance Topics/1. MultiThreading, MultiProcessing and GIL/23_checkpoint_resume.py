@@ -0,0 +1,303 @@
+"""
+=============================================================================
+CHECKPOINT / RESUME: A KILLED JOB PICKS UP WHERE IT LEFT OFF
+=============================================================================
+
+The Problem:
+------------
+10_process_two.py's cpu_heavy() adds up 1 BILLION numbers in one loop.
+Kill it at 99% (Ctrl+C, an OOM kill, a preemptible cloud node being
+reclaimed) and the restart begins again at 0. All progress lived in one
+local variable of one process.
+
+The Solution: CHUNK THE WORK, RECORD WHAT IS DONE
+-------------------------------------------------
+    range(0, N) split into chunks:
+
+    [0:10M) [10M:20M) [20M:30M) [30M:40M) [40M:50M) ... [990M:1B)
+      ✅       ✅        ✅        ✅        🔄
+      └──────── checkpoint.json ────────┘
+                {"job": {...}, "done": {"0": 4999..., "1": ..., ...}}
+
+    💥 killed here
+
+    restart → read checkpoint.json → skip chunks 0-3 → run only the rest
+
+  - Workers compute chunks; ONLY the parent writes the checkpoint
+    (one writer, no locks)
+  - Atomic write: temp file → fsync → os.replace(). A kill DURING a save
+    leaves the previous checkpoint intact - never a half-written file
+  - `interval` (seconds) trades safety for speed:
+        interval=0   save after every chunk      (lose ≤ the in-flight chunks)
+        interval=5   save at most every 5 s      (lose ≤ 5 s + in-flight)
+  - The job's parameters are stored too: a checkpoint from a DIFFERENT job
+    is ignored, never silently mixed in
+
+This Script Demonstrates:
+-------------------------
+  - Checkpoint: load / record / save atomically
+  - run_checkpointed(): a process pool over chunks that skips finished ones
+  - A real SIGKILL halfway through, then a resume with the exact answer
+  - The overhead of checkpointing for different intervals
+
+=============================================================================
+"""
+
+import json              # The checkpoint file
+import os                # Atomic os.replace(), fsync, process groups
+import signal            # SIGKILL for the "preempted node" demo
+import subprocess        # Runs the job as a separate, killable program
+import sys               # sys.executable / argv for the job subprocess
+import tempfile          # Atomic writes and the demo checkpoint location
+import time              # For measuring execution time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# =============================================================================
+# THE CHECKPOINT
+# =============================================================================
+
+class Checkpoint:
+    """
+    Completed-chunk state for one job, saved atomically to a JSON file.
+
+    Args:
+        path (str): The checkpoint file
+        job (dict): The job's parameters; a file saved for a different job
+                    is ignored
+        interval (float): Minimum seconds between saves (0 = every record)
+
+    Usage:
+        checkpoint = Checkpoint("job.json", {"n": n, "chunk": size}, interval=5)
+        for index in pending:
+            checkpoint.record(index, compute(index))   # saves when due
+        checkpoint.save()                              # final save
+    """
+
+    def __init__(self, path, job, interval=5.0):
+        self.path = path
+        self.job = job
+        self.interval = interval
+        self.done = {}
+        self.saves = 0
+        self.save_time = 0.0
+        self._last_save = time.perf_counter()
+        try:
+            with open(path) as f:
+                state = json.load(f)
+            if state["job"] == job:
+                self.done = {int(i): partial for i, partial in state["done"].items()}
+        except FileNotFoundError:
+            pass
+
+    def record(self, index, partial):
+        """Marks chunk `index` done; saves if `interval` has passed."""
+        self.done[index] = partial
+        if time.perf_counter() - self._last_save >= self.interval:
+            self.save()
+
+    def save(self):
+        """Write to a temp file, fsync, then atomically replace the old one."""
+        start = time.perf_counter()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"job": self.job, "done": self.done}, f)
+            f.flush()
+            os.fsync(f.fileno())        # On disk, not just in the page cache
+        os.replace(tmp, self.path)
+        self._last_save = time.perf_counter()
+        self.saves += 1
+        self.save_time += self._last_save - start
+
+
+# =============================================================================
+# THE CHUNKED JOB
+# =============================================================================
+
+def cpu_heavy(start, stop):
+    """10_process_two.py's loop, over one chunk: sum of start..stop-1."""
+    total = 0
+    for i in range(start, stop):
+        total += i
+    return total
+
+
+def run_checkpointed(n, chunk_size, path, workers=2, interval=5.0, verbose=False):
+    """
+    Sums range(n) in chunks on a process pool, resuming from `path`.
+
+    Args:
+        n (int): How many numbers to add up
+        chunk_size (int): Numbers per chunk (the unit of lost work)
+        path (str): The checkpoint file
+        workers (int): Pool size
+        interval (float): Seconds between checkpoint saves
+
+    Returns:
+        tuple: (total, chunks skipped, the Checkpoint)
+    """
+    chunks = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+    checkpoint = Checkpoint(path, {"n": n, "chunk_size": chunk_size}, interval)
+    skipped = len(checkpoint.done)
+    pending = [i for i in range(len(chunks)) if i not in checkpoint.done]
+    if verbose:
+        print(f"   ▶️  job: {len(chunks)} chunks, {skipped} already done, "
+              f"{len(pending)} to run", flush=True)
+
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = {pool.submit(cpu_heavy, *chunks[i]): i for i in pending}
+            for future in as_completed(futures):
+                checkpoint.record(futures[future], future.result())
+                if verbose:
+                    print(f"      chunk {futures[future]:>2} ✅  "
+                          f"({len(checkpoint.done)}/{len(chunks)})", flush=True)
+    finally:
+        # Also when a chunk fails or the pool breaks: keep what finished
+        checkpoint.save()
+    return sum(checkpoint.done.values()), skipped, checkpoint
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+# =============================================================================
+# THE JOB AS A PROGRAM (so the demo can SIGKILL it like a preempted node)
+# =============================================================================
+
+N = 100_000_000
+CHUNK = 5_000_000
+CHECKPOINT = os.path.join(tempfile.gettempdir(), "cpu_heavy.checkpoint.json")
+
+
+def launch_job():
+    """Starts this script in --job mode in its own process group."""
+    return subprocess.Popen([sys.executable, __file__, "--job"], start_new_session=True)
+
+
+if __name__ == "__main__" and sys.argv[1:] == ["--job"]:
+    total, _, _ = run_checkpointed(N, CHUNK, CHECKPOINT, interval=0, verbose=True)
+    print(f"   🏁 total = {total:,}", flush=True)
+
+elif __name__ == "__main__":
+
+    expected = N * (N - 1) // 2
+    if os.path.exists(CHECKPOINT):
+        os.remove(CHECKPOINT)
+
+    print("=" * 66)
+    print("💾 CHECKPOINT / RESUME")
+    print("=" * 66)
+    print(f"Job: sum of range({N:,}) in {N // CHUNK} chunks of {CHUNK:,}\n")
+
+    # -------------------------------------------------------------------------
+    # 1) Run, get killed, resume
+    # -------------------------------------------------------------------------
+    print("1️⃣  Start the job...")
+    job = launch_job()
+    while True:                         # Wait for roughly half the chunks
+        time.sleep(0.1)
+        try:
+            with open(CHECKPOINT) as f:
+                if len(json.load(f)["done"]) >= N // CHUNK // 2:
+                    break
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+    os.killpg(job.pid, signal.SIGKILL)  # The whole group: parent AND workers
+    job.wait()
+    with open(CHECKPOINT) as f:
+        saved = len(json.load(f)["done"])
+    print(f"   💥 SIGKILL! (checkpoint holds {saved} finished chunks)\n")
+
+    print("   ...restart the same job:")
+    (total, skipped, _), elapsed = timed(run_checkpointed, N, CHUNK, CHECKPOINT,
+                                         interval=0)
+    print(f"   ⏭️  skipped {skipped} chunks, ran {N // CHUNK - skipped} in {elapsed:.2f}s")
+    print(f"   total = {total:,}  correct: {total == expected}\n")
+
+    # -------------------------------------------------------------------------
+    # 2) What does checkpointing cost?
+    # -------------------------------------------------------------------------
+    CHUNK_SMALL = 250_000               # 400 chunks: many chances to save
+    print(f"2️⃣  Overhead: {N // CHUNK_SMALL} chunks of {CHUNK_SMALL:,}\n")
+    print(f"   {'Interval':<14} {'Time':>7} {'Saves':>6} {'In saves':>9} {'% of run':>9}")
+
+    def plain():
+        """The same chunks, no checkpoint at all."""
+        with ProcessPoolExecutor(2) as pool:
+            futures = [pool.submit(cpu_heavy, s, min(s + CHUNK_SMALL, N))
+                       for s in range(0, N, CHUNK_SMALL)]
+            return sum(f.result() for f in futures)
+
+    _, baseline = timed(plain)
+    print(f"   {'none':<14} {baseline:>6.2f}s {'-':>6} {'-':>9} {'-':>9}")
+    for interval in (0, 0.5, 5):
+        os.remove(CHECKPOINT)
+        (total, _, checkpoint), elapsed = timed(run_checkpointed, N, CHUNK_SMALL,
+                                                CHECKPOINT, interval=interval)
+        assert total == expected
+        label = "every chunk" if interval == 0 else f"every {interval}s"
+        print(f"   {label:<14} {elapsed:>6.2f}s {checkpoint.saves:>6} "
+              f"{checkpoint.save_time * 1000:>7.0f}ms "
+              f"{checkpoint.save_time / elapsed * 100:>8.1f}%")
+
+    os.remove(CHECKPOINT)
+
+
+# =============================================================================
+# EXPECTED OUTPUT
+# =============================================================================
+#
+# ==================================================================
+# 💾 CHECKPOINT / RESUME
+# ==================================================================
+# Job: sum of range(100,000,000) in 20 chunks of 5,000,000
+#
+# 1️⃣  Start the job...
+#    ▶️  job: 20 chunks, 0 already done, 20 to run
+#       chunk  1 ✅  (1/20)
+#       chunk  0 ✅  (2/20)
+#       chunk  2 ✅  (3/20)
+#       ...
+#       chunk  8 ✅  (9/20)
+#       chunk  9 ✅  (10/20)
+#    💥 SIGKILL! (checkpoint holds 10 finished chunks)
+#
+#    ...restart the same job:
+#    ⏭️  skipped 10 chunks, ran 10 in 1.83s
+#    total = 4,999,999,950,000,000  correct: True
+#
+# 2️⃣  Overhead: 400 chunks of 250,000
+#
+#    Interval          Time  Saves  In saves  % of run
+#    none             3.93s      -         -         -
+#    every chunk      4.08s    401     587ms     14.4%
+#    every 0.5s       4.68s     10      22ms      0.5%
+#    every 5s         4.28s      1       1ms      0.0%
+#
+# Notice:
+#   - SIGKILL cannot be caught - no cleanup ran, yet nothing was lost
+#     except the chunks that were still in flight
+#   - The resumed run did only the missing half, and the total is exact
+#   - Saving after EVERY tiny chunk costs ~1.5 ms of fsync each; a short
+#     interval makes the cost vanish (the Time column is mostly noise here:
+#     the parent waits while the workers compute)
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. Split long work into chunks: a chunk is the most you can ever lose
+# 2. One writer (the parent) records finished chunks - workers stay simple
+# 3. temp file + fsync + os.replace(): a crash mid-save keeps the old file
+# 4. Store the job's parameters; never resume from a different job's state
+# 5. Tune the interval: saving every chunk is safest, every few seconds is
+#    nearly free
+#
+# =============================================================================
@@ -0,0 +1,342 @@
+"""
+=============================================================================
+CPU AFFINITY: TELLING THE OS WHERE EACH WORKER SHOULD RUN
+=============================================================================
+
+The Problem:
+------------
+02, 04, 10 and 12 start processes and leave the rest to the OS scheduler.
+On a laptop that is fine. On a big server it is not:
+
+    ┌──────────── socket 0 / NUMA node 0 ───────────┐  ┌──── node 1 ────┐
+    │  core0  core1  core2  core3    RAM (local) ◄──┼──┼─► RAM (remote) │
+    └───────────────────────────────────────────────┘  └────────────────┘
+
+  - MIGRATIONS: the scheduler moves a worker core0 → core5 → core2...
+    and each move leaves its warm L1/L2 cache behind
+  - REMOTE MEMORY: a worker allocates its data on node 0 (Linux puts pages
+    where they are FIRST touched), then gets moved to node 1 - every
+    access now crosses the socket interconnect (slower, shared bandwidth)
+
+The Solution: PIN EACH WORKER (os.sched_setaffinity)
+----------------------------------------------------
+The topology comes from sysfs:
+
+    /sys/devices/system/node/node0/cpulist          "0-15,32-47"
+    /sys/devices/system/cpu/cpu5/topology/core_id   which physical core
+    .../thread_siblings_list                        its hyper-threads
+
+Then a PLACEMENT POLICY chooses a CPU set for worker i:
+
+    compact   fill one core, then the next, one node at a time
+              → workers share caches (good when they share data)
+    scatter   one per physical core, alternating nodes, siblings last
+              → most cache and memory bandwidth per worker
+    numa      the whole CPU set of one node, nodes round-robin
+              → may move WITHIN its node, memory stays local
+    none      the OS decides (what the other demos do)
+
+Pinning happens INSIDE the worker before it allocates anything, so
+first-touch puts its memory on the right node.
+
+This Script Demonstrates:
+-------------------------
+  - Reading CPUs, cores, siblings and NUMA nodes from /sys
+  - compact / scatter / numa placement plans
+  - Pinned workers in the style of 02_multiprocessing.py
+  - Pinned vs unpinned throughput, migrations and context switches for a
+    CPU-bound and a memory-bound job
+
+Note: Linux only (sched_setaffinity and /sys). Results depend heavily on
+the machine - on a 1-CPU VM every policy is the same.
+
+=============================================================================
+"""
+
+import glob              # /sys/devices/system/node/node*
+import os                # sched_setaffinity / sched_getaffinity
+import sys               # Exit on platforms without affinity support
+import time              # For measuring execution time
+from multiprocessing import Process, Queue
+
+
+# =============================================================================
+# TOPOLOGY
+# =============================================================================
+
+def parse_cpulist(text):
+    """'0-3,8,10-11' → [0, 1, 2, 3, 8, 10, 11]"""
+    cpus = []
+    for part in text.strip().split(","):
+        if part:
+            low, _, high = part.partition("-")
+            cpus.extend(range(int(low), int(high or low) + 1))
+    return cpus
+
+
+def format_cpulist(cpus):
+    """[0, 1, 2, 3, 8, 10, 11] → '0-3,8,10-11' (the inverse of parse_cpulist)"""
+    parts, cpus = [], sorted(cpus)
+    start = 0
+    for i in range(1, len(cpus) + 1):
+        if i == len(cpus) or cpus[i] != cpus[i - 1] + 1:
+            low, high = cpus[start], cpus[i - 1]
+            parts.append(str(low) if low == high else f"{low}-{high}")
+            start = i
+    return ",".join(parts)
+
+
+def read_topology(root="/sys/devices/system"):
+    """
+    Describes every CPU this process may run on.
+
+    Returns:
+        list[dict]: {"cpu", "node", "package", "core", "siblings"} per CPU,
+                    restricted to os.sched_getaffinity(0)
+    """
+    allowed = os.sched_getaffinity(0)
+    node_of = {}
+    for path in glob.glob(os.path.join(root, "node", "node[0-9]*")):
+        node = int(os.path.basename(path)[4:])
+        with open(os.path.join(path, "cpulist")) as f:
+            for cpu in parse_cpulist(f.read()):
+                node_of[cpu] = node
+
+    def read(cpu, name, default):
+        try:
+            with open(os.path.join(root, "cpu", f"cpu{cpu}", "topology", name)) as f:
+                return f.read().strip()
+        except OSError:                     # Containers sometimes hide these
+            return default
+
+    return [{"cpu": cpu,
+             "node": node_of.get(cpu, 0),
+             "package": int(read(cpu, "physical_package_id", 0)),
+             "core": int(read(cpu, "core_id", cpu)),
+             "siblings": parse_cpulist(read(cpu, "thread_siblings_list", str(cpu)))}
+            for cpu in sorted(allowed)]
+
+
+# =============================================================================
+# PLACEMENT POLICIES
+# =============================================================================
+
+def plan(policy, workers, topology):
+    """
+    Chooses a CPU set for each worker.
+
+    Args:
+        policy (str): "compact", "scatter", "numa" or "none"
+        workers (int): How many workers
+        topology (list): From read_topology()
+
+    Returns:
+        list: One set of CPUs per worker (None = let the OS decide)
+    """
+    if policy == "none":
+        return [None] * workers
+
+    if policy == "compact":
+        # Neighbours first: same node, same package, same core (siblings)
+        order = sorted(topology, key=lambda c: (c["node"], c["package"], c["core"], c["cpu"]))
+        return [{order[i % len(order)]["cpu"]} for i in range(workers)]
+
+    if policy == "scatter":
+        # One CPU per physical core per node, round-robin across nodes;
+        # the hyper-thread siblings come only after every core is used
+        by_node = {}
+        for c in topology:
+            by_node.setdefault(c["node"], []).append(c)
+        rounds = []
+        for cpus in by_node.values():
+            seen, first, rest = set(), [], []
+            for c in sorted(cpus, key=lambda c: (c["package"], c["core"], c["cpu"])):
+                key = (c["package"], c["core"])
+                (rest if key in seen else first).append(c["cpu"])
+                seen.add(key)
+            rounds.append(first + rest)
+        order = [cpus[i] for i in range(max(map(len, rounds)))
+                 for cpus in rounds if i < len(cpus)]
+        return [{order[i % len(order)]} for i in range(workers)]
+
+    if policy == "numa":
+        nodes = sorted({c["node"] for c in topology})
+        node_cpus = {n: {c["cpu"] for c in topology if c["node"] == n} for n in nodes}
+        return [node_cpus[nodes[i % len(nodes)]] for i in range(workers)]
+
+    raise ValueError(f"unknown policy {policy!r}")
+
+
+# =============================================================================
+# PINNED WORKERS
+# =============================================================================
+
+def last_cpu():
+    """The CPU this process last ran on (field 39 of /proc/self/stat)."""
+    with open("/proc/self/stat") as f:
+        return int(f.read().rsplit(")", 1)[1].split()[36])
+
+
+def context_switches():
+    """Involuntary context switches so far: the scheduler took the CPU away."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("nonvoluntary_ctxt_switches"):
+                return int(line.split()[1])
+    return 0
+
+
+def crunch_number(seconds):
+    """CPU-bound: 04_gil_multiprocessing.py's count, for a fixed time."""
+    count, migrations, cpu = 0, 0, last_cpu()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100_000):
+            count += 1
+        now = last_cpu()
+        migrations += now != cpu
+        cpu = now
+    return count, migrations
+
+
+def copy_memory(seconds, size=32 * 1024 * 1024):
+    """Memory-bound: copies a 32 MB buffer (allocated AFTER pinning) again and again."""
+    buffer = bytearray(size)                # First touch: pages land on OUR node
+    copies, migrations, cpu = 0, 0, last_cpu()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        bytes(buffer)
+        copies += 1
+        now = last_cpu()
+        migrations += now != cpu
+        cpu = now
+    return copies, migrations
+
+
+def pinned_worker(cpus, job, seconds, results):
+    """Pins itself FIRST, then works and reports (work, migrations, switches)."""
+    if cpus is not None:
+        os.sched_setaffinity(0, cpus)
+    switches = context_switches()
+    work, migrations = job(seconds)
+    results.put((work, migrations, context_switches() - switches))
+
+
+def run_workers(job, policy, workers, topology, seconds=2.0):
+    """Starts `workers` Processes placed by `policy` (like 02_multiprocessing.py)."""
+    results = Queue()
+    processes = [Process(target=pinned_worker, args=(cpus, job, seconds, results))
+                 for cpus in plan(policy, workers, topology)]
+    [p.start() for p in processes]
+    totals = [results.get() for _ in processes]
+    [p.join() for p in processes]
+    return [sum(column) for column in zip(*totals)]
+
+
+if __name__ == "__main__":
+
+    if not hasattr(os, "sched_setaffinity"):
+        sys.exit("❌ os.sched_setaffinity is Linux-only")
+
+    topology = read_topology()
+    nodes = sorted({c["node"] for c in topology})
+    cores = {(c["package"], c["core"]) for c in topology}
+    workers = max(2, len(topology))
+
+    print("=" * 66)
+    print("📌 CPU AFFINITY AND NUMA PLACEMENT")
+    print("=" * 66)
+
+    # -------------------------------------------------------------------------
+    # 1) Topology
+    # -------------------------------------------------------------------------
+    print(f"1️⃣  Topology: {len(topology)} CPUs, {len(cores)} physical cores, "
+          f"{len(nodes)} NUMA node(s)")
+    for node in nodes:
+        cpus = [c["cpu"] for c in topology if c["node"] == node]
+        print(f"   node {node}: CPUs {cpus}")
+    print()
+
+    # -------------------------------------------------------------------------
+    # 2) Placement plans
+    # -------------------------------------------------------------------------
+    print(f"2️⃣  Plans for {workers} workers")
+    for policy in ("compact", "scatter", "numa"):
+        shown = ["OS" if cpus is None else format_cpulist(cpus)
+                 for cpus in plan(policy, workers, topology)]
+        print(f"   {policy:<8} {shown}")
+    print()
+
+    # -------------------------------------------------------------------------
+    # 3) Benchmark
+    # -------------------------------------------------------------------------
+    print(f"3️⃣  Benchmark: {workers} workers × 2s each\n")
+    for name, job, unit in (("CPU-bound count", crunch_number, "counts/s"),
+                            ("Memory-bound copy", copy_memory, "GB/s")):
+        print(f"   {name}")
+        print(f"   {'Policy':<8} {'Throughput':>16} {'Migrations':>11} {'Switches':>9}")
+        for policy in ("none", "compact", "scatter", "numa"):
+            work, migrations, switches = run_workers(job, policy, workers, topology)
+            rate = work / 2.0
+            shown = f"{rate * 32 / 1024:.2f} {unit}" if unit == "GB/s" else f"{rate / 1e6:.1f}M {unit}"
+            print(f"   {policy:<8} {shown:>16} {migrations:>11} {switches:>9}")
+        print()
+
+
+# =============================================================================
+# EXPECTED OUTPUT
+# =============================================================================
+#
+# (Recorded on a 1-CPU, 1-node VM: every plan is "CPU 0", so the table only
+#  shows run-to-run noise. The policies matter on multi-socket machines.)
+#
+# ==================================================================
+# 📌 CPU AFFINITY AND NUMA PLACEMENT
+# ==================================================================
+# 1️⃣  Topology: 1 CPUs, 1 physical cores, 1 NUMA node(s)
+#    node 0: CPUs [0]
+#
+# 2️⃣  Plans for 2 workers
+#    compact  ['0', '0']
+#    scatter  ['0', '0']
+#    numa     ['0', '0']
+#
+# 3️⃣  Benchmark: 2 workers × 2s each
+#
+#    CPU-bound count
+#    Policy         Throughput  Migrations  Switches
+#    none       31.6M counts/s           0       679
+#    compact    30.9M counts/s           0       689
+#    scatter    27.4M counts/s           0       676
+#    numa       29.6M counts/s           0       652
+#
+#    Memory-bound copy
+#    Policy         Throughput  Migrations  Switches
+#    none            1.36 GB/s           0       576
+#    compact         1.66 GB/s           0       593
+#    scatter         1.77 GB/s           0       602
+#    numa            1.72 GB/s           0       602
+#
+# The plans for 8 workers on a 2-socket box (cores 0-3 + hyper-threads
+# 8-11 on node 0, cores 4-7 + 12-15 on node 1):
+#
+#    compact  ['0', '8', '1', '9', '2', '10', '3', '11']     ← all on node 0
+#    scatter  ['0', '4', '1', '5', '2', '6', '3', '7']       ← no siblings
+#    numa     ['0-3,8-11', '4-7,12-15', '0-3,8-11', ...]     ← node sets
+#
+# On such a box, expect "none" to show migrations, and scatter/numa to beat
+# it on the memory-bound copy.
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. /sys/devices/system/node and cpu*/topology describe the machine
+# 2. os.sched_setaffinity(0, cpus) pins the calling process (and its threads)
+# 3. Pin FIRST, allocate second: Linux places memory where it is first touched
+# 4. compact shares caches, scatter maximizes bandwidth, numa keeps memory local
+# 5. Measure on the target box: on small machines pinning changes little
+#
+# =============================================================================
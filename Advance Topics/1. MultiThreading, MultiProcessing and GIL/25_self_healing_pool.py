@@ -0,0 +1,465 @@
+"""
+=============================================================================
+A SELF-HEALING PROCESS POOL: RECYCLE BLOATED WORKERS, SURVIVE CRASHES
+=============================================================================
+
+The Problem:
+------------
+05_process_async.py's ProcessPoolExecutor is perfect for one job. In a
+service that runs for DAYS it has two weaknesses:
+
+  1. Workers live forever. Any leak - a cache that is never cleared, a
+     C library that fragments the heap - makes every worker grow:
+
+         worker RSS ▲                                   ╱ ... OOM killer
+                    │                          ╱╱╱╱╱╱╱╱
+                    │              ╱╱╱╱╱╱╱╱╱╱╱╱
+                    │  ╱╱╱╱╱╱╱╱╱╱╱╱
+                    └─────────────────────────────────────► time
+
+  2. One worker dying (OOM kill, segfault) breaks the WHOLE executor:
+     every pending future fails with BrokenProcessPool.
+
+Python 3.11 added ProcessPoolExecutor(max_tasks_per_child=N), which fixes
+only part of 1: it counts tasks, it cannot see memory. (And on 3.11.7 it
+hung for good while recording this demo, once workers were replaced with
+thousands of tasks still queued - so it is not in the benchmark.)
+
+The Solution: A POOL THAT WATCHES ITS WORKERS
+---------------------------------------------
+                      ┌───────────── dispatcher thread ─────────────┐
+    submit() ──► queue│ pending tasks live in the PARENT            │
+                      │                                             │
+                      │  worker 1 ◄─pipe─► task / result  ── RSS ok │
+                      │  worker 2 ◄─pipe─► task / result  ── RSS too│
+                      │                                      high → │
+                      │  retire AFTER its task, spawn a new one   ♻️ │
+                      │  worker died? → requeue its task, respawn 🩹 │
+                      └─────────────────────────────────────────────┘
+
+  - max_tasks_per_child: recycle after N tasks
+  - max_rss_mb: the watchdog reads /proc/<pid>/status after each task;
+    a worker over the limit finishes its task and is replaced (graceful)
+  - kill_rss_mb: a HARD limit, checked while a task runs - the worker is
+    killed and its task requeued
+  - Queued tasks are never in a worker, so a crash cannot lose them; the
+    one task a dead worker held is retried (up to max_retries)
+
+This Script Demonstrates:
+-------------------------
+  - SelfHealingPool: submit()/map() returning concurrent.futures.Future
+  - A leaky encrypt() from 05_process_async.py
+  - A soak benchmark: throughput and worker RSS over time for the plain
+    executor, max_tasks_per_child, and RSS-based recycling
+  - A worker SIGKILLed mid-soak without losing a single task
+
+Note: Linux only (/proc).
+
+=============================================================================
+"""
+
+import os                # getpid(), kill()
+import signal            # SIGKILL: the "OOM killer" in the crash demo
+import threading         # The dispatcher and the RSS sampler
+import time              # For measuring execution time
+import traceback         # Text of an exception that can't be pickled
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor
+from multiprocessing import Pipe, Process, active_children
+from multiprocessing.connection import wait
+
+
+# =============================================================================
+# MEMORY, FROM /proc
+# =============================================================================
+
+def rss_mb(pid="self"):
+    """Resident memory of a process in MB (0 once it has exited)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (FileNotFoundError, ProcessLookupError):
+        pass
+    return 0.0
+
+
+class WorkerLost(Exception):
+    """A task's worker died on every attempt."""
+
+
+# =============================================================================
+# THE POOL
+# =============================================================================
+
+def _worker_main(conn):
+    """Runs in the worker process: task in, result out, until told to stop."""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:                    # The parent went away
+            return
+        if task is None:                    # Graceful retirement
+            return
+        task_id, fn, args = task
+        try:
+            conn.send((task_id, True, fn(*args)))
+        except Exception as exc:
+            try:
+                conn.send((task_id, False, exc))
+            except Exception:
+                # The exception itself won't pickle (it holds a lambda, a
+                # socket...): send a stand-in with its text and traceback
+                text = "".join(traceback.format_exception(exc))
+                conn.send((task_id, False, RuntimeError(f"{exc!r}\n\n{text}")))
+
+
+class _Worker:
+    def __init__(self):
+        self.conn, child_conn = Pipe()
+        self.process = Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None                    # (task_id, fn, args, future, attempts)
+        self.tasks_done = 0
+        self.retiring = False
+
+
+class SelfHealingPool:
+    """
+    A process pool that recycles workers by task count or RSS, and respawns
+    crashed workers without losing work.
+
+    Args:
+        workers (int): Number of worker processes
+        max_tasks_per_child (int): Recycle a worker after this many tasks
+        max_rss_mb (float): Recycle a worker (after its task) above this RSS
+        kill_rss_mb (float): Kill a worker (during its task) above this RSS
+        max_retries (int): Attempts for a task whose worker keeps dying
+        watch_interval (float): Seconds between checks of running workers
+
+    Usage:
+        with SelfHealingPool(4, max_rss_mb=500) as pool:
+            future = pool.submit(encrypt, "credit_card_1234")
+            print(future.result())
+    """
+
+    def __init__(self, workers=2, max_tasks_per_child=None, max_rss_mb=None,
+                 kill_rss_mb=None, max_retries=2, watch_interval=0.05):
+        self.max_tasks_per_child = max_tasks_per_child
+        self.max_rss_mb = max_rss_mb
+        self.kill_rss_mb = kill_rss_mb
+        self.max_retries = max_retries
+        self.watch_interval = watch_interval
+        self.stats = {"recycled_tasks": 0, "recycled_rss": 0, "killed_rss": 0,
+                      "crashed": 0, "requeued": 0}
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._closing = False
+        self._woken = False                 # A wakeup byte is already in the pipe
+        self._next_id = 0
+        self._wakeup_r, self._wakeup_w = Pipe(duplex=False)
+        self._workers = [_Worker() for _ in range(workers)]
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    # -- public API ------------------------------------------------------------
+
+    def submit(self, fn, *args):
+        future = Future()
+        with self._lock:
+            if self._closing:
+                raise RuntimeError("cannot submit after shutdown")
+            self._next_id += 1
+            self._pending.append((self._next_id, fn, args, future, 0))
+            self._wake()
+        return future
+
+    def map(self, fn, iterable):
+        return [f.result() for f in [self.submit(fn, item) for item in iterable]]
+
+    def pids(self):
+        return [w.process.pid for w in self._workers]
+
+    def shutdown(self):
+        """Finishes every queued task, then stops the workers."""
+        with self._lock:
+            self._closing = True
+            self._wake()
+        self._dispatcher.join()
+
+    def _wake(self):
+        """Interrupts the dispatcher's wait(). Caller holds _lock."""
+        if not self._woken:
+            self._woken = True
+            self._wakeup_w.send_bytes(b"")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    # -- the dispatcher thread ---------------------------------------------------
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                busy = any(w.task for w in self._workers)
+                if self._closing and not self._pending and not busy:
+                    break
+                for worker in self._workers:
+                    if worker.task is None and worker.retiring:
+                        self._replace(worker)
+                for worker in self._workers:
+                    while worker.task is None and self._pending:
+                        task = self._pending.popleft()
+                        task_id, fn, args, future, attempts = task
+                        if attempts == 0 and not future.set_running_or_notify_cancel():
+                            continue        # Cancelled while it was queued
+                        try:
+                            worker.conn.send((task_id, fn, args))
+                        except Exception as exc:    # e.g. a lambda won't pickle
+                            future.set_exception(exc)
+                            continue
+                        worker.task = task
+
+            owners = {}
+            for worker in self._workers:
+                owners[worker.conn] = owners[worker.process.sentinel] = worker
+            for ready in wait([self._wakeup_r, *owners], timeout=self.watch_interval):
+                if ready is self._wakeup_r:
+                    with self._lock:
+                        self._wakeup_r.recv_bytes()
+                        self._woken = False
+                    continue
+                worker = owners[ready]
+                if worker not in self._workers:
+                    continue                # Already replaced this round
+                if ready is worker.conn and worker.conn.poll():
+                    try:
+                        message = worker.conn.recv()
+                    except (EOFError, ConnectionResetError):
+                        pass                # Died mid-task: handled below
+                    except Exception as exc:    # A result that won't unpickle
+                        self._finish(worker, None, False, exc)
+                        continue
+                    else:
+                        self._finish(worker, *message)
+                        continue
+                if not worker.process.is_alive():
+                    self.stats["crashed"] += 1
+                    with self._lock:
+                        self._replace(worker)
+
+            if self.kill_rss_mb:            # The hard limit, mid-task
+                for worker in list(self._workers):
+                    if worker.task and rss_mb(worker.process.pid) > self.kill_rss_mb:
+                        worker.process.kill()
+                        worker.process.join()
+                        self.stats["killed_rss"] += 1
+                        with self._lock:
+                            self._replace(worker)
+
+        for worker in self._workers:
+            worker.conn.send(None)
+            worker.process.join()
+
+    def _finish(self, worker, task_id, ok, value):
+        """A result arrived: resolve the future, then decide if the worker retires."""
+        future = worker.task[3]
+        worker.task = None
+        worker.tasks_done += 1
+        try:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        except InvalidStateError:
+            pass                            # Already resolved: nothing to report
+        if self.max_tasks_per_child and worker.tasks_done >= self.max_tasks_per_child:
+            worker.retiring = True
+            self.stats["recycled_tasks"] += 1
+        elif self.max_rss_mb and rss_mb(worker.process.pid) > self.max_rss_mb:
+            worker.retiring = True
+            self.stats["recycled_rss"] += 1
+
+    def _replace(self, worker):
+        """Stops `worker` (gracefully if idle) and starts a fresh one. Holds _lock."""
+        if worker.task is not None:         # It died holding a task
+            task_id, fn, args, future, attempts = worker.task
+            if attempts < self.max_retries:
+                self._pending.appendleft((task_id, fn, args, future, attempts + 1))
+                self.stats["requeued"] += 1
+            else:
+                future.set_exception(WorkerLost(f"task {task_id}: worker died "
+                                                f"{attempts + 1} times"))
+        elif worker.process.is_alive():
+            worker.conn.send(None)
+        worker.process.join()
+        worker.conn.close()
+        self._workers[self._workers.index(worker)] = _Worker()
+
+
+# =============================================================================
+# THE LEAKY TASK (05_process_async.py's encrypt, with a "cache")
+# =============================================================================
+
+_SEEN = []                                  # Grows forever: the leak
+
+
+def encrypt(data):
+    """Reverses the string - and "caches" a 64 KB working copy, forever."""
+    _SEEN.append(data.encode() * (64 * 1024 // len(data)))
+    total = 0
+    for i in range(20_000):                 # ~1 ms of real CPU work
+        total += i
+    return f"🔒 {data[::-1]}"
+
+
+def poison(_):
+    """A task that kills whichever worker runs it."""
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+# =============================================================================
+# THE SOAK BENCHMARK
+# =============================================================================
+
+class RSSSampler(threading.Thread):
+    """Records the largest worker RSS every 50 ms."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.samples = []
+        self.running = True
+
+    def run(self):
+        start = time.perf_counter()
+        while self.running:
+            largest = max((rss_mb(p.pid) for p in active_children()), default=0.0)
+            self.samples.append((time.perf_counter() - start, largest))
+            time.sleep(0.05)
+
+    def at(self, fraction):
+        """The largest worker RSS at `fraction` of the run."""
+        end = self.samples[-1][0] * fraction
+        return max((mb for t, mb in self.samples if t <= end and t >= end - 0.5),
+                   default=0.0)
+
+
+def soak(make_pool, tasks, kill_after=None):
+    """Runs `tasks` encrypt() calls; optionally SIGKILLs a worker partway."""
+    items = [f"credit_card_{i:06d}" for i in range(tasks)]
+    sampler = RSSSampler()
+    sampler.start()
+    start = time.perf_counter()
+    with make_pool() as pool:
+        futures = [pool.submit(encrypt, item) for item in items]
+        if kill_after:
+            futures[kill_after].result()
+            os.kill(pool.pids()[0], signal.SIGKILL)
+        results = [f.result() for f in futures]
+        elapsed = time.perf_counter() - start
+        stats = getattr(pool, "stats", {})
+    sampler.running = False
+    sampler.join()
+    lost = sum(r != f"🔒 {item[::-1]}" for r, item in zip(results, items))
+    return tasks / elapsed, sampler, stats, lost
+
+
+if __name__ == "__main__":
+
+    TASKS = 10_000
+    WORKERS = 2
+
+    print("=" * 70)
+    print("🩺 SELF-HEALING POOL: recycling and respawning workers")
+    print("=" * 70)
+
+    # -------------------------------------------------------------------------
+    # 1) Why: one dead worker breaks ProcessPoolExecutor
+    # -------------------------------------------------------------------------
+    print("1️⃣  A worker dies inside ProcessPoolExecutor...")
+    with ProcessPoolExecutor(WORKERS) as pool:
+        futures = [pool.submit(poison, 0)] + [pool.submit(encrypt, "card") for _ in range(5)]
+        failed = sum(f.exception() is not None for f in futures)
+    print(f"   {failed} of {len(futures)} futures failed "
+          f"({type(futures[-1].exception()).__name__})")
+
+    with SelfHealingPool(WORKERS, max_retries=1) as pool:
+        futures = [pool.submit(poison, 0)] + [pool.submit(encrypt, "card") for _ in range(5)]
+        failed = sum(f.exception() is not None for f in futures)
+    print(f"   SelfHealingPool: {failed} of {len(futures)} failed "
+          f"({type(futures[0].exception()).__name__}: {futures[0].exception()})")
+    print(f"   {pool.stats}\n")
+
+    # -------------------------------------------------------------------------
+    # 2) The soak benchmark
+    # -------------------------------------------------------------------------
+    print(f"2️⃣  Soak: {TASKS:,} leaky encrypt() tasks (+64 KB each), {WORKERS} workers\n")
+    configs = [
+        ("ProcessPoolExecutor", lambda: ProcessPoolExecutor(WORKERS), None),
+        ("SelfHealing max_tasks=1000",
+         lambda: SelfHealingPool(WORKERS, max_tasks_per_child=1000), None),
+        ("SelfHealing max_rss=100MB",
+         lambda: SelfHealingPool(WORKERS, max_rss_mb=100), None),
+        ("  + SIGKILL a worker",
+         lambda: SelfHealingPool(WORKERS, max_rss_mb=100), TASKS // 2),
+    ]
+    print(f"   {'Pool':<27} {'tasks/s':>8}   {'worker RSS (MB) at 25/50/75/100%':<33} "
+          f"{'recycled':>8} {'lost':>5}")
+    for name, make_pool, kill_after in configs:
+        rate, sampler, stats, lost = soak(make_pool, TASKS, kill_after)
+        timeline = " ".join(f"{sampler.at(x):>6.0f}" for x in (0.25, 0.5, 0.75, 1.0))
+        recycled = stats.get("recycled_tasks", 0) + stats.get("recycled_rss", 0)
+        print(f"   {name:<27} {rate:>8.0f}   {timeline:<33} "
+              f"{recycled if stats else '-':>8} {lost:>5}")
+        if stats.get("crashed"):
+            print(f"   {'':<27} ↳ crashed {stats['crashed']}, "
+                  f"requeued {stats['requeued']}")
+
+
+# =============================================================================
+# EXPECTED OUTPUT
+# =============================================================================
+#
+# ======================================================================
+# 🩺 SELF-HEALING POOL: recycling and respawning workers
+# ======================================================================
+# 1️⃣  A worker dies inside ProcessPoolExecutor...
+#    6 of 6 futures failed (BrokenProcessPool)
+#    SelfHealingPool: 1 of 6 failed (WorkerLost: task 1: worker died 2 times)
+#    {'recycled_tasks': 0, 'recycled_rss': 0, 'killed_rss': 0, 'crashed': 2, 'requeued': 1}
+#
+# 2️⃣  Soak: 10,000 leaky encrypt() tasks (+64 KB each), 2 workers
+#
+#    Pool                         tasks/s   worker RSS (MB) at 25/50/75/100%  recycled  lost
+#    ProcessPoolExecutor              792       80    169    244    326              -     0
+#    SelfHealing max_tasks=1000      1266       89     61     76     94              9     0
+#    SelfHealing max_rss=100MB       1199      100     51     56     68              8     0
+#      + SIGKILL a worker            1227      100     99     98     70              8     0
+#                                ↳ crashed 1, requeued 1
+#
+# Notice:
+#   - Only the poison task failed; the 5 tasks queued behind it succeeded
+#   - The plain pool grows without limit (and slows down: every new page
+#     is a page fault); the recycled pools saw-tooth under their bound
+#   - Recycling 8-9 times cost nothing measurable here: a fork is ~ms
+#   - The SIGKILLed worker's task was requeued: 0 of 10,000 lost
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. Long-lived workers accumulate memory; recycling bounds it
+# 2. Recycle on what you care about: RSS from /proc, not just a task count
+# 3. Retire AFTER the current task - graceful, nothing is interrupted
+# 4. Keep the queue in the parent: a dead worker loses at most its own task,
+#    which is retried
+# 5. The price is a respawn every few hundred tasks - measure it
+#
+# =============================================================================
@@ -0,0 +1,341 @@
+"""
+=============================================================================
+CONSISTENT-HASH SHARDING: SEND EACH KEY TO THE WORKER THAT ALREADY KNOWS IT
+=============================================================================
+
+The Problem:
+------------
+Every pool in these demos hands the next task to whichever worker is
+free. That is fine for stateless work. But many tasks carry a KEY (a
+customer, a stock symbol) and need per-key state that is expensive to
+build - a profile loaded from a database, a model, a price history:
+
+    round-robin / random:   customer 42 → worker 1, then 3, then 0, then 2
+                            → EVERY worker builds and caches customer 42
+                            → 4 copies in memory, 4× the misses
+
+The Solution: ROUTE BY KEY, ON A HASH RING
+------------------------------------------
+    hash(key) % n_workers   is simple, but change n from 4 to 5 and
+                            ~80% of the keys move to another worker:
+                            every cache goes cold at once.
+
+A CONSISTENT HASH RING moves only ~1/n of them:
+
+                     worker-0#17
+                 ●───────●───────●  worker-2#3
+          w-1#88 ●                 ●
+                 │    a key hashes  │     each worker owns many points
+          w-3#5  ●    to a point;   ●     ("virtual nodes") on the ring;
+                 │    walk clockwise│     a key belongs to the NEXT point
+          w-0#2  ●    to the next   ●
+                 ●───────●───────●  w-1#40
+                       w-2#61
+
+    Add worker-4: it takes over the arcs just before ITS points - about
+    1/5 of the keys - and every other key stays where its cache is hot.
+
+This Script Demonstrates:
+-------------------------
+  - HashRing: virtual nodes, node_for(key), add()/remove()
+  - KeyedPool: one queue per worker process, tasks routed by key
+    ("consistent"), by hash % n ("modulo") or at random ("random")
+  - How many keys move when a worker is added: modulo vs ring
+  - Cache hit rate and throughput for each policy, before and after
+    growing the pool from 4 to 5 workers
+
+=============================================================================
+"""
+
+import bisect            # Finding the next point on the ring
+import hashlib           # A stable hash (hash() is randomized per process)
+import itertools         # Task ids
+import random            # Random dispatch and the key distribution
+import threading         # The result collector
+import time              # For measuring execution time
+from collections import OrderedDict
+from concurrent.futures import Future
+from multiprocessing import Process, Queue
+
+
+def stable_hash(text):
+    """A 64-bit hash that is the same in every process and every run."""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+# =============================================================================
+# THE HASH RING
+# =============================================================================
+
+class HashRing:
+    """
+    A consistent hash ring.
+
+    Args:
+        nodes (iterable): Initial node names
+        replicas (int): Virtual nodes per node (more = more even spread)
+
+    Usage:
+        ring = HashRing(["worker-0", "worker-1"])
+        ring.node_for("customer-42")      # → "worker-1", always
+        ring.add("worker-2")              # only ~1/3 of keys move
+    """
+
+    def __init__(self, nodes=(), replicas=100):
+        self.replicas = replicas
+        self._points = []                   # Sorted hash positions
+        self._owners = {}                   # position → node
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node):
+        for i in range(self.replicas):
+            point = stable_hash(f"{node}#{i}")
+            bisect.insort(self._points, point)
+            self._owners[point] = node
+
+    def remove(self, node):
+        for i in range(self.replicas):
+            point = stable_hash(f"{node}#{i}")
+            self._points.remove(point)
+            del self._owners[point]
+
+    def node_for(self, key):
+        """The first node clockwise from the key's position."""
+        index = bisect.bisect(self._points, stable_hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+
+# =============================================================================
+# THE WORKER: A LOCAL CACHE OF PER-KEY STATE
+# =============================================================================
+
+def build_state(key):
+    """The EXPENSIVE part: load/compute this customer's state (~1.5 ms)."""
+    seed = stable_hash(key)
+    total = 0
+    for i in range(20_000):
+        total = (total + i * seed) % 1_000_003
+    return total
+
+
+def handle(state, amount):
+    """The CHEAP part: use the state for one task."""
+    return (state + amount) % 1_000_003
+
+
+def worker_main(tasks, results, cache_size):
+    """One worker process: an LRU cache of states, fed by its OWN queue."""
+    cache = OrderedDict()
+    while (task := tasks.get()) is not None:
+        task_id, key, amount = task
+        hit = key in cache
+        if hit:
+            cache.move_to_end(key)
+        else:
+            cache[key] = build_state(key)
+            if len(cache) > cache_size:
+                cache.popitem(last=False)   # Evict the least recently used
+        results.put((task_id, handle(cache[key], amount), hit))
+
+
+# =============================================================================
+# THE KEYED POOL
+# =============================================================================
+
+class KeyedPool:
+    """
+    A process pool that routes each task by its key.
+
+    Args:
+        workers (int): Initial number of worker processes
+        policy (str): "consistent" (hash ring), "modulo" (hash % n) or "random"
+        cache_size (int): Per-key states each worker keeps (LRU)
+
+    Usage:
+        with KeyedPool(4) as pool:
+            future = pool.submit("customer-42", 99)
+            print(future.result())
+    """
+
+    def __init__(self, workers=4, policy="consistent", cache_size=300):
+        self.policy = policy
+        self.cache_size = cache_size
+        self.hits = self.misses = 0
+        self._names = []
+        self._queues = {}
+        self._processes = {}
+        self._ring = HashRing()
+        self._results = Queue()
+        self._futures = {}
+        self._ids = itertools.count()
+        self._random = random.Random(0)
+        for _ in range(workers):
+            self.add_worker()
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    def add_worker(self):
+        name = f"worker-{len(self._names)}"
+        self._queues[name] = Queue()
+        self._processes[name] = Process(target=worker_main, daemon=True,
+                                        args=(self._queues[name], self._results, self.cache_size))
+        self._processes[name].start()
+        self._names.append(name)
+        self._ring.add(name)
+
+    def route(self, key):
+        """The worker that handles `key` under this pool's policy."""
+        if self.policy == "consistent":
+            return self._ring.node_for(key)
+        if self.policy == "modulo":
+            return self._names[stable_hash(key) % len(self._names)]
+        return self._random.choice(self._names)
+
+    def submit(self, key, amount):
+        task_id = next(self._ids)
+        future = self._futures[task_id] = Future()
+        self._queues[self.route(key)].put((task_id, key, amount))
+        return future
+
+    def _collect(self):
+        while (result := self._results.get()) is not None:
+            task_id, value, hit = result
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._futures.pop(task_id).set_result(value)
+
+    def shutdown(self):
+        for name in self._names:
+            self._queues[name].put(None)
+        for process in self._processes.values():
+            process.join()
+        self._results.put(None)
+        self._collector.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def customer_stream(n, customers, seed):
+    """n (key, amount) tasks; a few customers are MUCH busier (Zipf-like)."""
+    rng = random.Random(seed)
+    keys = [f"customer-{i}" for i in range(customers)]
+    weights = [1 / (rank + 1) ** 0.6 for rank in range(customers)]
+    return [(key, rng.randint(1, 500)) for key in rng.choices(keys, weights, k=n)]
+
+
+def run_phase(pool, tasks):
+    """Submits every task, waits for all; returns (tasks/s, hit rate)."""
+    hits, misses = pool.hits, pool.misses
+    start = time.perf_counter()
+    futures = [pool.submit(key, amount) for key, amount in tasks]
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+    phase_hits, phase_misses = pool.hits - hits, pool.misses - misses
+    return len(tasks) / elapsed, phase_hits / (phase_hits + phase_misses)
+
+
+if __name__ == "__main__":
+
+    CUSTOMERS = 2_000
+    TASKS = 10_000
+    CACHE = 300                             # Per worker: 4 × 300 < 2,000 customers
+
+    print("=" * 66)
+    print("💍 CONSISTENT-HASH SHARDING")
+    print("=" * 66)
+
+    # -------------------------------------------------------------------------
+    # 1) How many keys move when the pool grows?
+    # -------------------------------------------------------------------------
+    keys = [f"customer-{i}" for i in range(CUSTOMERS)]
+    print(f"1️⃣  Keys that change worker ({CUSTOMERS:,} customers)\n")
+    print(f"   {'Workers':<9} {'hash % n':>9} {'ring':>7} {'ideal':>7}")
+    for before, after in ((4, 5), (5, 6), (8, 9), (5, 4)):
+        modulo = sum(stable_hash(k) % before != stable_hash(k) % after for k in keys)
+        ring_before = HashRing([f"worker-{i}" for i in range(before)])
+        ring_after = HashRing([f"worker-{i}" for i in range(after)])
+        ring = sum(ring_before.node_for(k) != ring_after.node_for(k) for k in keys)
+        ideal = abs(after - before) / max(before, after)
+        print(f"   {before} → {after:<5} {modulo / CUSTOMERS:>8.0%} {ring / CUSTOMERS:>7.0%} "
+              f"{ideal:>7.0%}")
+    print()
+
+    # -------------------------------------------------------------------------
+    # 2) Hit rate and throughput, then grow the pool 4 → 5
+    # -------------------------------------------------------------------------
+    print(f"2️⃣  {TASKS:,} tasks over {CUSTOMERS:,} customers, "
+          f"LRU of {CACHE} states per worker\n")
+    print(f"   {'':<11} {'4 workers':^20}   {'5th worker added':^43}")
+    print(f"   {'':<11} {'':^20}   {'next 2,000 tasks':^20}   {'settled':^20}")
+    print(f"   {'Policy':<11}" + f" {'hit rate':>9} {'tasks/s':>10}  " * 3)
+    warmup = customer_stream(TASKS, CUSTOMERS, seed=1)
+    steady = customer_stream(TASKS, CUSTOMERS, seed=2)
+    after = customer_stream(TASKS, CUSTOMERS, seed=3)
+    for policy in ("random", "modulo", "consistent"):
+        with KeyedPool(4, policy, CACHE) as pool:
+            run_phase(pool, warmup)         # Fill the caches first
+            phases = [run_phase(pool, steady)]
+            pool.add_worker()
+            phases.append(run_phase(pool, after[:2_000]))
+            phases.append(run_phase(pool, after[2_000:]))
+        print(f"   {policy:<11}" + "".join(f" {hit:>9.0%} {rate:>10,.0f}  "
+                                             for rate, hit in phases))
+
+
+# =============================================================================
+# EXPECTED OUTPUT
+# =============================================================================
+#
+# ==================================================================
+# 💍 CONSISTENT-HASH SHARDING
+# ==================================================================
+# 1️⃣  Keys that change worker (2,000 customers)
+#
+#    Workers    hash % n    ring   ideal
+#    4 → 5          81%     21%     20%
+#    5 → 6          84%     18%     17%
+#    8 → 9          89%     12%     11%
+#    5 → 4          81%     21%     20%
+#
+# 2️⃣  10,000 tasks over 2,000 customers, LRU of 300 states per worker
+#
+#                     4 workers                      5th worker added
+#                                         next 2,000 tasks           settled
+#    Policy       hit rate    tasks/s    hit rate    tasks/s    hit rate    tasks/s
+#    random            30%        722         29%        674         30%        701
+#    modulo            74%      1,789         51%      1,002         83%      2,666
+#    consistent        74%      1,751         71%      1,650         84%      3,026
+#
+# Notice:
+#   - Random dispatch: each worker caches random customers → 30% hits, and
+#     2.5x less throughput, because almost every task rebuilds state
+#   - Keyed routing gives each worker a SHARD of ~500 customers, so its 300
+#     slots cover the busiest of them → 74% hits
+#   - Right after the resize, modulo drops to 51% (80% of keys moved to a
+#     cold worker); the ring barely notices (71%)
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. Keyed state + random dispatch = every worker caches every key
+# 2. Route by key: each worker owns a SHARD, its cache holds only that shard
+# 3. hash % n reshuffles almost everything when n changes - a ring moves ~1/n
+# 4. Virtual nodes (replicas) even out the share each worker gets
+# 5. A bonus: one key → one worker → one FIFO queue, so per-key order holds
+#
+# =============================================================================
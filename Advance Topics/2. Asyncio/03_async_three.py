@@ -37,6 +37,7 @@ Installation:
 """
 
 import asyncio  # Python's async library
+import time     # For measuring execution time
 import aiohttp  # Async HTTP client library (pip install aiohttp)
 
 
@@ -94,7 +95,6 @@ async def main():
     
     print(f"Fetching {len(urls)} URLs (each has 2-second delay)...\n")
     
-    import time
     start = time.time()
     
     # =========================================================================
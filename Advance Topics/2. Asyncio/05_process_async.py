@@ -39,6 +39,7 @@ ThreadPoolExecutor vs ProcessPoolExecutor:
 """
 
 import asyncio  # Python's async library
+import time     # For measuring execution time
 from concurrent.futures import ProcessPoolExecutor  # Process pool for CPU work
 
 
@@ -101,7 +102,6 @@ async def main():
     # 2. Only picklable objects can be passed as arguments
     # 3. Higher overhead, but true parallelism for CPU work
     
-    import time
     start = time.time()
     
     with ProcessPoolExecutor() as pool:
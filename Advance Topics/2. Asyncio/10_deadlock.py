@@ -52,6 +52,7 @@ WARNING:
 """
 
 import threading  # For creating threads and locks
+import time       # For the small delay inside each task
 
 
 # =============================================================================
@@ -76,7 +77,6 @@ def task1():
         
         # Small delay makes deadlock more likely to occur
         # (gives Task 2 time to acquire Lock B)
-        import time
         time.sleep(0.1)
         
         # Now try to acquire lock B
@@ -97,7 +97,6 @@ def task2():
         print("🟢 Task 2 acquired lock B")
         
         # Small delay makes deadlock more likely to occur
-        import time
         time.sleep(0.1)
         
         # Now try to acquire lock A
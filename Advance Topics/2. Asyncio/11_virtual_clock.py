@@ -0,0 +1,577 @@
+"""
+=============================================================================
+VIRTUAL TIME: RUNNING SLEEP-DRIVEN DEMOS IN MILLISECONDS
+=============================================================================
+
+The Problem:
+------------
+Every demo in Advance Topics waits for real:
+
+    time.sleep(2)            # 01_threading.py: taking an order
+    await asyncio.sleep(3)   # 06_bgworker.py: fetching orders
+
+That is great for watching concurrency happen, but checking that ALL the
+demos still work takes minutes, and simulating a full day of chai-shop
+traffic would take... a full day.
+
+The Idea: FAKE THE CLOCK, KEEP THE ORDER
+----------------------------------------
+A sleep only matters for two things:
+  1. WHAT TIME it is when the sleeper wakes up
+  2. In WHICH ORDER sleepers wake up
+
+Neither needs real waiting! A VIRTUAL CLOCK keeps its own "now" and, as
+soon as every thread is asleep, JUMPS straight to the earliest wake-up:
+
+    Real clock:     order#1 ──2s── order#2 ──2s── order#3    (6 real secs)
+    Virtual clock:  order#1 ─jump─ order#2 ─jump─ order#3    (~1 real ms)
+                    now=0          now=2          now=4       ← same times!
+
+How It Works:
+-------------
+    THREADS   time.sleep() is patched: the thread registers its wake-up
+              time and waits. When ALL participating threads are
+              sleeping (or joining), the clock advances to the EARLIEST
+              wake-up and wakes exactly the threads that are due.
+
+    ASYNCIO   A custom event loop whose time() reads the virtual clock.
+              When the loop has nothing to do until its next timer, it
+              "sleeps" on the virtual clock instead of blocking in select().
+
+time.time(), time.monotonic() and time.perf_counter() are patched too, so
+the demos' own "⏱️ took 9.00 seconds" lines report VIRTUAL seconds.
+
+Limits (good to know):
+----------------------
+  - Only time.sleep / asyncio.sleep / Thread.join are understood. If a
+    thread blocks on a Lock or queue.get(), the clock cannot know it is
+    idle; after a short real grace period (default 50ms) it advances
+    anyway, so things keep moving - just not instantly.
+  - Worker PROCESSES have their own clock and sleep for real.
+  - Code that did `from time import sleep` before patching keeps the
+    real sleep.
+
+This Script Demonstrates:
+-------------------------
+  - VirtualClock, VirtualTimeEventLoop and the virtual_time() context manager
+  - run_demo(path): run any demo script under virtual time
+  - An 8-HOUR chai-shop shift simulated in a fraction of a second
+  - A check that 06_bgworker.py prints the same lines at the same times
+    under virtual time as it does for real
+
+Usage:
+------
+    python 11_virtual_clock.py                       # built-in examples
+    python 11_virtual_clock.py 01_async_one.py ...   # run demos virtually
+
+=============================================================================
+"""
+
+import asyncio      # Event loop we put on the virtual clock
+import contextlib   # For the virtual_time() context manager
+import os           # Locating 06_bgworker.py for the timeline check
+import random       # Customer arrivals in the shift simulation
+import runpy        # For running demo scripts
+import selectors    # The loop's I/O multiplexer (wrapped below)
+import subprocess   # Running a demo for real, to compare timelines
+import sys          # For command-line arguments
+import threading    # Threads we put on the virtual clock
+import time         # The functions we patch
+
+# Keep references to the REAL functions before anything is patched
+_real_sleep = time.sleep
+_real_time = time.time
+_real_monotonic = time.monotonic
+_real_perf_counter = time.perf_counter
+_real_thread_start = threading.Thread.start
+_real_thread_join = threading.Thread.join
+
+
+# =============================================================================
+# THE VIRTUAL CLOCK
+# =============================================================================
+
+class VirtualClock:
+    """
+    A clock that only moves forward when every participant is waiting.
+
+    Args:
+        grace (float): REAL seconds to wait before advancing anyway when a
+                       participant is blocked on something the clock cannot
+                       see (locks, queues, ...)
+
+    Attributes:
+        advances (int): How many times the clock jumped forward
+    """
+
+    def __init__(self, grace=0.05):
+        self.grace = grace
+        self.advances = 0
+        self._now = 0.0                 # Virtual seconds since creation
+        self._epoch = _real_time()      # So time.time() still looks sane
+        self._base = _real_monotonic()  # So monotonic() still looks sane
+        self._cond = threading.Condition()
+        self._sleepers = {}             # Sleeping thread → its wake-up time
+        self._participants = set()      # Threads the clock waits for
+        self._waiting = 0               # Participants asleep or joining
+        self._closed = False            # After virtual_time(): sleep for real
+
+    # ---- reading the clock --------------------------------------------------
+
+    def now(self):
+        """Virtual seconds elapsed since the clock was created."""
+        return self._now
+
+    def time(self):
+        return self._epoch + self._now
+
+    def monotonic(self):
+        return self._base + self._now
+
+    # ---- participants -------------------------------------------------------
+
+    def add_participant(self, thread):
+        with self._cond:
+            self._participants.add(thread)
+
+    def remove_participant(self, thread):
+        with self._cond:
+            self._participants.discard(thread)
+            self._maybe_advance()
+
+    # ---- moving time --------------------------------------------------------
+
+    def _advance(self):
+        """Jump to the earliest wake-up and wake everyone who is due."""
+        if not self._sleepers or self._closed:
+            return
+        self._now = max(self._now, min(self._sleepers.values()))
+        for thread, wake_at in list(self._sleepers.items()):
+            if wake_at <= self._now:
+                # Running again from THIS moment, not from when it gets the
+                # lock back: otherwise another thread going to sleep in
+                # between would see "everyone waiting" and advance again
+                del self._sleepers[thread]
+                self._waiting -= 1
+        self.advances += 1
+        self._cond.notify_all()
+
+    def _maybe_advance(self):
+        """Advance only when NOBODY is still running (caller holds the lock)."""
+        if self._waiting >= len(self._participants):
+            self._advance()
+
+    def close(self):
+        """Stops the clock: threads still sleeping finish their sleep for real."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def sleep(self, seconds):
+        """Replacement for time.sleep(): wait `seconds` of VIRTUAL time."""
+        if seconds <= 0:
+            _real_sleep(0)  # Still give other threads a chance to run
+            return
+        me = threading.current_thread()
+        with self._cond:
+            wake_at = self._now + seconds
+            self._sleepers[me] = wake_at
+            self._waiting += 1
+            try:
+                self._maybe_advance()
+                while me in self._sleepers and not self._closed:
+                    before = self._now
+                    if not self._cond.wait(self.grace) and self._now == before:
+                        # Somebody is blocked where we can't see it
+                        self._advance()
+            finally:
+                if self._sleepers.pop(me, None) is not None:
+                    self._waiting -= 1      # Not woken by _advance()
+            left = wake_at - self._now
+        if left > 0:                        # The clock was closed meanwhile
+            _real_sleep(left)
+
+    @contextlib.contextmanager
+    def waiting(self):
+        """Marks the current thread as idle while it blocks on something else."""
+        with self._cond:
+            self._waiting += 1
+            self._maybe_advance()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._waiting -= 1
+
+
+# =============================================================================
+# ASYNCIO ON THE VIRTUAL CLOCK
+# =============================================================================
+#
+# The event loop's heart is:
+#       timeout = (next timer) - loop.time()
+#       events  = selector.select(timeout)
+#
+# So we only need two changes:
+#   1. loop.time() reads the virtual clock
+#   2. select(timeout) polls for real I/O, then SLEEPS on the virtual clock
+
+class VirtualSelector:
+    """Wraps the default selector; idle waits happen on the virtual clock."""
+
+    def __init__(self, clock):
+        self._clock = clock
+        self._selector = selectors.DefaultSelector()
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)  # register(), close(), ...
+
+    def select(self, timeout=None):
+        events = self._selector.select(0)
+        if events or (timeout is not None and timeout <= 0):
+            return events
+        if timeout is None:
+            # Nothing scheduled: we are waiting for I/O or another thread
+            with self._clock.waiting():
+                return self._selector.select(None)
+        self._clock.sleep(timeout)
+        return self._selector.select(0)
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """An event loop whose time() and idle waits use a VirtualClock."""
+
+    def __init__(self, clock):
+        super().__init__(selector=VirtualSelector(clock))
+        self._virtual_clock = clock
+
+    def time(self):
+        return self._virtual_clock.monotonic()
+
+
+class VirtualTimeEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    """Makes asyncio.run() create VirtualTimeEventLoops."""
+
+    def __init__(self, clock):
+        super().__init__()
+        self._virtual_clock = clock
+
+    def new_event_loop(self):
+        return VirtualTimeEventLoop(self._virtual_clock)
+
+
+# =============================================================================
+# PUTTING IT ALL TOGETHER: virtual_time()
+# =============================================================================
+
+@contextlib.contextmanager
+def virtual_time(grace=0.05):
+    """
+    Runs the body with time.sleep, the time.* clocks, Thread.start/join and
+    asyncio's event loop all on ONE VirtualClock.
+
+    Usage:
+        with virtual_time() as clock:
+            time.sleep(3600)           # returns immediately
+            print(clock.now())         # 3600.0
+    """
+    clock = VirtualClock(grace)
+    me = threading.current_thread()
+    old_policy = asyncio.get_event_loop_policy()
+
+    def start(thread):
+        clock.add_participant(thread)
+        run = thread.run
+
+        def run_then_leave():
+            try:
+                run()
+            finally:
+                clock.remove_participant(thread)
+
+        thread.run = run_then_leave
+        try:
+            _real_thread_start(thread)
+        except BaseException:
+            clock.remove_participant(thread)
+            raise
+
+    def join(thread, timeout=None):
+        if timeout is not None:
+            return _real_thread_join(thread, timeout)
+        with clock.waiting():
+            _real_thread_join(thread)
+
+    clock.add_participant(me)
+    time.sleep = clock.sleep
+    time.time = clock.time
+    time.monotonic = clock.monotonic
+    time.perf_counter = clock.monotonic
+    threading.Thread.start = start
+    threading.Thread.join = join
+    asyncio.set_event_loop_policy(VirtualTimeEventLoopPolicy(clock))
+    try:
+        yield clock
+    finally:
+        time.sleep = _real_sleep
+        time.time = _real_time
+        time.monotonic = _real_monotonic
+        time.perf_counter = _real_perf_counter
+        threading.Thread.start = _real_thread_start
+        threading.Thread.join = _real_thread_join
+        asyncio.set_event_loop_policy(old_policy)
+        clock.close()                       # Leftover daemon threads: real time
+        clock.remove_participant(me)
+
+
+def run_demo(path, grace=0.05):
+    """
+    Runs a demo script under virtual time.
+
+    Returns:
+        tuple: (virtual seconds, real seconds)
+    """
+    real_start = _real_perf_counter()
+    with virtual_time(grace) as clock:
+        runpy.run_path(path, run_name="__main__")
+    return clock.now(), _real_perf_counter() - real_start
+
+
+# =============================================================================
+# CHECKING THE TIMELINE AGAINST REAL TIME
+# =============================================================================
+
+class _Timeline:
+    """A stdout stand-in that records (clock time, line) for every line."""
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, text):
+        now = time.monotonic()
+        self.lines.extend((now, line) for line in text.splitlines() if line.strip())
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def real_timeline(path):
+    """[(seconds, line)] of `path` run for real, timed from its first line."""
+    proc = subprocess.Popen([sys.executable, "-u", path], stdout=subprocess.PIPE,
+                            text=True, cwd=os.path.dirname(os.path.abspath(path)))
+    stamped = [(_real_perf_counter(), line.rstrip("\n"))
+               for line in proc.stdout if line.strip()]
+    proc.wait()
+    return [(round(t - stamped[0][0], 1), line) for t, line in stamped]
+
+
+def virtual_timeline(path):
+    """The same for `path` run under virtual time."""
+    out = _Timeline()
+    with virtual_time():
+        with contextlib.redirect_stdout(out):
+            runpy.run_path(path, run_name="__main__")
+            end = time.monotonic()
+            # A thread woken at the very end may print just after the demo
+            # returns; later lines (daemon threads carrying on) don't count
+            _real_sleep(0.1)
+    start = out.lines[0][0]
+    return [(round(t - start, 1), line) for t, line in out.lines if t <= end]
+
+
+# =============================================================================
+# EXAMPLES
+# =============================================================================
+
+def take_orders():
+    """Same as 01_threading.py: 3 orders, 2 seconds each."""
+    for i in range(1, 4):
+        print(f"   [{time.monotonic() - T0:5.1f}s] 📝 Taking order for #{i}")
+        time.sleep(2)
+
+
+def brew_chai():
+    """Same as 01_threading.py: 3 chai, 3 seconds each."""
+    for i in range(1, 4):
+        print(f"   [{time.monotonic() - T0:5.1f}s] ☕ Brewing chai for #{i}")
+        time.sleep(3)
+
+
+async def chai_shop_shift(hours, brewers, seed=7):
+    """
+    Simulates a whole shift with asyncio: customers arrive about every 30
+    seconds, each chai takes 2-4 minutes to brew.
+
+    Returns:
+        tuple: (orders served, average wait in seconds, longest queue)
+    """
+    # Separate generators: arrivals must not depend on how many brewers
+    # drew brew times in between, so every row sees the SAME customers
+    arrivals = random.Random(seed)
+    brew_times = random.Random(seed + 1)
+    orders = asyncio.Queue()
+    waits = []
+    longest_queue = 0
+    closing_time = asyncio.get_running_loop().time() + hours * 3600
+
+    async def customers():
+        nonlocal longest_queue
+        loop = asyncio.get_running_loop()
+        while loop.time() < closing_time:
+            await asyncio.sleep(arrivals.expovariate(1 / 30))
+            await orders.put(loop.time())
+            longest_queue = max(longest_queue, orders.qsize())
+
+    async def brewer():
+        loop = asyncio.get_running_loop()
+        while True:
+            ordered_at = await orders.get()
+            waits.append(loop.time() - ordered_at)
+            await asyncio.sleep(brew_times.uniform(120, 240))
+            orders.task_done()
+
+    staff = [asyncio.create_task(brewer()) for _ in range(brewers)]
+    await customers()
+    await orders.join()
+    for task in staff:
+        task.cancel()
+    return len(waits), sum(waits) / len(waits), longest_queue
+
+
+if __name__ == "__main__":
+
+    if len(sys.argv) > 1:
+        # ---------------------------------------------------------------------
+        # Run the given demo scripts under virtual time
+        # ---------------------------------------------------------------------
+        for path in sys.argv[1:]:
+            print(f"\n▶ {path} (virtual time)\n")
+            virtual, real = run_demo(path)
+            print(f"\n⏩ {path}: {virtual:.2f} virtual s in {real * 1000:.1f} real ms")
+        sys.exit(0)
+
+    print("=" * 60)
+    print("⏩ VIRTUAL TIME: sleep-driven demos without the waiting")
+    print("=" * 60)
+
+    # -------------------------------------------------------------------------
+    # 1) THREADS: the chai shop from 01_threading.py
+    # -------------------------------------------------------------------------
+    print("\n1️⃣  Threads (01_threading.py)\n")
+    real_start = _real_perf_counter()
+    with virtual_time() as clock:
+        T0 = time.monotonic()
+        order_thread = threading.Thread(target=take_orders)
+        brew_thread = threading.Thread(target=brew_chai)
+        order_thread.start()
+        brew_thread.start()
+        order_thread.join()
+        brew_thread.join()
+    print(f"\n   ⏱️  {clock.now():.1f} virtual seconds "
+          f"in {(_real_perf_counter() - real_start) * 1000:.1f} real ms")
+
+    # -------------------------------------------------------------------------
+    # 2) ASYNCIO: three brews gathered
+    # -------------------------------------------------------------------------
+    print("\n2️⃣  Asyncio gather\n")
+
+    async def brew(name, seconds):
+        await asyncio.sleep(seconds)
+        print(f"   [{time.monotonic() - T0:5.1f}s] ✅ {name} ready")
+
+    async def brew_all():
+        await asyncio.gather(brew("Masala", 2), brew("Ginger", 3), brew("Tulsi", 1))
+
+    real_start = _real_perf_counter()
+    with virtual_time() as clock:
+        T0 = time.monotonic()
+        asyncio.run(brew_all())
+    print(f"\n   ⏱️  {clock.now():.1f} virtual seconds "
+          f"in {(_real_perf_counter() - real_start) * 1000:.1f} real ms")
+
+    # -------------------------------------------------------------------------
+    # 3) HOURS OF TRAFFIC: an 8-hour shift with 4, 6 and 8 brewers
+    # -------------------------------------------------------------------------
+    print("\n3️⃣  An 8-hour shift (a customer every ~30s, 2-4 min per chai)\n")
+    print(f"   {'Brewers':>7} {'Served':>7} {'Avg wait':>10} {'Max queue':>10} {'Real time':>10}")
+    for brewers in (4, 6, 8):
+        real_start = _real_perf_counter()
+        with virtual_time():
+            served, avg_wait, max_queue = asyncio.run(chai_shop_shift(8, brewers))
+        real_ms = (_real_perf_counter() - real_start) * 1000
+        print(f"   {brewers:>7} {served:>7} {avg_wait / 60:>7.1f}min "
+              f"{max_queue:>10} {real_ms:>8.0f}ms")
+
+    # -------------------------------------------------------------------------
+    # 4) DOES VIRTUAL TIME REPRODUCE THE REAL TIMELINE?
+    # -------------------------------------------------------------------------
+    # 06_bgworker.py mixes a sleeping thread with asyncio.sleep(): run it for
+    # real and virtually, and compare every line with the time it appeared.
+    # (Lines due at the same instant may print in either order: sort them.)
+    demo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "06_bgworker.py")
+    print("\n4️⃣  06_bgworker.py: real vs virtual timeline (3 real seconds)\n")
+    real = real_timeline(demo)
+    virtual = virtual_timeline(demo)
+    for t, line in virtual:
+        if t > 0:
+            print(f"   [{t:4.1f}s] {line}")
+    same = sorted(real) == sorted(virtual)
+    print(f"\n   {'✅ Same lines at the same times' if same else '❌ Timelines differ'} "
+          f"({len(real)} lines real, {len(virtual)} virtual)")
+
+
+# =============================================================================
+# EXPECTED OUTPUT (abridged)
+# =============================================================================
+#
+# 1️⃣  Threads (01_threading.py)
+#
+#    [  0.0s] 📝 Taking order for #1
+#    [  0.0s] ☕ Brewing chai for #1
+#    [  2.0s] 📝 Taking order for #2
+#    [  3.0s] ☕ Brewing chai for #2
+#    [  4.0s] 📝 Taking order for #3
+#    [  6.0s] ☕ Brewing chai for #3
+#
+#    ⏱️  9.0 virtual seconds in ~1 real ms
+#
+# 3️⃣  An 8-hour shift (a customer every ~30s, 2-4 min per chai)
+#
+#    Brewers  Served   Avg wait  Max queue  Real time
+#          4     986   134.1min        350       40ms
+#          6     986    10.0min         36       31ms
+#          8     986     0.4min         11       34ms
+#
+#    Each row simulates 8 HOURS in well under a second, with the same
+#    customers. 4 brewers make ~80 chai/hour for ~120 customers/hour: the
+#    queue explodes. 6 brewers make exactly 120/hour - no slack, so every
+#    unlucky streak leaves a queue behind (10 min average wait). Only 8
+#    brewers keep up.
+#
+# 4️⃣  06_bgworker.py: real vs virtual timeline (3 real seconds)
+#
+#    [ 1.0s] 📊 Logging the system health... 🕰️
+#    [ 2.0s] 📊 Logging the system health... 🕰️
+#    [ 3.0s] 📊 Logging the system health... 🕰️
+#    [ 3.0s] 🎁 Order fetched successfully!
+#    [ 3.0s] ✅ Main program complete (daemon thread auto-terminated)
+#
+#    ✅ Same lines at the same times (11 lines real, 11 virtual)
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. Sleeps only define WHEN things happen and in WHAT ORDER - real waiting
+#    is optional
+# 2. A virtual clock advances when every participant is idle, jumping to
+#    the earliest wake-up → same ordering, no waiting
+# 3. asyncio makes this easy: the event loop asks loop.time() for the time
+#    and select() for the wait - override both and you control time
+# 4. Perfect for CI and for "what if" simulations (how many brewers do we
+#    need for a Saturday rush?)
+#
+# =============================================================================
@@ -0,0 +1,351 @@
+"""
+=============================================================================
+SEEING CONCURRENCY: CHROME-TRACE TIMELINES FOR THREADS, TASKS & PROCESSES
+=============================================================================
+
+The Problem:
+------------
+All our demos describe interleaving with ASCII art:
+
+    Thread 1: ████░░░░████░░░░████
+    Thread 2: ░░░░████░░░░████░░░░
+
+but we never get to SEE the real timeline of order_thread/brew_thread
+(01_threading.py), the coroutines passed to gather() (02_async_two.py) or
+the Process workers (02_multiprocessing.py). Where do they overlap? Where
+does everything wait on one slow step? Where are the idle gaps?
+
+The Solution: A TINY TRACER + THE CHROME TRACE FORMAT
+-----------------------------------------------------
+We record a SPAN (name, start, duration) every time a piece of work runs,
+tagged with WHO ran it:
+
+    pid  → the process
+    tid  → the thread, or the asyncio task
+
+and write the spans as "Trace Event" JSON, the format used by Chrome's
+chrome://tracing and by Perfetto (https://ui.perfetto.dev):
+
+    {"name": "brew_chai", "ph": "X", "ts": 1200, "dur": 3000000,
+     "pid": 4242, "tid": 17}
+
+Open the file in Perfetto and you get one lane per thread/task/process:
+
+    Process 4242 (main)
+      ├─ order_thread   [take order][take order][take order]
+      ├─ brew_thread    [  brew  ][  brew  ][  brew  ]
+      ├─ task: Masala   [ brewing ]
+      └─ task: Ginger   [   brewing   ]
+    Process 4243        [  brew_chai  ]
+    Process 4244        [  brew_chai  ]
+
+Across Processes:
+-----------------
+Every process records into its OWN buffer and writes a partial trace file
+into a shared directory when it finishes. The parent then MERGES all
+partial files into one trace. Timestamps come from the wall clock
+(time.time_ns) so the lanes of different processes line up.
+
+This Script Demonstrates:
+-------------------------
+  - Tracer.span() / @traced for threads and asyncio tasks
+  - TracedProcess: a Process that traces itself and writes a partial file
+  - merge_traces(): combine everything into one Perfetto-ready JSON
+  - summarize(): busy time per lane, to spot serialization and idle gaps
+
+=============================================================================
+"""
+
+import asyncio          # Coroutines and tasks to trace
+import contextlib       # For the span() context manager
+import functools        # For the @traced decorator
+import glob             # To find the partial trace files
+import json             # Trace Event format is JSON
+import os               # For getpid() and file paths
+import sys              # For the output path argument
+import tempfile         # Directory for per-process partial traces
+import threading        # Threads to trace
+import time             # Timestamps and simulated work
+from multiprocessing import Process
+
+
+# =============================================================================
+# THE TRACER
+# =============================================================================
+
+class Tracer:
+    """
+    Collects Chrome Trace "complete" events (ph="X") for ONE process.
+
+    list.append() is atomic in CPython, so threads can record spans
+    without any extra locking.
+    """
+
+    def __init__(self, process_name=None):
+        self.pid = os.getpid()
+        self.process_name = process_name or f"process {self.pid}"
+        self.events = []
+        self._lanes = {}       # tid → lane name (thread or task)
+        self._task_ids = {}    # asyncio task → synthetic tid
+
+    @staticmethod
+    def now_us():
+        """Microseconds on the wall clock (comparable across processes)."""
+        return time.time_ns() // 1000
+
+    def _current_lane(self):
+        """Returns (tid, lane name) for the running thread or asyncio task."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:  # No running event loop in this thread
+            task = None
+        if task is not None:
+            if task not in self._task_ids:
+                self._task_ids[task] = 1_000_000 + len(self._task_ids)
+            return self._task_ids[task], f"task: {task.get_name()}"
+        thread = threading.current_thread()
+        return threading.get_native_id(), f"thread: {thread.name}"
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        """Records the time spent inside the `with` block as one span."""
+        tid, lane = self._current_lane()
+        self._lanes[tid] = lane
+        start = self.now_us()
+        try:
+            yield
+        finally:
+            self.events.append({
+                "name": name, "ph": "X", "ts": start,
+                "dur": self.now_us() - start,
+                "pid": self.pid, "tid": tid, "args": args,
+            })
+
+    def trace_events(self):
+        """The recorded spans plus metadata events naming the lanes."""
+        meta = [{"name": "process_name", "ph": "M", "pid": self.pid,
+                 "args": {"name": self.process_name}}]
+        meta += [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+                  "args": {"name": lane}}
+                 for tid, lane in self._lanes.items()]
+        return meta + self.events
+
+    def dump(self, path):
+        """Writes this process's events (a partial trace) to `path`."""
+        with open(path, "w") as f:
+            json.dump(self.trace_events(), f)
+
+
+# One tracer per process, created lazily
+_tracer = None
+
+
+def get_tracer(process_name=None):
+    global _tracer
+    if _tracer is None or _tracer.pid != os.getpid():
+        _tracer = Tracer(process_name)  # Fresh buffer after fork()
+    return _tracer
+
+
+def traced(func):
+    """Module-level @traced: uses the CURRENT process's tracer at call time."""
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with get_tracer().span(func.__name__):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with get_tracer().span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# =============================================================================
+# PROCESSES: TRACE LOCALLY, DUMP A PARTIAL FILE, MERGE LATER
+# =============================================================================
+
+class TracedProcess(Process):
+    """
+    A multiprocessing.Process that traces its own run() and writes
+    `<trace_dir>/trace-<pid>.json` when it finishes.
+    """
+
+    def __init__(self, trace_dir, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.trace_dir = trace_dir
+
+    def run(self):
+        tracer = get_tracer(process_name=self.name)
+        try:
+            with tracer.span("run", target=getattr(self._target, "__name__", "")):
+                super().run()
+        finally:
+            tracer.dump(os.path.join(self.trace_dir, f"trace-{os.getpid()}.json"))
+
+
+def merge_traces(trace_dir, output_path, main_tracer=None):
+    """
+    Merges every partial trace in `trace_dir` (plus the main process's own
+    events) into ONE Chrome Trace Event file.
+
+    Returns:
+        list: All merged events
+    """
+    events = list(main_tracer.trace_events()) if main_tracer else []
+    for path in sorted(glob.glob(os.path.join(trace_dir, "trace-*.json"))):
+        with open(path) as f:
+            events.extend(json.load(f))
+    with open(output_path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return events
+
+
+def summarize(events):
+    """
+    Prints how busy each lane was over the whole trace window.
+
+    A lane that is busy ~100% while the others idle is the one that
+    SERIALIZES the work; long idle stretches are gaps to look at in the UI.
+    """
+    spans = [e for e in events if e["ph"] == "X"]
+    names = {(e["pid"], e.get("tid")): e["args"]["name"]
+             for e in events if e["ph"] == "M" and e["name"] == "thread_name"}
+    procs = {e["pid"]: e["args"]["name"]
+             for e in events if e["ph"] == "M" and e["name"] == "process_name"}
+    begin = min(e["ts"] for e in spans)
+    window = max(e["ts"] + e["dur"] for e in spans) - begin
+
+    lanes = {}
+    for e in spans:
+        lanes.setdefault((e["pid"], e["tid"]), []).append((e["ts"], e["ts"] + e["dur"]))
+
+    print(f"{'Lane':<40} {'Spans':>6} {'Busy':>7}")
+    print("-" * 55)
+    for key, intervals in sorted(lanes.items()):
+        # Merge overlapping intervals (nested spans) before adding them up
+        intervals.sort()
+        busy, cur_start, cur_end = 0, *intervals[0]
+        for s, e in intervals[1:]:
+            if s > cur_end:
+                busy += cur_end - cur_start
+                cur_start, cur_end = s, e
+            else:
+                cur_end = max(cur_end, e)
+        busy += cur_end - cur_start
+        lane = f"{procs.get(key[0], key[0])} / {names.get(key, key[1])}"
+        print(f"{lane[:40]:<40} {len(intervals):>6} {busy / window:>6.0%}")
+    print(f"\nTrace window: {window / 1e6:.2f}s")
+
+
+# =============================================================================
+# THE WORKLOADS FROM EARLIER LESSONS (scaled down, now traced)
+# =============================================================================
+
+@traced
+def take_order(i):
+    """01_threading.py: taking one order."""
+    time.sleep(0.2)
+
+
+@traced
+def brew_one(i):
+    """01_threading.py: brewing one chai."""
+    time.sleep(0.3)
+
+
+def take_orders():
+    for i in range(1, 4):
+        take_order(i)
+
+
+def brew_chai_loop():
+    for i in range(1, 4):
+        brew_one(i)
+
+
+@traced
+async def brew_async(name, seconds):
+    """02_async_two.py: a coroutine brewing chai."""
+    await asyncio.sleep(seconds)
+
+
+async def gather_brews():
+    await asyncio.gather(
+        asyncio.create_task(brew_async("Masala", 0.2), name="Masala"),
+        asyncio.create_task(brew_async("Ginger", 0.3), name="Ginger"),
+    )
+
+
+@traced
+def brew_chai(name):
+    """02_multiprocessing.py: a chai maker in its own process."""
+    time.sleep(0.3)
+
+
+if __name__ == "__main__":
+
+    output = sys.argv[1] if len(sys.argv) > 1 else "chai_trace.json"
+    tracer = get_tracer(process_name="main")
+
+    print("=" * 60)
+    print("🔍 TRACING THREADS, TASKS AND PROCESSES")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as trace_dir:
+        # 1) Threads (01_threading.py)
+        order_thread = threading.Thread(target=take_orders, name="order_thread")
+        brew_thread = threading.Thread(target=brew_chai_loop, name="brew_thread")
+        order_thread.start()
+        brew_thread.start()
+        order_thread.join()
+        brew_thread.join()
+
+        # 2) Asyncio tasks (02_async_two.py)
+        asyncio.run(gather_brews())
+
+        # 3) Processes (02_multiprocessing.py)
+        makers = [TracedProcess(trace_dir, target=brew_chai,
+                                args=(f"Chai Maker #{i + 1}",),
+                                name=f"Chai Maker #{i + 1}")
+                  for i in range(3)]
+        for p in makers:
+            p.start()
+        for p in makers:
+            p.join()
+
+        events = merge_traces(trace_dir, output, main_tracer=tracer)
+
+    summarize(events)
+    print(f"\n📄 Wrote {len(events)} events to {output}")
+    print("   Open it at https://ui.perfetto.dev (or chrome://tracing)")
+
+
+# =============================================================================
+# WHAT TO LOOK FOR IN PERFETTO
+# =============================================================================
+#
+#  - OVERLAP: order_thread and brew_thread spans run side by side → the
+#    threads really are concurrent during sleep/I-O
+#  - SERIALIZATION: if spans on different lanes never overlap, something
+#    (the GIL, a lock, a single queue consumer) is forcing them in line
+#  - IDLE GAPS: empty stretches in a lane are time a worker spent waiting
+#    for input - a sign of an upstream bottleneck
+#  - STARTUP COST: the gap between the end of the asyncio section and the
+#    first span in each child process is process start-up time
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. A span = (name, start, duration, who). That's all a timeline needs.
+# 2. tid can be a thread OR an asyncio task - both are "lanes" of work
+# 3. Each process traces into its own buffer; merge files at the end
+# 4. The Chrome Trace Event format opens directly in Perfetto
+# 5. Busy % per lane quickly shows serialization and idle gaps
+#
+# =============================================================================
@@ -0,0 +1,355 @@
+"""
+=============================================================================
+ADAPTIVE EXECUTOR: LET THE CODE PICK THREAD, PROCESS OR EVENT LOOP
+=============================================================================
+
+The Problem:
+------------
+The lessons teach a rule of thumb and leave the choice to the reader:
+
+    I/O-bound  (time.sleep, network)  → threads      (05_thread_one.py)
+    CPU-bound  (counting, hashing)    → processes    (10_process_two.py)
+    async def  (await ...)            → event loop   (01_async_one.py)
+
+In a real service you call hundreds of functions and nobody knows (or
+remembers) which kind each one is. Pick wrong and you either block the
+event loop, fight the GIL, or pay process overhead for nothing.
+
+The Solution: MEASURE, THEN ROUTE
+---------------------------------
+A function's nature shows in ONE number: how much of its wall time is
+spent actually using the CPU.
+
+    cpu_ratio = CPU time / wall time      (time.thread_time vs perf_counter)
+
+    check_stock():  [sleep.............]   cpu_ratio ≈ 0.00 → I/O-bound
+    cpu_heavy():    [██████████████████]   cpu_ratio ≈ 1.00 → CPU-bound
+
+The AdaptiveExecutor runs the first few calls of every callable in a
+thread pool while measuring them, then routes every later call:
+
+    ┌──────────────────┐   first N calls    ┌─────────────────────────┐
+    │ await ex.run(fn) │ ─────────────────► │ thread pool + MEASURE   │
+    └──────────────────┘                    └─────────────────────────┘
+             │  after N samples
+             ├── async def ──────────────────► event loop (await it)
+             ├── cpu_ratio <  threshold ─────► thread pool
+             ├── CPU-bound but very short ───► thread pool (IPC costs more)
+             └── cpu_ratio >= threshold ─────► process pool
+
+Every decision is recorded with its evidence, so you can AUDIT why a
+function ended up where it did.
+
+This Script Demonstrates:
+-------------------------
+  - AdaptiveExecutor.run(): one awaitable entry point for any callable
+  - Per-callable learning from the first `sample_runs` calls (measured
+    one at a time, even when the first calls arrive concurrently)
+  - decisions() / audit(): the routing table with its evidence
+
+=============================================================================
+"""
+
+import asyncio     # The event loop we route to and from
+import functools   # Unwrapping partial() to the function it calls
+import os          # For cpu_count()
+import pickle      # To check a callable can be sent to a process
+import time        # CPU time vs wall time
+import weakref     # Learned tables that don't keep callables alive
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# =============================================================================
+# MEASURING A CALL
+# =============================================================================
+
+def _measured_call(fn, args, kwargs):
+    """Runs fn in the CURRENT thread, returning (result, cpu_s, wall_s)."""
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    result = fn(*args, **kwargs)
+    return result, time.thread_time() - cpu_start, time.perf_counter() - wall_start
+
+
+def _call(fn, args, kwargs):
+    """Top-level (picklable) trampoline for the process pool."""
+    return fn(*args, **kwargs)
+
+
+def _key(fn):
+    """
+    What a decision is learned FOR: the function object itself. Names are
+    not enough - every lambda is "<lambda>", every closure from one factory
+    shares a qualname. partial() and bound methods are unwrapped, so each
+    new partial(f, x) or obj.method reuses what was learned about f.
+    """
+    while isinstance(fn, functools.partial):
+        fn = fn.func
+    return getattr(fn, "__func__", fn)
+
+
+def _name(fn):
+    """For display only."""
+    return f"{getattr(fn, '__module__', '?')}.{getattr(fn, '__qualname__', repr(fn))}"
+
+
+class _ByCallable:
+    """
+    A dict keyed by callables that doesn't keep them alive: the entries for
+    a lambda or closure go away with it, so a long-running service doesn't
+    grow forever. (Builtins can't be weakly referenced; they live forever
+    anyway, so they are kept in a plain dict.)
+    """
+
+    def __init__(self):
+        self._weak = weakref.WeakKeyDictionary()
+        self._strong = {}
+
+    def _table(self, key):
+        try:
+            weakref.ref(key)
+        except TypeError:
+            return self._strong
+        return self._weak
+
+    def get(self, key, default=None):
+        return self._table(key).get(key, default)
+
+    def setdefault(self, key, default):
+        return self._table(key).setdefault(key, default)
+
+    def __setitem__(self, key, value):
+        self._table(key)[key] = value
+
+    def __getitem__(self, key):
+        return self._table(key)[key]
+
+    def __contains__(self, key):
+        return key in self._table(key)
+
+    def items(self):
+        return [*self._strong.items(), *self._weak.items()]
+
+
+# =============================================================================
+# THE ADAPTIVE EXECUTOR
+# =============================================================================
+
+class AdaptiveExecutor:
+    """
+    Routes each callable to a thread pool, a process pool or the event loop
+    based on measurements of its first calls.
+
+    Args:
+        sample_runs (int): Calls to measure before deciding
+        cpu_threshold (float): cpu_ratio at or above which a callable counts
+                               as CPU-bound
+        min_process_seconds (float): CPU-bound calls shorter than this stay
+                                     on threads (pickling + IPC would cost
+                                     more than the parallelism gains)
+        thread_workers / process_workers (int): Pool sizes
+
+    Usage:
+        async with AdaptiveExecutor() as ex:
+            stock = await ex.run(check_stock, "Masala chai")
+            total = await ex.run(cpu_heavy, 5_000_000)
+            ex.audit()
+    """
+
+    def __init__(self, sample_runs=3, cpu_threshold=0.7, min_process_seconds=0.005,
+                 thread_workers=None, process_workers=None):
+        self.sample_runs = sample_runs
+        self.cpu_threshold = cpu_threshold
+        self.min_process_seconds = min_process_seconds
+        self._threads = ThreadPoolExecutor(max_workers=thread_workers)
+        self._processes = ProcessPoolExecutor(max_workers=process_workers or os.cpu_count())
+        self._samples = _ByCallable()     # callable → [(cpu_s, wall_s), ...]
+        self._decisions = _ByCallable()   # callable → decision dict
+        self._calls = _ByCallable()       # callable → {route: count}
+        self._sampling = _ByCallable()    # callable → asyncio.Lock: one sample at a time
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.shutdown()
+
+    def shutdown(self):
+        self._threads.shutdown()
+        self._processes.shutdown()
+
+    # ---- routing ------------------------------------------------------------
+
+    def _count(self, key, route):
+        routes = self._calls.setdefault(key, {})
+        routes[route] = routes.get(route, 0) + 1
+
+    def _decide(self, fn, key):
+        samples = self._samples[key]
+        cpu = sum(c for c, _ in samples)
+        wall = sum(w for _, w in samples) or 1e-9
+        ratio = cpu / wall
+        avg_wall = wall / len(samples)
+
+        if ratio < self.cpu_threshold:
+            route, reason = "thread", "I/O-bound: mostly waiting"
+        elif avg_wall < self.min_process_seconds:
+            route, reason = "thread", "CPU-bound but too short for a process"
+        else:
+            try:
+                pickle.dumps(fn)
+            except Exception:
+                route, reason = "thread", "CPU-bound but not picklable"
+            else:
+                route, reason = "process", "CPU-bound: needs its own GIL"
+
+        self._decisions[key] = {
+            "callable": _name(key), "route": route, "reason": reason,
+            "samples": len(samples), "cpu_ratio": round(ratio, 3),
+            "avg_wall_s": round(avg_wall, 6),
+        }
+
+    async def run(self, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) on the best backend and returns its result."""
+        key = _key(fn)
+        loop = asyncio.get_running_loop()
+
+        # Coroutine functions always belong on the event loop
+        if asyncio.iscoroutinefunction(fn):
+            if key not in self._decisions:
+                self._decisions[key] = {
+                    "callable": _name(key), "route": "event loop",
+                    "reason": "async def: awaits instead of blocking",
+                    "samples": 0, "cpu_ratio": None, "avg_wall_s": None,
+                }
+            self._count(key, "event loop")
+            return await fn(*args, **kwargs)
+
+        decision = self._decisions.get(key)
+        if decision is None:
+            # Still learning: run on a thread and measure - ONE call at a
+            # time, or concurrent samples share the CPU, inflate each
+            # other's wall time and make CPU-bound work look like waiting
+            async with self._sampling.setdefault(key, asyncio.Lock()):
+                decision = self._decisions.get(key)
+                if decision is None:
+                    self._count(key, "thread (sampling)")
+                    result, cpu, wall = await loop.run_in_executor(
+                        self._threads, _measured_call, fn, args, kwargs)
+                    samples = self._samples.setdefault(key, [])
+                    samples.append((cpu, wall))
+                    if len(samples) >= self.sample_runs:
+                        self._decide(fn, key)
+                    return result
+
+        self._count(key, decision["route"])
+        pool = self._processes if decision["route"] == "process" else self._threads
+        return await loop.run_in_executor(pool, _call, fn, args, kwargs)
+
+    # ---- auditing -----------------------------------------------------------
+
+    def decisions(self):
+        """Returns the routing table: one dict per callable, with evidence."""
+        return [dict(d, calls=self._calls.get(key, {}))
+                for key, d in self._decisions.items()]
+
+    def audit(self):
+        """Prints the routing table."""
+        print(f"{'Callable':<24} {'Route':<11} {'CPU ratio':>9} "
+              f"{'Avg wall':>10}  Reason")
+        print("-" * 90)
+        for d in self.decisions():
+            ratio = "-" if d["cpu_ratio"] is None else f"{d['cpu_ratio']:.2f}"
+            wall = "-" if d["avg_wall_s"] is None else f"{d['avg_wall_s'] * 1000:.1f}ms"
+            short = d["callable"].rsplit(".", 1)[-1]
+            print(f"{short:<24} {d['route']:<11} {ratio:>9} {wall:>10}  {d['reason']}")
+
+
+# =============================================================================
+# THE WORKLOADS FROM EARLIER LESSONS
+# =============================================================================
+
+def check_stock(item):
+    """04_thread_async.py: blocking I/O (scaled down from 3s)."""
+    time.sleep(0.05)
+    return f"✅ {item} stock: 42 units available"
+
+
+def encrypt(data):
+    """05_process_async.py: CPU work, but tiny."""
+    return f"🔒 {data[::-1]}"
+
+
+def cpu_heavy(n):
+    """10_process_two.py: real CPU work."""
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+async def fetch_orders():
+    """06_bgworker.py: a coroutine (scaled down from 3s)."""
+    await asyncio.sleep(0.05)
+    return "🎁 Order fetched"
+
+
+async def main():
+    print("=" * 70)
+    print("🧭 ADAPTIVE EXECUTOR: learning where each function belongs")
+    print("=" * 70)
+
+    async with AdaptiveExecutor(sample_runs=3) as ex:
+        calls = [
+            (check_stock, ("Masala chai",)),
+            (encrypt, ("credit_card_1234",)),
+            (cpu_heavy, (2_000_000,)),
+            (fetch_orders, ()),
+        ]
+
+        # Learning phase: a few calls of each function
+        for _ in range(3):
+            for fn, args in calls:
+                await ex.run(fn, *args)
+
+        # From now on every call is routed; run a concurrent batch
+        start = time.perf_counter()
+        results = await asyncio.gather(*(ex.run(fn, *args)
+                                         for fn, args in calls for _ in range(4)))
+        elapsed = time.perf_counter() - start
+
+        print(f"\n⚡ 16 routed calls finished in {elapsed:.2f}s "
+              f"({len(results)} results)\n")
+        ex.audit()
+        print("\n📋 Call counts per route:")
+        for d in ex.decisions():
+            print(f"   {d['callable'].rsplit('.', 1)[-1]:<14} {d['calls']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+# =============================================================================
+# EXPECTED OUTPUT (abridged)
+# =============================================================================
+#
+# Callable                 Route       CPU ratio   Avg wall  Reason
+# ------------------------------------------------------------------------
+# fetch_orders             event loop          -          -  async def: awaits ...
+# check_stock              thread           0.00     50.2ms  I/O-bound: mostly waiting
+# encrypt                  thread           0.76      0.0ms  CPU-bound but too short ...
+# cpu_heavy                process          0.99     85.7ms  CPU-bound: needs its own GIL
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. CPU time / wall time classifies a function: ~0 waits, ~1 computes
+# 2. Measure a few calls, then route: the cost of learning is tiny
+# 3. Tiny CPU tasks stay on threads - process IPC would cost more
+# 4. Coroutines go straight to the event loop; never block it
+# 5. Keep the evidence: an auditable routing table beats a magic choice
+#
+# =============================================================================
@@ -0,0 +1,446 @@
+"""
+=============================================================================
+ADAPTIVE CONCURRENCY (AIMD): HOW MANY REQUESTS SHOULD BE IN FLIGHT?
+=============================================================================
+
+The Problem:
+------------
+Our fetch demos pick concurrency blindly:
+
+    07_thread_download.py   one thread per URL        → UNLIMITED
+    03_async_three.py       asyncio.gather(*all)      → UNLIMITED
+
+With 3 URLs that's fine. With 3,000 URLs against one server, "unlimited"
+means the server's queue overflows: latency explodes and it starts
+answering 503 (overloaded). A FIXED limit isn't better - too low wastes
+capacity, too high overloads it, and the right number changes whenever
+the server (or its other clients) change.
+
+    Throughput
+        │           ┌──────────────  ← more concurrency doesn't help...
+        │          /│
+        │         / │                 ...it only adds latency and errors
+        │        /  │
+        │       /   │
+        └──────┴────┴──────────────► Concurrency
+                  KNEE ← we want to sit right here
+
+The Solution: AIMD (Additive Increase, Multiplicative Decrease)
+---------------------------------------------------------------
+The same rule that lets TCP share the internet fairly:
+
+    every fast, successful response  → limit += 1 / limit   (≈ +1 per round)
+    a slow response or an error      → limit *= 0.5         (back off hard)
+
+    limit
+      │    /|    /|    /|
+      │   / |   / |   / |      ← the classic AIMD "sawtooth" around the knee
+      │  /  |  /  |  /  |
+      │ /   |_/   |_/   |_
+      └────────────────────────► time
+
+This Script Demonstrates:
+-------------------------
+  - AIMDLimiter (threads: `with limiter:`) and AsyncAIMDLimiter (asyncio:
+    `async with limiter:`) sharing ONE policy
+  - Plugging them into the threaded download() path (07_thread_download.py)
+    and the async fetch_url() path (03_async_three.py)
+  - A benchmark against a LOCAL server with a fixed capacity that
+    saturates, comparing unlimited, fixed and adaptive concurrency
+
+Only the standard library is used (urllib and asyncio streams) so the
+benchmark runs anywhere; the limiter works the same around requests.get()
+or aiohttp's session.get().
+
+=============================================================================
+"""
+
+import asyncio          # Async fetch path
+import threading        # Threaded fetch path and the local server
+import time             # Latency measurement and simulated service time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# =============================================================================
+# THE AIMD POLICY (shared by both limiters)
+# =============================================================================
+
+class _AIMDPolicy:
+    """
+    Decides the concurrency limit from observed latencies and errors.
+
+    Args:
+        target_latency (float): Responses slower than this count as "overload"
+        initial / min_limit / max_limit (int): Bounds for the limit
+        backoff (float): Multiplier applied on overload (e.g. 0.5)
+    """
+
+    def __init__(self, target_latency, initial=1, min_limit=1, max_limit=1000,
+                 backoff=0.5):
+        self.target_latency = target_latency
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.in_flight = 0
+        self.history = []           # (timestamp, limit) after every change
+        self._last_cut = 0.0
+
+    def _allowed(self):
+        return self.in_flight < int(self.limit)
+
+    def _record(self, latency, ok):
+        """Applies AIMD to one completed request."""
+        now = time.perf_counter()
+        if ok and latency <= self.target_latency:
+            # Additive increase: +1 per "round" of `limit` responses
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        elif now - self._last_cut > self.target_latency:
+            # Multiplicative decrease, at most once per latency window so
+            # one burst of slow responses doesn't collapse the limit to 1
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            self._last_cut = now
+        self.history.append((now, self.limit))
+
+
+class AIMDLimiter(_AIMDPolicy):
+    """
+    Thread-safe adaptive limiter.
+
+    Usage:
+        limiter = AIMDLimiter(target_latency=0.1)
+        with limiter:                 # waits for a free slot
+            resp = requests.get(url)
+        # latency is measured for you; call limiter.failed() inside the
+        # block to report an error response
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cond = threading.Condition()
+        self._local = threading.local()
+
+    def failed(self):
+        """Marks the request in the current `with` block as failed."""
+        self._local.ok = False
+
+    def __enter__(self):
+        with self._cond:
+            self._cond.wait_for(self._allowed)
+            self.in_flight += 1
+        self._local.ok = True
+        self._local.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        latency = time.perf_counter() - self._local.start
+        ok = exc_type is None and self._local.ok
+        with self._cond:
+            self.in_flight -= 1
+            self._record(latency, ok)
+            self._cond.notify_all()
+        return False
+
+
+class AsyncAIMDLimiter(_AIMDPolicy):
+    """
+    Adaptive limiter for coroutines (use from ONE event loop).
+
+    Every request gets its own slot, which measures its latency and can be
+    marked as failed:
+
+    Usage:
+        limiter = AsyncAIMDLimiter(target_latency=0.1)
+        async with limiter.slot() as slot:
+            async with session.get(url) as response:
+                if response.status >= 500:
+                    slot.failed()
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cond = asyncio.Condition()
+
+    def slot(self):
+        return _AsyncSlot(self)
+
+
+class _AsyncSlot:
+    """One in-flight request of an AsyncAIMDLimiter."""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.start = 0.0
+        self.ok = True
+
+    def failed(self):
+        self.ok = False
+
+    async def __aenter__(self):
+        cond = self.limiter._cond
+        async with cond:
+            await cond.wait_for(self.limiter._allowed)
+            self.limiter.in_flight += 1
+        self.start = time.perf_counter()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        latency = time.perf_counter() - self.start
+        cond = self.limiter._cond
+        async with cond:
+            self.limiter.in_flight -= 1
+            self.limiter._record(latency, exc_type is None and self.ok)
+            cond.notify_all()
+        return False
+
+
+# =============================================================================
+# PLUGGING INTO THE EXISTING FETCH PATHS
+# =============================================================================
+
+def download(url, limiter=None):
+    """
+    The threaded path from 07_thread_download.py, with an optional limiter.
+
+    (urllib instead of requests so the benchmark needs no extra packages;
+     with requests it's the same `with limiter:` around requests.get().)
+
+    Returns:
+        tuple: (ok, latency_seconds) - latency of the request itself, NOT
+               counting time spent waiting for a limiter slot
+    """
+    if limiter is None:
+        return _get(url)
+    with limiter:
+        ok, latency = _get(url)
+        if not ok:
+            limiter.failed()
+    return ok, latency
+
+
+def _get(url):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=30) as resp:
+            resp.read()
+            ok = resp.status < 500
+    except urllib.error.HTTPError as err:
+        ok = err.code < 500
+    return ok, time.perf_counter() - start
+
+
+async def fetch_url(host, port, path, limiter=None):
+    """
+    The async path from 03_async_three.py, with an optional limiter.
+
+    (A tiny HTTP/1.0 client on asyncio streams instead of aiohttp; with
+     aiohttp it's the same `async with limiter.slot()` around session.get().)
+
+    Returns:
+        tuple: (ok, latency_seconds) - as in download()
+    """
+    if limiter is None:
+        return await _aget(host, port, path)
+    async with limiter.slot() as slot:
+        ok, latency = await _aget(host, port, path)
+        if not ok:
+            slot.failed()
+    return ok, latency
+
+
+async def _aget(host, port, path):
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.0\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    data = await reader.read()          # HTTP/1.0: server closes when done
+    writer.close()
+    await writer.wait_closed()
+    status = int(data.split(b" ", 2)[1])
+    return status < 500, time.perf_counter() - start
+
+
+# =============================================================================
+# A LOCAL SERVER THAT SATURATES
+# =============================================================================
+#
+# The server can work on WORKERS requests at a time, each taking SERVICE
+# seconds, so its capacity is WORKERS / SERVICE requests per second.
+# Extra requests wait in a queue; beyond QUEUE_LIMIT waiting requests it
+# answers 503 Service Unavailable - just like an overloaded real service.
+
+class SaturatingHandler(BaseHTTPRequestHandler):
+    WORKERS = 4
+    SERVICE = 0.02
+    QUEUE_LIMIT = 16
+
+    slots = threading.BoundedSemaphore(WORKERS)
+    waiting = 0
+    waiting_lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.waiting_lock:
+            if cls.waiting >= cls.QUEUE_LIMIT:
+                overloaded = True
+            else:
+                overloaded = False
+                cls.waiting += 1
+        if overloaded:
+            self.send_response(503)
+            self.end_headers()
+            return
+        with cls.slots:
+            with cls.waiting_lock:
+                cls.waiting -= 1
+            time.sleep(cls.SERVICE)          # "Work" on the request
+        body = b"chai"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # Keep the benchmark output readable
+
+
+class SaturatingServer(ThreadingHTTPServer):
+    request_queue_size = 1024   # listen() backlog: connections aren't refused before the 503s
+    daemon_threads = True
+
+
+def start_server():
+    server = SaturatingServer(("127.0.0.1", 0), SaturatingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def report(name, results, elapsed, limiter=None):
+    latencies = sorted(latency for _, latency in results)
+    errors = sum(1 for ok, _ in results if not ok)
+    ok_count = len(results) - errors
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[int(len(latencies) * 0.95)]
+    if limiter is not None and limiter.history:
+        limits = [limit for _, limit in limiter.history]
+        tail = limits[len(limits) // 2:]     # Second half = steady state
+        limit_text = f"{sum(tail) / len(tail):5.1f}"
+    else:
+        limit_text = "    -"
+    print(f"{name:<26} {ok_count / elapsed:>8.1f} {p50 * 1000:>8.0f}ms "
+          f"{p95 * 1000:>8.0f}ms {errors:>7} {limit_text:>9}")
+
+
+def run_threads(url, n, limiter=None, max_threads=None):
+    """Like 07_thread_download.py: one thread per URL (optionally capped)."""
+    results = []
+    lock = threading.Lock()
+
+    def worker(urls):
+        for u in urls:
+            r = download(u, limiter)
+            with lock:
+                results.append(r)
+
+    threads_count = max_threads or n
+    chunks = [[url] * (n // threads_count + (1 if i < n % threads_count else 0))
+              for i in range(threads_count)]
+    threads = [threading.Thread(target=worker, args=(c,)) for c in chunks]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - start
+
+
+async def run_async(host, port, n, limiter=None):
+    """Like 03_async_three.py: gather everything at once."""
+    start = time.perf_counter()
+    results = await asyncio.gather(*(fetch_url(host, port, "/chai", limiter)
+                                     for _ in range(n)))
+    return results, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+
+    N = 600
+    TARGET = 0.06    # Latency target: 3x the server's service time
+
+    server = start_server()
+    host, port = server.server_address
+    url = f"http://{host}:{port}/chai"
+    capacity = SaturatingHandler.WORKERS / SaturatingHandler.SERVICE
+
+    print("=" * 74)
+    print("📈 AIMD CONCURRENCY LIMITER vs FIXED vs UNLIMITED")
+    print("=" * 74)
+    print(f"Local server: {SaturatingHandler.WORKERS} workers × "
+          f"{SaturatingHandler.SERVICE * 1000:.0f}ms → knee at "
+          f"~{SaturatingHandler.WORKERS} in flight, ~{capacity:.0f} req/s; "
+          f"{N} requests per run\n")
+    print(f"{'Strategy':<26} {'OK req/s':>8} {'p50':>10} {'p95':>10} "
+          f"{'Errors':>7} {'Avg limit':>9}")
+    print("-" * 74)
+
+    report("threads: fixed 2", *run_threads(url, N, max_threads=2))
+    report("threads: unlimited", *run_threads(url, N))
+    limiter = AIMDLimiter(target_latency=TARGET)
+    report("threads: AIMD", *run_threads(url, N, limiter, max_threads=64), limiter)
+
+    report("async: unlimited gather", *asyncio.run(run_async(host, port, N)))
+    async_limiter = AsyncAIMDLimiter(target_latency=TARGET)
+    report("async: AIMD", *asyncio.run(run_async(host, port, N, async_limiter)),
+           async_limiter)
+
+    server.shutdown()
+
+
+# =============================================================================
+# EXPECTED OUTPUT (numbers vary by machine)
+# =============================================================================
+#
+# Strategy                   OK req/s        p50        p95  Errors Avg limit
+# --------------------------------------------------------------------------
+# threads: fixed 2               90.5       22ms       24ms       0         -
+# threads: unlimited            184.8       92ms      195ms     508         -
+# threads: AIMD                 187.8       43ms       61ms       0       9.6
+# async: unlimited gather        79.8      507ms      554ms     543         -
+# async: AIMD                   189.1       44ms       61ms       0       9.2
+#
+# =============================================================================
+
+# =============================================================================
+# READING THE RESULTS
+# =============================================================================
+#
+#  - fixed 2:    zero errors, low latency... but only half the capacity used
+#  - unlimited:  the queue overflows → hundreds of 503s and a big p95
+#                ("OK req/s" only counts successful responses)
+#  - AIMD:       climbs until latency crosses the target, halves, climbs
+#                again → hovers just past the knee (4 being served plus a
+#                few queued, within the 60ms target): full throughput and
+#                zero errors
+#
+# The exact numbers depend on your machine: on a busy laptop the client
+# itself competes with the server for the CPU.
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. Unlimited concurrency overloads servers; fixed limits go stale
+# 2. AIMD finds the knee by itself: +1 while healthy, ×0.5 on trouble
+# 3. Latency (not only errors) is the early-warning signal
+# 4. The same policy plugs into threads (`with limiter:`) and asyncio
+#    (`async with limiter.slot():`)
+#
+# =============================================================================
@@ -0,0 +1,338 @@
+"""
+=============================================================================
+AN AWAITABLE CROSS-PROCESS QUEUE: add_reader() INSTEAD OF A THREAD PER WAITER
+=============================================================================
+
+The Problem:
+------------
+11_process_queue.py receives results with a BLOCKING queue.get(). From an
+asyncio service (like 04_thread_async.py) the usual workaround is:
+
+    item = await loop.run_in_executor(pool, queue.get)
+
+It works, but every waiting get() PARKS A THREAD until an item arrives:
+
+    Event loop ──await──► Thread 1: queue.get()  😴 blocked
+               ──await──► Thread 2: queue.get()  😴 blocked
+               ──await──► Thread 3: queue.get()  😴 blocked
+                          ...one thread per waiter, plus a thread hop
+                          (and GIL hand-off) for every single item
+
+The Solution: WATCH THE PIPE, NOT A THREAD
+------------------------------------------
+A multiprocessing pipe is just a file descriptor. The event loop already
+knows how to wait for many file descriptors at once (select/epoll), so we
+ask it to call us when the pipe becomes READABLE:
+
+    loop.add_reader(pipe_fd, on_readable)
+
+    ┌──────────────┐  conn.send(item)  ┌──────┐  readable!  ┌─────────────┐
+    │ Worker       │ ────────────────► │ pipe │ ──────────► │ event loop  │
+    │ process(es)  │                   └──────┘             │ on_readable │
+    └──────────────┘                                        │  → wake the │
+                                                            │    waiters  │
+                                                            └─────────────┘
+    Zero threads. Any number of coroutines can await get().
+
+This Script Demonstrates:
+-------------------------
+  - AsyncProcessQueue: put()/get() for worker processes, and awaitable
+    async_put()/async_get() for the event loop, over ONE pipe
+  - A benchmark against run_in_executor(pool, queue.get): throughput,
+    latency and the number of threads tied up
+
+Rules: any number of processes may put(); awaitable gets happen in ONE
+event loop (the queue hands items to its waiting coroutines).
+
+=============================================================================
+"""
+
+import asyncio                      # The event loop we plug into
+import collections                  # deque of waiters and buffered items
+import select                       # PIPE_BUF: the write size that never blocks
+import threading                    # To count threads tied up by waiters
+import time                         # Timestamps for latency
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Lock, Pipe, Process, Queue
+from multiprocessing.reduction import ForkingPickler
+
+
+# =============================================================================
+# THE AWAITABLE QUEUE
+# =============================================================================
+
+class AsyncProcessQueue:
+    """
+    A one-way, multi-producer queue between processes whose consumer side
+    can be awaited from asyncio without any helper thread.
+
+    Usage:
+        queue = AsyncProcessQueue()
+        Process(target=worker, args=(queue,)).start()   # worker: queue.put(x)
+
+        async def main():
+            item = await queue.async_get()
+    """
+
+    def __init__(self):
+        self._reader, self._writer = Pipe(duplex=False)
+        self._write_lock = Lock()        # Producers in several processes
+        self._read_lock = Lock()         # Blocking get() in several processes
+        self._loop = None
+        self._waiters = collections.deque()   # Futures of coroutines in async_get()
+        self._buffer = collections.deque()    # Items read but not yet claimed
+
+    def __getstate__(self):
+        # Only the pipe ends and locks travel to child processes
+        return {"_reader": self._reader, "_writer": self._writer,
+                "_write_lock": self._write_lock, "_read_lock": self._read_lock}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._loop = None
+        self._waiters = collections.deque()
+        self._buffer = collections.deque()
+
+    # ---- blocking side (worker processes) -----------------------------------
+
+    def put(self, item):
+        self._send_bytes(ForkingPickler.dumps(item))
+
+    def get(self):
+        with self._read_lock:
+            return self._reader.recv()
+
+    # ---- awaitable side (one event loop) ------------------------------------
+
+    async def async_get(self):
+        """Waits for the next item without blocking the loop or a thread."""
+        if self._buffer:
+            return self._buffer.popleft()
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        if self._loop is None:
+            self._loop = loop
+            loop.add_reader(self._reader.fileno(), self._on_readable)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # We were handed an item, then cancelled before we could
+                # return it: put it back for the next waiter
+                self._buffer.appendleft(waiter.result())
+                self._hand_out()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                self._remove_waiter(waiter)
+
+    async def async_put(self, item):
+        """Sends an item from the loop, waiting (not blocking) while the pipe is full."""
+        payload = ForkingPickler.dumps(item)
+        if len(payload) + 4 > select.PIPE_BUF:      # +4: the length header
+            # A writable pipe only promises room for PIPE_BUF bytes: a bigger
+            # write could block until the reader drains it, so use a thread
+            await asyncio.to_thread(self._send_bytes, payload)
+            return
+        loop = asyncio.get_running_loop()
+        writable = loop.create_future()
+        fd = self._writer.fileno()
+        loop.add_writer(fd, lambda: writable.done() or writable.set_result(None))
+        try:
+            await writable
+        finally:
+            loop.remove_writer(fd)
+        self._send_bytes(payload)
+
+    def _send_bytes(self, payload):
+        with self._write_lock:
+            self._writer.send_bytes(payload)
+
+    def _on_readable(self):
+        """Called by the event loop when the pipe has data."""
+        with self._read_lock:
+            # Drain everything that has arrived: one wake-up, many items
+            while self._reader.poll():
+                self._buffer.append(self._reader.recv())
+        self._hand_out()
+
+    def _hand_out(self):
+        """Gives buffered items to waiting coroutines, oldest first."""
+        while self._buffer and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(self._buffer.popleft())
+        if not self._waiters:
+            self._stop_reading()
+
+    def _remove_waiter(self, waiter):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        if not self._waiters:
+            self._stop_reading()
+
+    def _stop_reading(self):
+        if self._loop is not None:
+            self._loop.remove_reader(self._reader.fileno())
+            self._loop = None
+
+
+# =============================================================================
+# PRODUCERS (worker processes)
+# =============================================================================
+
+def produce_burst(queue, count):
+    """Sends `count` small messages as fast as possible."""
+    for i in range(count):
+        queue.put((i, time.perf_counter()))
+    queue.put(None)
+
+
+def produce_paced(queue, count, gap):
+    """Sends `count` messages, one every `gap` seconds (for latency)."""
+    for i in range(count):
+        time.sleep(gap)
+        queue.put((i, time.perf_counter()))
+    queue.put(None)
+
+
+# =============================================================================
+# CONSUMERS (the asyncio service)
+# =============================================================================
+#
+# Each strategy runs `waiters` coroutines that all await the next item,
+# like several request handlers waiting for results from the workers.
+
+async def consume(get, waiters):
+    latencies = []
+    base_threads = peak_threads = threading.active_count()
+    done = asyncio.Event()
+
+    async def waiter():
+        nonlocal peak_threads
+        while not done.is_set():
+            item = await get()
+            peak_threads = max(peak_threads, threading.active_count())
+            if item is None:
+                done.set()
+                break
+            latencies.append(time.perf_counter() - item[1])
+
+    tasks = [asyncio.create_task(waiter()) for _ in range(waiters)]
+    await done.wait()
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return latencies, peak_threads - base_threads
+
+
+async def run_executor(producer, args, waiters):
+    """The usual workaround: await run_in_executor(pool, queue.get)."""
+    queue = Queue()
+    pool = ThreadPoolExecutor(max_workers=waiters)
+    loop = asyncio.get_running_loop()
+    worker = Process(target=producer, args=(queue, *args))
+    worker.start()
+    start = time.perf_counter()
+    latencies, threads = await consume(
+        lambda: loop.run_in_executor(pool, queue.get), waiters)
+    elapsed = time.perf_counter() - start
+    worker.join()
+    # Waiters still blocked in queue.get() need an item each to exit
+    for _ in range(waiters):
+        queue.put(None)
+    pool.shutdown()
+    return latencies, elapsed, threads
+
+
+async def run_add_reader(producer, args, waiters):
+    """The new queue: the event loop watches the pipe itself."""
+    queue = AsyncProcessQueue()
+    worker = Process(target=producer, args=(queue, *args))
+    worker.start()
+    start = time.perf_counter()
+    latencies, threads = await consume(queue.async_get, waiters)
+    elapsed = time.perf_counter() - start
+    worker.join()
+    return latencies, elapsed, threads
+
+
+def report(name, latencies, elapsed, threads):
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"{name:<34} {len(latencies) / elapsed:>10,.0f} {p50:>8.2f}ms "
+          f"{p99:>8.2f}ms {threads:>8}")
+
+
+async def main():
+    BURST = 50_000
+    PACED, GAP = 500, 0.002
+    WAITERS = 16
+
+    print("=" * 74)
+    print("📬 ASYNC CROSS-PROCESS QUEUE: add_reader() vs run_in_executor(get)")
+    print("=" * 74)
+    print(f"{WAITERS} coroutines await items from one worker process\n")
+
+    header = (f"{'Strategy':<34} {'Items/s':>10} {'p50':>10} {'p99':>10} "
+              f"{'Threads':>8}")
+
+    print(f"1️⃣  Throughput: a burst of {BURST:,} messages")
+    print(header)
+    print("-" * 74)
+    report("run_in_executor(pool, queue.get)",
+           *await run_executor(produce_burst, (BURST,), WAITERS))
+    report("AsyncProcessQueue (add_reader)",
+           *await run_add_reader(produce_burst, (BURST,), WAITERS))
+
+    print(f"\n2️⃣  Latency: {PACED} messages, one every {GAP * 1000:.0f}ms")
+    print(header)
+    print("-" * 74)
+    report("run_in_executor(pool, queue.get)",
+           *await run_executor(produce_paced, (PACED, GAP), WAITERS))
+    report("AsyncProcessQueue (add_reader)",
+           *await run_add_reader(produce_paced, (PACED, GAP), WAITERS))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+# =============================================================================
+# EXPECTED OUTPUT (numbers vary by machine)
+# =============================================================================
+#
+# 1️⃣  Throughput: a burst of 50,000 messages
+# Strategy                              Items/s        p50        p99  Threads
+# --------------------------------------------------------------------------
+# run_in_executor(pool, queue.get)       27,225   900.85ms  1560.32ms       16
+# AsyncProcessQueue (add_reader)         71,431   385.56ms   642.56ms        0
+#
+# 2️⃣  Latency: 500 messages, one every 2ms
+# Strategy                              Items/s        p50        p99  Threads
+# --------------------------------------------------------------------------
+# run_in_executor(pool, queue.get)          458     0.23ms     0.59ms       16
+# AsyncProcessQueue (add_reader)            448     0.16ms     0.54ms        0
+#
+# In the burst, latency is mostly time spent queued behind earlier items:
+# the faster consumer drains the backlog sooner. When items trickle in,
+# both deliver them quickly - but the executor keeps 16 threads parked the
+# whole time, and each item costs a thread hop.
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. run_in_executor(pool, queue.get) parks one thread per waiting get()
+# 2. A pipe is a file descriptor: loop.add_reader() waits on it for free
+# 3. One wake-up can drain MANY items - fewer thread hops, more throughput
+# 4. Any number of coroutines can await the queue with zero extra threads
+# 5. Keep the awaitable side in ONE event loop; producers can be anywhere
+#
+# =============================================================================
@@ -0,0 +1,412 @@
+"""
+=============================================================================
+HTTP/2 MULTIPLEXING: THOUSANDS OF SMALL REQUESTS OVER ONE CONNECTION
+=============================================================================
+
+The Problem:
+------------
+07_thread_download.py opens one connection per thread and
+03_async_three.py fires 3 requests at one host. Scale that to thousands of
+SMALL requests to the same host and HTTP/1.1 shows its limit: one
+connection carries ONE request at a time.
+
+    HTTP/1.1 (pool of 4 connections):
+    conn 1: [req 1 ····· resp] [req 5 ····· resp] [req 9 ····· ...
+    conn 2: [req 2 ····· resp] [req 6 ····· resp] ...
+    conn 3: [req 3 ····· resp] ...
+    conn 4: [req 4 ····· resp] ...
+             → more concurrency = more connections (TCP + TLS handshakes,
+               sockets, server memory), or requests wait in line
+
+The Solution: HTTP/2 STREAMS
+----------------------------
+HTTP/2 splits ONE connection into many independent STREAMS. Requests and
+responses are cut into frames and interleaved, so hundreds of requests
+are in flight at once without opening a new connection for each:
+
+    HTTP/2 (1 connection):
+    conn 1: [1][2][3][4][5]...[100]  ← 100 requests out immediately
+            [resp 3][resp 1][resp 4]... ← responses in any order
+
+This Script Demonstrates:
+-------------------------
+  - H2FetchEngine: an httpx client speaking HTTP/2 with the SAME interface
+    as the earlier lessons: download(url) for threads (07_thread_download)
+    and fetch_url(session, url) for asyncio (03_async_three)
+  - A LOCAL server speaking both HTTP/1.1 and HTTP/2 (cleartext, "h2c"),
+    built on the h2 protocol library, that counts connections
+  - A benchmark: request rate and connection count, HTTP/1.1 pools vs
+    one multiplexed HTTP/2 connection
+
+Installation:
+-------------
+    pip install "httpx[http2]"        (installs h2 as well)
+
+=============================================================================
+"""
+
+import asyncio           # Event loop for the server and the async client
+import threading         # Server thread and the threaded download() path
+import time              # Service time and benchmark timings
+import h2.config         # HTTP/2 protocol state machine (pip install h2)
+import h2.connection
+import h2.errors
+import h2.events
+import h2.exceptions
+import httpx             # HTTP/1.1 + HTTP/2 client (pip install "httpx[http2]")
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+
+# =============================================================================
+# THE FETCH ENGINE
+# =============================================================================
+
+class H2FetchEngine:
+    """
+    Multiplexes many requests to one host over a single HTTP/2 connection.
+
+    Args:
+        max_streams (int): Requests in flight at once (the server may allow
+                           fewer - commonly 100 streams per connection)
+        prior_knowledge (bool): Speak HTTP/2 directly over plain http://
+                                ("h2c"), as local/internal servers often
+                                do. For https:// URLs HTTP/2 is negotiated
+                                during the TLS handshake (ALPN) either way.
+
+    Usage:
+        async with H2FetchEngine() as session:
+            sizes = await asyncio.gather(*(fetch_url(session, u) for u in urls))
+    """
+
+    def __init__(self, max_streams=100, prior_knowledge=True, timeout=30.0):
+        self._client = httpx.AsyncClient(
+            http1=not prior_knowledge, http2=True, timeout=timeout,
+            limits=httpx.Limits(max_connections=1, max_keepalive_connections=1))
+        self._streams = asyncio.Semaphore(max_streams)
+
+    async def get(self, url):
+        async with self._streams:
+            response = await self._client.get(url)
+            response.raise_for_status()
+            return response
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+async def fetch_url(session, url):
+    """
+    03_async_three.py's fetch_url(), for ANY session with an async get():
+    an H2FetchEngine, an httpx.AsyncClient...
+
+    Returns:
+        int: Size of the response body in bytes
+    """
+    response = await session.get(url)
+    return len(response.content)
+
+
+# The threaded path: ONE H2FetchEngine on a background event loop, shared
+# by every thread. A sync httpx.Client(http2=True) is NOT safe to share
+# across threads - concurrent threads can emit stream IDs out of order,
+# which the server rejects as a protocol error. Handing each request to
+# the engine's loop keeps all stream bookkeeping on one thread.
+_engine = None
+_engine_loop = None
+_engine_lock = threading.Lock()
+
+
+def _shared_engine():
+    global _engine, _engine_loop
+    with _engine_lock:
+        if _engine is None:
+            _engine_loop = asyncio.new_event_loop()
+            threading.Thread(target=_engine_loop.run_forever, daemon=True).start()
+
+            async def make():
+                return H2FetchEngine()
+
+            _engine = asyncio.run_coroutine_threadsafe(make(), _engine_loop).result()
+    return _engine, _engine_loop
+
+
+def download(url):
+    """
+    07_thread_download.py's download(), multiplexed: every thread's request
+    becomes a stream on the same HTTP/2 connection.
+
+    Returns:
+        int: Size of the response body in bytes
+    """
+    engine, loop = _shared_engine()
+    return asyncio.run_coroutine_threadsafe(fetch_url(engine, url), loop).result()
+
+
+# =============================================================================
+# A LOCAL HTTP/1.1 + HTTP/2 SERVER
+# =============================================================================
+#
+# Every response waits SERVICE seconds (a database lookup, say) and returns
+# a small body. The first 24 bytes decide the protocol: HTTP/2 clients
+# start with the fixed "connection preface", HTTP/1.1 clients with "GET".
+
+class LocalServer:
+    SERVICE = 0.02
+    BODY = b'{"chai": "masala", "stock": 42}'
+
+    def __init__(self):
+        self.connections = 0          # Accepted so far
+        self.open = 0                 # Currently open
+        self.peak_open = 0
+        self.requests = 0
+        self.port = None
+        self._loop = None
+        self._server = None
+
+    # ---- lifecycle (server runs on its own thread + event loop) -------------
+
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, "127.0.0.1", 0, backlog=1024))
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def reset(self):
+        self.connections = self.peak_open = self.requests = 0
+
+    # ---- connections --------------------------------------------------------
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self.open += 1
+        self.peak_open = max(self.peak_open, self.open)
+        try:
+            first = await reader.readexactly(len(H2_PREFACE))
+            if first == H2_PREFACE:
+                await self._serve_h2(first, reader, writer)
+            else:
+                await self._serve_h1(first, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.open -= 1
+            writer.close()
+
+    async def _serve_h1(self, buffer, reader, writer):
+        """HTTP/1.1 with keep-alive: one request at a time per connection."""
+        while True:
+            while b"\r\n\r\n" not in buffer:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    return
+                buffer += chunk
+            head, buffer = buffer.split(b"\r\n\r\n", 1)
+            self.requests += 1
+            await asyncio.sleep(self.SERVICE)
+            writer.write(b"HTTP/1.1 200 OK\r\n"
+                         b"Content-Type: application/json\r\n"
+                         b"Content-Length: " + str(len(self.BODY)).encode() + b"\r\n\r\n"
+                         + self.BODY)
+            await writer.drain()
+            if b"connection: close" in head.lower():
+                return
+
+    async def _serve_h2(self, preface, reader, writer):
+        """HTTP/2: every request is a stream; answer each one concurrently."""
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        pending = set()
+        data = preface
+        try:
+            while data:
+                try:
+                    events = conn.receive_data(data)
+                except h2.exceptions.ProtocolError:
+                    # A misbehaving client: say GOAWAY and drop the connection
+                    conn.close_connection(
+                        error_code=h2.errors.ErrorCodes.PROTOCOL_ERROR)
+                    writer.write(conn.data_to_send())
+                    await writer.drain()
+                    return
+                for event in events:
+                    if isinstance(event, h2.events.RequestReceived):
+                        self.requests += 1
+                        task = asyncio.create_task(
+                            self._respond_h2(conn, writer, event.stream_id))
+                        pending.add(task)
+                        task.add_done_callback(pending.discard)
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        data = b""
+                writer.write(conn.data_to_send())
+                await writer.drain()
+                if data:
+                    data = await reader.read(65536)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _respond_h2(self, conn, writer, stream_id):
+        await asyncio.sleep(self.SERVICE)
+        try:
+            conn.send_headers(stream_id, [
+                (":status", "200"),
+                ("content-type", "application/json"),
+                ("content-length", str(len(self.BODY))),
+            ])
+            conn.send_data(stream_id, self.BODY, end_stream=True)
+        except h2.exceptions.ProtocolError:
+            return                    # Stream reset or connection closed meanwhile
+        writer.write(conn.data_to_send())
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+async def run_async(session, url, n, concurrency):
+    """Fetches `n` URLs with at most `concurrency` in flight."""
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with limit:
+            return await fetch_url(session, url)
+
+    start = time.perf_counter()
+    sizes = await asyncio.gather(*(one() for _ in range(n)))
+    return time.perf_counter() - start, sum(sizes)
+
+
+async def benchmark(server, n, concurrency):
+    url = f"http://127.0.0.1:{server.port}/stock"
+    setups = [
+        ("HTTP/1.1, new conn per request",
+         lambda: httpx.AsyncClient(headers={"Connection": "close"},
+                                   limits=httpx.Limits(max_connections=concurrency))),
+        ("HTTP/1.1 pool, 10 connections",
+         lambda: httpx.AsyncClient(limits=httpx.Limits(max_connections=10))),
+        (f"HTTP/1.1 pool, {concurrency} connections",
+         lambda: httpx.AsyncClient(limits=httpx.Limits(max_connections=concurrency))),
+        ("HTTP/2, 1 connection", lambda: H2FetchEngine(max_streams=concurrency)),
+    ]
+    print(f"{'Client':<34} {'Req/s':>9} {'Conns opened':>13} {'Peak open':>10}")
+    print("-" * 70)
+    for name, make in setups:
+        server.reset()
+        async with make() as session:
+            elapsed, _ = await run_async(session, url, n, concurrency)
+        print(f"{name:<34} {n / elapsed:>9,.0f} {server.connections:>13} "
+              f"{server.peak_open:>10}")
+
+
+def benchmark_threads(server, n, threads):
+    """The threaded path: `threads` threads share one HTTP/2 connection."""
+    url = f"http://127.0.0.1:{server.port}/stock"
+    server.reset()
+    per_thread = n // threads
+    outcomes = {"ok": 0, "failed": 0}
+    outcomes_lock = threading.Lock()
+
+    def worker():
+        for _ in range(per_thread):
+            try:
+                download(url)
+                outcome = "ok"
+            except httpx.HTTPError:
+                outcome = "failed"
+            with outcomes_lock:
+                outcomes[outcome] += 1
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    print(f"{f'download() x {threads} threads, HTTP/2':<34} "
+          f"{outcomes['ok'] / elapsed:>9,.0f} {server.connections:>13} "
+          f"{server.peak_open:>10}")
+    if outcomes["failed"]:
+        print(f"   ⚠️  {outcomes['failed']} of {per_thread * threads} requests failed")
+
+
+if __name__ == "__main__":
+
+    N = 3_000
+    CONCURRENCY = 100
+
+    server = LocalServer().start()
+    print("=" * 70)
+    print("🌐 HTTP/2 MULTIPLEXING vs HTTP/1.1 CONNECTION POOLS")
+    print("=" * 70)
+    print(f"{N:,} small requests to one local host, {CONCURRENCY} in flight, "
+          f"{LocalServer.SERVICE * 1000:.0f}ms server time each\n")
+
+    asyncio.run(benchmark(server, N, CONCURRENCY))
+    benchmark_threads(server, N // 5, threads=20)
+    server.stop()
+
+
+# =============================================================================
+# EXPECTED OUTPUT (1 CPU shared by client and server; numbers vary)
+# =============================================================================
+#
+# 3,000 small requests to one local host, 100 in flight, 20ms server time each
+#
+# Client                                 Req/s  Conns opened  Peak open
+# ----------------------------------------------------------------------
+# HTTP/1.1, new conn per request           680          3000        100
+# HTTP/1.1 pool, 10 connections            294            10         10
+# HTTP/1.1 pool, 100 connections           169           142        100
+# HTTP/2, 1 connection                     851             1          1
+# download() x 20 threads, HTTP/2          653             1          1
+#
+#  - A small HTTP/1.1 pool caps throughput near pool size / server time
+#    (10 / 20ms = 500 req/s at best)
+#  - Big pools cost connections: 100 sockets open, and here httpx's pool
+#    bookkeeping even made it the SLOWEST option (connection management
+#    burns client CPU). Over the internet every new connection also pays
+#    a TCP + TLS handshake
+#  - HTTP/2 gets the highest rate from ONE connection. Its limit is the
+#    server's SETTINGS_MAX_CONCURRENT_STREAMS (often 100); beyond that,
+#    httpx waits for a free stream
+#  - One connection is also one TCP window: for LARGE downloads a few
+#    connections can still beat one. HTTP/2 shines for many SMALL requests
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. HTTP/1.1: one request at a time per connection → concurrency costs
+#    connections
+# 2. HTTP/2: many streams per connection → concurrency is (almost) free
+# 3. Keep the interface: download(url) / fetch_url(session, url) hide the
+#    protocol, so callers don't change
+# 4. Count connections, not just requests/s - servers and proxies pay for
+#    every open socket
+#
+# =============================================================================
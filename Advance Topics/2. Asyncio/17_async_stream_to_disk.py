@@ -0,0 +1,306 @@
+"""
+=============================================================================
+STREAMING DOWNLOADS TO DISK: CONSTANT MEMORY, HOWEVER BIG THE FILE
+=============================================================================
+
+The Problem:
+------------
+03_async_three.py's fetch_url() only looks at the status code, and
+07_thread_download.py's download() does `response.content` - the WHOLE
+body in memory before a single byte reaches the disk:
+
+    100 concurrent downloads × 500 MB each = 50 GB of RAM  💥
+
+The Solution: STREAM IT THROUGH A BOUNDED QUEUE
+-----------------------------------------------
+    socket ──► iter_chunked(64 KB) ──► asyncio.Queue(maxsize=8) ──► writer
+               (event loop)            at most 8 chunks waiting      (thread:
+                                                                    f.write)
+  - The body arrives in 64 KB chunks; each goes into a BOUNDED queue
+  - A writer task takes chunks out and writes them with asyncio.to_thread,
+    so slow disk writes never block the event loop
+  - If the disk is slower than the network the queue fills, `await
+    queue.put()` waits, aiohttp stops reading the socket, and TCP flow
+    control slows the SERVER down. Backpressure, all the way back.
+
+    Memory per transfer ≈ queue size × chunk size + aiohttp's buffers
+                        ≈ 8 × 64 KB + a few hundred KB ≈ 1.3 MB measured
+                          - the same for a 1 KB body or a 1 TB one
+
+  - The file is written as name.part and renamed on success: a half
+    download never looks like a finished one
+  - Each put races against the writer task: if the disk fails (bad path,
+    disk full), the download stops and the writer's error is raised
+
+This Script Demonstrates:
+-------------------------
+  - stream_to_file(session, url, path): the bounded streaming writer
+  - A local aiohttp server (in its own process) streaming large bodies
+  - Peak RSS of 100 concurrent 500 MB streamed transfers (they are all on
+    disk at once: the last row needs ~50 GB free in the temp directory,
+    and is skipped without it)
+  - The same measurement for read-it-all-then-write (fewer, smaller
+    transfers - the full size would not fit)
+
+Installation:
+-------------
+    pip install aiohttp
+
+=============================================================================
+"""
+
+import asyncio           # Event loop, bounded queue, to_thread
+import os                # File sizes, renames, cleanup
+import shutil            # Removing the download directory
+import tempfile          # Where the downloads go
+import time              # For measuring execution time
+from multiprocessing import Process
+import aiohttp           # Async HTTP client + server (pip install aiohttp)
+from aiohttp import web
+
+CHUNK_SIZE = 64 * 1024
+QUEUE_SIZE = 8
+HOST, PORT = "127.0.0.1", 8790
+
+
+# =============================================================================
+# THE STREAMING WRITER
+# =============================================================================
+
+async def _write_chunks(queue, path):
+    """Writer task: drains the queue into `path`, file I/O in a thread."""
+    f = await asyncio.to_thread(open, path, "wb")
+    try:
+        while (chunk := await queue.get()) is not None:
+            await asyncio.to_thread(f.write, chunk)
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+async def _put(queue, item, writer):
+    """queue.put(item) - unless the writer fails first, then its error is raised."""
+    if not queue.full():
+        queue.put_nowait(item)
+        return
+    put = asyncio.create_task(queue.put(item))
+    await asyncio.wait({put, writer}, return_when=asyncio.FIRST_COMPLETED)
+    if not put.done():
+        put.cancel()
+        writer.result()                     # Bad path, disk full... raised here
+        raise RuntimeError("writer stopped before the end of the body")
+
+
+async def stream_to_file(session, url, path, chunk_size=CHUNK_SIZE, queue_size=QUEUE_SIZE):
+    """
+    Downloads `url` to `path` with bounded memory.
+
+    Args:
+        session (aiohttp.ClientSession): Reusable HTTP session
+        url (str): The URL to download
+        path (str): Destination file (written as path + ".part", then renamed)
+        chunk_size (int): Bytes per read from the response
+        queue_size (int): Chunks allowed to wait for the disk
+
+    Returns:
+        int: Bytes written
+    """
+    part = path + ".part"
+    queue = asyncio.Queue(maxsize=queue_size)
+    writer = asyncio.create_task(_write_chunks(queue, part))
+    written = 0
+    try:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(chunk_size):
+                await _put(queue, chunk, writer)    # Waits while the disk catches up
+                written += len(chunk)
+        await _put(queue, None, writer)     # End of body
+        await writer
+    except BaseException:
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+        await asyncio.to_thread(lambda: os.path.exists(part) and os.remove(part))
+        raise
+    os.replace(part, path)
+    return written
+
+
+async def read_then_write(session, url, path):
+    """07_thread_download.py's approach, async: the whole body in memory."""
+    async with session.get(url) as response:
+        response.raise_for_status()
+        body = await response.read()
+    await asyncio.to_thread(_write_all, path, body)
+    return len(body)
+
+
+def _write_all(path, body):
+    with open(path, "wb") as f:
+        f.write(body)
+
+
+# =============================================================================
+# A LOCAL SERVER STREAMING BIG BODIES (its own process: its memory isn't ours)
+# =============================================================================
+
+BLOCK = bytes(range(250)) * 4000            # 1 MB (10**6 bytes) of a repeating pattern
+
+
+async def big_file(request):
+    """GET /bytes/<mb> → <mb> megabytes, streamed."""
+    size_mb = int(request.match_info["mb"])
+    response = web.StreamResponse(headers={"Content-Type": "application/octet-stream"})
+    response.content_length = size_mb * len(BLOCK)
+    await response.prepare(request)
+    try:
+        for _ in range(size_mb):
+            await response.write(BLOCK)     # Waits for the client to drain
+        await response.write_eof()
+    except ConnectionError:
+        pass                                # The client gave up (e.g. its disk failed)
+    return response
+
+
+def run_server():
+    app = web.Application()
+    app.router.add_get("/bytes/{mb}", big_file)
+    web.run_app(app, host=HOST, port=PORT, print=None, access_log=None)
+
+
+# =============================================================================
+# MEASURING
+# =============================================================================
+
+def rss_mb():
+    """This process's resident memory, from /proc."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def peak_rss(coro):
+    """Runs `coro` while sampling RSS every 50 ms; returns (result, peak MB)."""
+    peak = rss_mb()
+
+    async def sample():
+        nonlocal peak
+        while True:
+            peak = max(peak, rss_mb())
+            await asyncio.sleep(0.05)
+
+    sampler = asyncio.create_task(sample())
+    try:
+        return await coro, max(peak, rss_mb())
+    finally:
+        sampler.cancel()
+
+
+async def transfer_all(fetch, transfers, size_mb, directory):
+    """`transfers` concurrent downloads of `size_mb` MB each; files are checked and deleted."""
+    url = f"http://{HOST}:{PORT}/bytes/{size_mb}"
+
+    async def one(i):
+        path = os.path.join(directory, f"file_{i:03d}.bin")
+        written = await fetch(session, url, path)
+        assert written == os.path.getsize(path) == size_mb * len(BLOCK)
+        await asyncio.to_thread(os.remove, path)
+        return written
+
+    connector = aiohttp.TCPConnector(limit=transfers)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return sum(await asyncio.gather(*(one(i) for i in range(transfers))))
+
+
+async def wait_for_server():
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection(HOST, PORT)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+
+
+async def main():
+    TRANSFERS, SIZE_MB = 100, 500           # 50 GB through the client
+    NAIVE_TRANSFERS, NAIVE_MB = 10, 100     # 1 GB - enough to see the trend
+
+    print("=" * 66)
+    print("💾 STREAMING DOWNLOADS TO DISK WITH BOUNDED MEMORY")
+    print("=" * 66)
+    print(f"Chunk {CHUNK_SIZE // 1024} KB, queue {QUEUE_SIZE} chunks\n")
+    await wait_for_server()
+    directory = tempfile.mkdtemp(prefix="stream-")
+    baseline = rss_mb()
+    print(f"Baseline RSS: {baseline:.0f} MB\n")
+
+    try:
+        rows = [("read → write", read_then_write, NAIVE_TRANSFERS, NAIVE_MB),
+                ("stream_to_file", stream_to_file, NAIVE_TRANSFERS, NAIVE_MB),
+                ("stream_to_file", stream_to_file, TRANSFERS, SIZE_MB)]
+        print(f"   {'Method':<15} {'Transfers':>9} {'Each':>8} {'Total':>8} "
+              f"{'Time':>7} {'MB/s':>6} {'Peak RSS':>9}")
+        for name, fetch, transfers, size_mb in rows:
+            needed = transfers * size_mb * len(BLOCK)
+            if shutil.disk_usage(directory).free < needed * 1.05:
+                print(f"   {name:<15} {transfers:>9} {size_mb:>5} MB  skipped: needs "
+                      f"{needed / 1e9:.0f} GB free in {tempfile.gettempdir()}")
+                continue
+            start = time.perf_counter()
+            total, peak = await peak_rss(transfer_all(fetch, transfers, size_mb, directory))
+            elapsed = time.perf_counter() - start
+            print(f"   {name:<15} {transfers:>9} {size_mb:>5} MB {total / 1e9:>5.1f} GB "
+                  f"{elapsed:>6.1f}s {total / 1e6 / elapsed:>6.0f} "
+                  f"{peak - baseline:>+6.0f} MB", flush=True)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    server = Process(target=run_server, daemon=True)
+    server.start()
+    try:
+        asyncio.run(main())
+    finally:
+        server.terminate()
+
+
+# =============================================================================
+# EXPECTED OUTPUT
+# =============================================================================
+#
+# ==================================================================
+# 💾 STREAMING DOWNLOADS TO DISK WITH BOUNDED MEMORY
+# ==================================================================
+# Chunk 64 KB, queue 8 chunks
+#
+# Baseline RSS: 38 MB
+#
+#    Method          Transfers     Each    Total    Time   MB/s  Peak RSS
+#    read → write           10   100 MB   1.0 GB    6.5s    154  +1797 MB
+#    stream_to_file         10   100 MB   1.0 GB    2.8s    354    +15 MB
+#    stream_to_file        100   500 MB  50.0 GB  154.9s    323   +135 MB
+#
+# Notice:
+#   - read → write needs ~1.8× the data size in RAM (the body plus copies);
+#     at 100 × 500 MB that would be ~90 GB
+#   - Streaming 50x MORE data used 10x less memory: ~1.3 MB per transfer,
+#     whatever the file size
+#   - Streaming was also faster: no giant allocations, disk and network
+#     overlap
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. Never `await response.read()` a body you can't afford to hold
+# 2. iter_chunked() + a BOUNDED queue: memory = queue size × chunk size
+# 3. Offload file writes with asyncio.to_thread - the loop keeps streaming
+# 4. A full queue pauses the socket read: backpressure reaches the server
+# 5. Write to .part and rename: partial downloads never look finished
+#
+# =============================================================================
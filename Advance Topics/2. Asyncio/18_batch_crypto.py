@@ -0,0 +1,300 @@
+"""
+=============================================================================
+A BATCH CRYPTO SERVICE: HMAC MILLIONS OF RECORDS ON EVERY CORE
+=============================================================================
+
+The Problem:
+------------
+05_process_async.py sends ONE string to a process pool to "encrypt" it.
+Real jobs sign or hash MILLIONS of records, and one task per record is
+a disaster:
+
+    1 record per task:  pickle → pipe → unpickle → hmac (0.5 µs!) → pickle
+                        → pipe → unpickle → future...   ~100 µs of overhead
+                        for 0.5 µs of work
+
+The Solution: BATCHES, AND THE RIGHT POOL FOR THE RECORD SIZE
+-------------------------------------------------------------
+    records (any iterable, read lazily)
+        │
+        ▼  split into batches of up to N records / M bytes
+    ┌────────┐ ┌────────┐ ┌────────┐
+    │batch 1 │ │batch 2 │ │batch 3 │ ...   one executor task per BATCH:
+    └───┬────┘ └───┬────┘ └───┬────┘       the overhead is paid once
+        ▼          ▼          ▼
+    small records ──► ProcessPoolExecutor   per-record Python work holds
+                                            the GIL → needs processes
+    big records   ──► ThreadPoolExecutor    hashlib/hmac RELEASE the GIL
+                                            while hashing a large buffer
+                                            (> 2 KB) → threads run in
+                                            parallel, and nothing is pickled
+
+  - Results come back IN ORDER, with a bounded number of batches in flight
+    (constant memory for a stream of any length)
+  - The operation is a parameter: HMAC-SHA256, keyed BLAKE2b, or your own
+    top-level function (e.g. an AES-GCM encrypt from the `cryptography`
+    package - the stdlib has MACs and hashes, but no ciphers)
+
+This Script Demonstrates:
+-------------------------
+  - BatchCryptoService.process(records): an async generator of results
+  - hmac_sha256 / blake2b_mac operations
+  - Records/sec by batch size and by worker count
+  - Large records: threads vs processes vs serial
+
+=============================================================================
+"""
+
+import asyncio           # run_in_executor, like 05_process_async.py
+import hashlib           # BLAKE2b keyed hashing
+import hmac              # HMAC-SHA256
+import os                # cpu_count(), random key
+import time              # For measuring execution time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# =============================================================================
+# OPERATIONS (top-level functions: they must pickle to reach a process)
+# =============================================================================
+
+def hmac_sha256(key, record):
+    """HMAC-SHA256 tag of one record."""
+    return hmac.digest(key, record, "sha256")
+
+
+def blake2b_mac(key, record):
+    """Keyed BLAKE2b: a MAC in a single, faster hash."""
+    return hashlib.blake2b(record, key=key, digest_size=32).digest()
+
+
+def _run_batch(operation, key, batch):
+    """Runs in a worker: one call, a whole batch."""
+    return [operation(key, record) for record in batch]
+
+
+# =============================================================================
+# THE SERVICE
+# =============================================================================
+
+def iter_batches(records, max_records, max_bytes):
+    """Groups records into lists of up to `max_records` records or `max_bytes` bytes."""
+    batch, size = [], 0
+    for record in records:
+        batch.append(record)
+        size += len(record)
+        if len(batch) >= max_records or size >= max_bytes:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+
+class BatchCryptoService:
+    """
+    Applies a keyed operation to a stream of records on all cores.
+
+    Args:
+        key (bytes): The secret key
+        operation (callable): (key, record) → bytes; a top-level function
+        workers (int): Processes AND threads (default: cpu_count())
+        batch_size (int): Max records per batch
+        batch_bytes (int): Max bytes per batch
+        big_record (int): Batches holding a record this large go to threads
+        max_in_flight (int): Batches submitted but not yet yielded
+                             (default: 2 × workers)
+
+    Usage:
+        async with BatchCryptoService(key) as service:
+            async for tag in service.process(records):
+                ...
+    """
+
+    def __init__(self, key, operation=hmac_sha256, workers=None, batch_size=10_000,
+                 batch_bytes=16 * 1024 * 1024, big_record=64 * 1024, max_in_flight=None):
+        self.key = key
+        self.operation = operation
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.big_record = big_record
+        self.max_in_flight = max_in_flight or 2 * self.workers
+        self._processes = ProcessPoolExecutor(self.workers)
+        self._threads = ThreadPoolExecutor(self.workers)
+
+    def warm_up(self):
+        """Starts the worker processes now rather than on the first batch."""
+        list(self._processes.map(int, range(self.workers)))
+
+    async def process(self, records):
+        """Yields operation(key, record) for every record, in input order."""
+        loop = asyncio.get_running_loop()
+        in_flight = deque()
+        for batch in iter_batches(records, self.batch_size, self.batch_bytes):
+            big = max(map(len, batch)) >= self.big_record
+            executor = self._threads if big else self._processes
+            in_flight.append(loop.run_in_executor(
+                executor, _run_batch, self.operation, self.key, batch))
+            if len(in_flight) >= self.max_in_flight:
+                for result in await in_flight.popleft():
+                    yield result
+        while in_flight:
+            for result in await in_flight.popleft():
+                yield result
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self._processes.shutdown()
+        self._threads.shutdown()
+
+
+# =============================================================================
+# BENCHMARK HELPERS
+# =============================================================================
+
+def small_records(n):
+    """n records of ~100 bytes (a JSON-ish log line), generated lazily."""
+    for i in range(n):
+        yield b'{"order": %d, "tea": "masala chai", "cups": %d, "table": %d, "paid": true}' % (
+            i, i % 5 + 1, i % 40)
+
+
+async def measure(records, n, **options):
+    """records/sec of BatchCryptoService over `records`; also returns the tags."""
+    async with BatchCryptoService(KEY, **options) as service:
+        service.warm_up()                   # Don't time process start-up
+        start = time.perf_counter()
+        tags = [tag async for tag in service.process(records)]
+        elapsed = time.perf_counter() - start
+    assert len(tags) == n
+    return n / elapsed, tags
+
+
+KEY = os.urandom(32)
+
+
+async def main():
+    RECORDS = 500_000
+    BIG = [os.urandom(4 * 1024 * 1024) for _ in range(64)]     # 64 × 4 MB
+    cpus = os.cpu_count() or 1
+
+    print("=" * 66)
+    print("🔏 BATCH CRYPTO SERVICE: HMAC-SHA256 over many records")
+    print("=" * 66)
+    print(f"CPUs: {cpus}\n")
+
+    # -------------------------------------------------------------------------
+    # 1) Serial baseline
+    # -------------------------------------------------------------------------
+    start = time.perf_counter()
+    expected = [hmac_sha256(KEY, r) for r in small_records(RECORDS)]
+    serial = RECORDS / (time.perf_counter() - start)
+    print(f"1️⃣  Serial, in the event loop: {serial:>10,.0f} records/s "
+          f"({RECORDS:,} × ~100 B)\n")
+
+    # -------------------------------------------------------------------------
+    # 2) Batch size (the overhead per task)
+    # -------------------------------------------------------------------------
+    print(f"2️⃣  Batch size ({cpus} worker(s))")
+    print(f"   {'Batch':>8} {'records/s':>12} {'vs serial':>10}")
+    for batch_size in (10, 100, 1_000, 10_000, 100_000):
+        rate, tags = await measure(small_records(RECORDS), RECORDS,
+                                   batch_size=batch_size, workers=cpus)
+        assert tags == expected
+        print(f"   {batch_size:>8,} {rate:>12,.0f} {rate / serial:>9.2f}x")
+    print()
+
+    # -------------------------------------------------------------------------
+    # 3) Worker count
+    # -------------------------------------------------------------------------
+    print("3️⃣  Workers (batch 10,000)")
+    print(f"   {'Workers':>8} {'HMAC-SHA256':>14} {'BLAKE2b MAC':>14}")
+    for workers in sorted({1, 2, 4, cpus}):
+        rate, _ = await measure(small_records(RECORDS), RECORDS, workers=workers)
+        blake, _ = await measure(small_records(RECORDS), RECORDS, workers=workers,
+                                 operation=blake2b_mac)
+        print(f"   {workers:>8} {rate:>14,.0f} {blake:>14,.0f}")
+    print()
+
+    # -------------------------------------------------------------------------
+    # 4) Big records: threads (GIL released, no pickling) vs processes
+    # -------------------------------------------------------------------------
+    total_mb = sum(map(len, BIG)) / 1e6
+    print(f"4️⃣  Big records: {len(BIG)} × 4 MB ({total_mb:.0f} MB)")
+    start = time.perf_counter()
+    expected = [hmac_sha256(KEY, r) for r in BIG]
+    elapsed = time.perf_counter() - start
+    print(f"   {'serial':<28} {total_mb / elapsed:>7,.0f} MB/s")
+    for label, big_record in (("threads (GIL released)", 64 * 1024),
+                              ("processes (pickled)", float("inf"))):
+        async with BatchCryptoService(KEY, workers=cpus, batch_bytes=8 * 1024 * 1024,
+                                      big_record=big_record) as service:
+            service.warm_up()
+            start = time.perf_counter()
+            tags = [tag async for tag in service.process(BIG)]
+            elapsed = time.perf_counter() - start
+        assert tags == expected
+        print(f"   {label:<28} {total_mb / elapsed:>7,.0f} MB/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+# =============================================================================
+# EXPECTED OUTPUT
+# =============================================================================
+#
+# (Recorded on a 1-CPU machine: the workers share one core, so the tables
+#  show the batching OVERHEAD. With N cores, sections 2-4 scale toward N×.)
+#
+# ==================================================================
+# 🔏 BATCH CRYPTO SERVICE: HMAC-SHA256 over many records
+# ==================================================================
+# CPUs: 1
+#
+# 1️⃣  Serial, in the event loop:    413,167 records/s (500,000 × ~100 B)
+#
+# 2️⃣  Batch size (1 worker(s))
+#       Batch    records/s  vs serial
+#          10       49,021      0.12x
+#         100      166,664      0.40x
+#       1,000      262,417      0.64x
+#      10,000      342,216      0.83x
+#     100,000      278,605      0.67x
+#
+# 3️⃣  Workers (batch 10,000)
+#     Workers    HMAC-SHA256    BLAKE2b MAC
+#           1        269,705        565,151
+#           2        284,672        474,012
+#           4        270,414        605,692
+#
+# 4️⃣  Big records: 64 × 4 MB (268 MB)
+#    serial                         1,235 MB/s
+#    threads (GIL released)         1,156 MB/s
+#    processes (pickled)              546 MB/s
+#
+# Notice:
+#   - Batch 10 is 7x slower than batch 10,000: the cost is the trip, not
+#     the HMAC. Too-large batches lose again (less overlap, bigger pickles)
+#   - Keyed BLAKE2b does about twice the records/s of HMAC-SHA256
+#   - For 4 MB records, processes spend half their time pickling; threads
+#     cost almost nothing over serial - and use every core when there are
+#     more, because the hashing runs without the GIL
+#   - The event loop stayed free the whole time (serial hashing blocks it)
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. One task per record drowns in IPC overhead - send BATCHES
+# 2. Small records: per-record Python work holds the GIL → processes
+# 3. Big records: hashlib/hmac release the GIL → threads, and no pickling
+# 4. Keep a bounded number of batches in flight and yield in order
+# 5. hmac.digest() and keyed BLAKE2b are the fast stdlib MACs
+#
+# =============================================================================
@@ -0,0 +1,341 @@
+"""
+=============================================================================
+DEMO RUNNER: ONE ENTRY POINT FOR EVERY WORKLOAD, MODE AND WORKER COUNT
+=============================================================================
+
+Why a Runner?
+-------------
+Every lesson script hard-codes its own worker count ("2 threads"), its own
+loop size ("100 million") and prints emoji progress lines - perfect for
+learning, useless for CAPACITY PLANNING. Some of them (08_non_daemon.py,
+10_deadlock.py) never exit at all.
+
+This runner takes the WORKLOADS from the lessons and lets you choose HOW
+to run them from the command line:
+
+    python demo_runner.py brew   --mode thread  --workers 8 --size 200
+    python demo_runner.py crunch --mode process --workers 4 --size 10000000
+    python demo_runner.py brew   --mode async   --workers 100 --tasks 1000
+    python demo_runner.py deadlock --mode thread --timeout 2   # exits!
+
+and prints one STRUCTURED timing record per run (JSON lines or CSV), ready
+to be collected into a spreadsheet:
+
+    {"workload": "crunch", "mode": "process", "workers": 4, "tasks": 4,
+     "size": 10000000, "status": "ok", "wall_s": 0.61, "cpu_s": 2.35, ...}
+
+The Workloads:
+--------------
+    ┌──────────┬───────────────────────────────┬──────────────────────────┐
+    │ Workload │ Taken from                    │ --size means             │
+    ├──────────┼───────────────────────────────┼──────────────────────────┤
+    │ brew     │ 01/02/06, 2. Asyncio/01-02    │ brew time in ms (I/O)    │
+    │ crunch   │ 03/04/09/10 (counting loop)   │ loop iterations (CPU)    │
+    │ encrypt  │ 2. Asyncio/05_process_async   │ payload length in chars  │
+    │ monitor  │ 2. Asyncio/07-08 (never ends) │ poll interval in ms      │
+    │ deadlock │ 2. Asyncio/10_deadlock        │ hold time in ms          │
+    └──────────┴───────────────────────────────┴──────────────────────────┘
+
+    deadlock has no process mode: every process would get its own copy of
+    the two locks, so nothing could ever deadlock and the run would say "ok".
+
+The Modes:
+----------
+    thread  → ThreadPoolExecutor(max_workers=N)
+    process → ProcessPoolExecutor(max_workers=N)
+    async   → one event loop, at most N coroutines at a time (Semaphore)
+              (CPU workloads have no async version: they run directly on
+               the loop, which is exactly why you should not do that!
+               A blocked loop can't enforce --timeout either, so such a
+               run is reported as "timeout" once it ends past the deadline)
+
+Timeouts:
+---------
+--timeout is a hard deadline for a whole run. Threads cannot be killed in
+Python, so after a timeout the runner prints the record with
+"status": "timeout", terminates worker processes and exits with code 124
+(the same code as the Unix `timeout` command).
+
+=============================================================================
+"""
+
+import argparse    # Command-line switches
+import asyncio     # For --mode async
+import csv         # For --format csv
+import json        # For --format json
+import os          # For cpu_count(), times() and _exit()
+import platform    # Machine description in every record
+import sys         # For stdout and the Python version
+import threading   # Locks for the deadlock workload
+import time        # For sleep() and perf_counter()
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import active_children
+
+TIMEOUT_EXIT_CODE = 124
+
+
+# =============================================================================
+# WORKLOADS (sync versions: used by thread and process modes)
+# =============================================================================
+
+def brew(task_id, size):
+    """I/O-bound: brew one chai for `size` milliseconds."""
+    time.sleep(size / 1000)
+    return task_id
+
+
+def crunch(task_id, size):
+    """CPU-bound: the counting loop from 03_gil_threading.py."""
+    count = 0
+    for _ in range(size):
+        count += 1
+    return count
+
+
+def encrypt(task_id, size):
+    """CPU-bound: the string-reversing 'encryption' from 05_process_async.py."""
+    data = "credit_card_1234" * (size // 16 + 1)
+    return len(f"🔒 {data[:size][::-1]}")
+
+
+def monitor(task_id, size):
+    """Never returns: the infinite monitoring loop from 08_non_daemon.py."""
+    while True:
+        time.sleep(size / 1000)
+
+
+_lock_a = threading.Lock()
+_lock_b = threading.Lock()
+
+
+def deadlock(task_id, size):
+    """
+    Even tasks take lock A then B, odd tasks take B then A (10_deadlock.py).
+    Two threads running at once will freeze forever.
+    """
+    first, second = (_lock_a, _lock_b) if task_id % 2 == 0 else (_lock_b, _lock_a)
+    with first:
+        time.sleep(size / 1000)
+        with second:
+            return task_id
+
+
+# =============================================================================
+# WORKLOADS (async versions: used by async mode)
+# =============================================================================
+
+async def brew_async(task_id, size):
+    await asyncio.sleep(size / 1000)
+    return task_id
+
+
+async def monitor_async(task_id, size):
+    while True:
+        await asyncio.sleep(size / 1000)
+
+
+async def deadlock_async(task_id, size, locks):
+    lock_a, lock_b = locks
+    first, second = (lock_a, lock_b) if task_id % 2 == 0 else (lock_b, lock_a)
+    async with first:
+        await asyncio.sleep(size / 1000)
+        async with second:
+            return task_id
+
+
+WORKLOADS = {
+    #  name       sync fn   async fn         default --size
+    "brew":     (brew,     brew_async,      100),
+    "crunch":   (crunch,   None,            1_000_000),
+    "encrypt":  (encrypt,  None,            1_000_000),
+    "monitor":  (monitor,  monitor_async,   100),
+    "deadlock": (deadlock, deadlock_async,  100),
+}
+
+
+# =============================================================================
+# RUNNING ONE BATCH IN EACH MODE
+# =============================================================================
+# Every runner returns "ok" or "timeout".
+
+def run_pool(executor_cls, fn, workers, tasks, size, timeout):
+    pool = executor_cls(max_workers=workers)
+    futures = [pool.submit(fn, task_id, size) for task_id in range(tasks)]
+    _, not_done = wait(futures, timeout=timeout)
+    if not_done:
+        pool.shutdown(wait=False, cancel_futures=True)
+        for child in active_children():
+            child.terminate()
+        return "timeout"
+    for future in futures:
+        future.result()  # Re-raise any worker exception
+    pool.shutdown()
+    return "ok"
+
+
+def run_async(sync_fn, async_fn, workers, tasks, size, timeout):
+    async def main():
+        limit = asyncio.Semaphore(workers)
+        locks = (asyncio.Lock(), asyncio.Lock())
+
+        async def one(task_id):
+            async with limit:
+                if async_fn is deadlock_async:
+                    return await async_fn(task_id, size, locks)
+                if async_fn is not None:
+                    return await async_fn(task_id, size)
+                return sync_fn(task_id, size)  # Blocks the loop!
+
+        await asyncio.wait_for(
+            asyncio.gather(*(one(task_id) for task_id in range(tasks))),
+            timeout,
+        )
+
+    start = time.perf_counter()
+    try:
+        asyncio.run(main())
+    except asyncio.TimeoutError:
+        return "timeout"
+    # A sync fn blocks the loop, so wait_for() only gets to check the
+    # deadline after it returns: go by the clock as well
+    if time.perf_counter() - start > timeout:
+        return "timeout"
+    return "ok"
+
+
+def run_once(workload, mode, workers, tasks, size, timeout):
+    """Runs one batch and returns its timing record (a dict)."""
+    sync_fn, async_fn, _ = WORKLOADS[workload]
+
+    cpu_before = os.times()
+    start = time.perf_counter()
+    if mode == "thread":
+        status = run_pool(ThreadPoolExecutor, sync_fn, workers, tasks, size, timeout)
+    elif mode == "process":
+        status = run_pool(ProcessPoolExecutor, sync_fn, workers, tasks, size, timeout)
+    else:
+        status = run_async(sync_fn, async_fn, workers, tasks, size, timeout)
+    wall = time.perf_counter() - start
+    cpu_after = os.times()
+
+    # User + system time of this process AND its (reaped) worker processes
+    cpu = sum(cpu_after[:4]) - sum(cpu_before[:4])
+    return {
+        "workload": workload,
+        "mode": mode,
+        "workers": workers,
+        "tasks": tasks,
+        "size": size,
+        "status": status,
+        "wall_s": round(wall, 6),
+        "cpu_s": round(cpu, 6),
+        "tasks_per_s": round(tasks / wall, 3) if status == "ok" else 0.0,
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "machine": platform.machine(),
+    }
+
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+class RecordWriter:
+    """Writes timing records to stdout as JSON lines or CSV."""
+
+    def __init__(self, fmt, stream=sys.stdout, header=True):
+        self.fmt = fmt
+        self.stream = stream
+        self.header = header
+        self._csv = None
+
+    def write(self, record):
+        if self.fmt == "json":
+            self.stream.write(json.dumps(record) + "\n")
+        else:
+            if self._csv is None:
+                self._csv = csv.DictWriter(self.stream, fieldnames=list(record))
+                if self.header:
+                    self._csv.writeheader()
+            self._csv.writerow(record)
+        self.stream.flush()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run any lesson workload with a chosen concurrency mode "
+                    "and print machine-readable timings.",
+    )
+    parser.add_argument("workload", choices=sorted(WORKLOADS))
+    parser.add_argument("--mode", choices=["thread", "process", "async"],
+                        default="thread")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="pool size / max concurrent coroutines")
+    parser.add_argument("--tasks", type=int, default=None,
+                        help="number of tasks (default: same as --workers)")
+    parser.add_argument("--size", type=int, default=None,
+                        help="work per task (meaning depends on the workload)")
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="hard deadline per run in seconds")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="how many times to run the batch")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--no-header", action="store_true",
+                        help="CSV only: skip the header row (when appending)")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workload == "deadlock" and args.mode == "process":
+        parser.error("deadlock needs locks SHARED by its workers; each process "
+                     "would get its own copy - use --mode thread or async")
+    if args.tasks is None:
+        args.tasks = args.workers
+    if args.size is None:
+        args.size = WORKLOADS[args.workload][2]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    writer = RecordWriter(args.format, header=not args.no_header)
+    for _ in range(args.repeat):
+        record = run_once(args.workload, args.mode, args.workers,
+                          args.tasks, args.size, args.timeout)
+        writer.write(record)
+        if record["status"] == "timeout":
+            # Stuck threads can't be joined or killed: leave right now
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(TIMEOUT_EXIT_CODE)
+    return 0
+
+
+# =============================================================================
+# REQUIRED: if __name__ == "__main__" GUARD (process mode spawns workers)
+# =============================================================================
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# =============================================================================
+# CAPACITY-PLANNING RECIPE
+# =============================================================================
+#
+# Sweep the worker count and collect everything into one CSV:
+#
+#     header=""                      # Only the first run writes the header
+#     for w in 1 2 4 8 16; do
+#         python demo_runner.py crunch --mode process --workers $w \
+#             --tasks 32 --size 5000000 --format csv --repeat 3 $header
+#         header="--no-header"
+#     done > crunch.csv
+#
+# Then look at tasks_per_s versus workers:
+#   - CPU-bound + thread mode  → flat line (the GIL, see 03_gil_threading.py)
+#   - CPU-bound + process mode → rises until you run out of cores
+#   - I/O-bound + async mode   → rises with --workers far beyond core count
+#
+# cpu_s / wall_s tells you how many cores a run really kept busy.
+#
+# =============================================================================
@@ -0,0 +1,381 @@
+"""
+=============================================================================
+IMPORT PROFILE: WHAT DOES IT COST TO START A DEMO (AND EACH WORKER)?
+=============================================================================
+
+The Problem:
+------------
+Before a demo prints its first emoji, Python has to IMPORT everything at
+the top of the file:
+
+    07_thread_download.py   import requests     ← pulls in urllib3, ssl,
+    03_async_three.py       import aiohttp        http, email, json... and
+                                                   costs real milliseconds
+
+For one script that's a one-off. But with the "spawn" start method
+(Windows, macOS, and any pool created with get_context("spawn")) EVERY
+worker process re-imports the main module - and pays again, even if the
+worker only counts numbers and never touches requests:
+
+    main ──spawn──► worker 1: import requests, aiohttp... then cpu_heavy()
+         ──spawn──► worker 2: import requests, aiohttp... then cpu_heavy()
+         ──spawn──► worker 3: ...
+
+Part 1: MEASURE (python -X importtime)
+--------------------------------------
+`python -X importtime` prints one line per imported module:
+
+    import time: self [us] | cumulative | imported package
+    import time:       412 |       9833 | asyncio
+
+This tool runs ONLY the top-level imports of a script that way (the demo
+itself never runs, so no sleeping or networking), parses the output and
+reports the heaviest modules, the cost of each direct import and any
+imports hidden inside functions.
+
+Part 2: DEFER (lazy imports)
+----------------------------
+importlib.util.LazyLoader creates the module object immediately but runs
+its code on FIRST ATTRIBUTE ACCESS:
+
+    requests = lazy_import("requests")   # ~free
+    ...
+    requests.get(url)                    # the real import happens here
+
+A worker that never touches `requests` never pays for it. One that does
+pays the same price, just later: the profile times both, because lazy
+only SAVES time for modules a run never uses.
+
+Usage:
+------
+    python import_profile.py "1. MultiThreading, MultiProcessing and GIL/07_thread_download.py"
+    python import_profile.py "2. Asyncio/03_async_three.py" --lazy aiohttp
+    python import_profile.py --spawn-benchmark --workers 4
+
+=============================================================================
+"""
+
+import argparse          # Command-line switches
+import ast               # Finding the import statements of a script
+import importlib         # Eager imports for the benchmark
+import importlib.util    # LazyLoader
+import os                # Environment flags for the benchmark children
+import statistics        # Median of repeated timings
+import subprocess        # Fresh interpreters for every measurement
+import sys               # sys.executable, sys.modules
+import time              # Wall-clock timings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+
+# =============================================================================
+# LAZY IMPORTS
+# =============================================================================
+
+def lazy_import(name):
+    """
+    Returns module `name`, deferring its execution until first attribute
+    access. Raises ModuleNotFoundError right away if it isn't installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# The same helper as source code, for the measured snippets
+LAZY_HELPER = '''
+import importlib.util, sys
+def lazy_import(name):
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    spec.loader = loader = importlib.util.LazyLoader(spec.loader)
+    module = sys.modules[name] = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+'''
+
+
+# =============================================================================
+# FINDING A SCRIPT'S IMPORTS
+# =============================================================================
+
+def find_imports(path):
+    """
+    Returns:
+        tuple: (top-level import statements as source, [(lineno, source)]
+                of imports nested inside functions or blocks)
+    """
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source)
+    top = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    nested = [(node.lineno, ast.get_source_segment(source, node))
+              for node in ast.walk(tree)
+              if isinstance(node, (ast.Import, ast.ImportFrom)) and node not in top]
+    return [ast.get_source_segment(source, node) for node in top], sorted(nested)
+
+
+def make_snippet(statements, lazy=(), use=False):
+    """
+    Builds the code to measure: the script's imports, with `import X` for
+    every X in `lazy` replaced by `X = lazy_import("X")`. (`from X import
+    name` stays eager: it needs the module's contents right away.) With
+    `use`, each lazy module is also touched once, as the script would.
+    """
+    lines, touches = [], []
+    for statement in statements:
+        node = ast.parse(statement).body[0]
+        if isinstance(node, ast.Import) and all(a.name in lazy for a in node.names):
+            for alias in node.names:
+                lines.append(f"{alias.asname or alias.name} = lazy_import({alias.name!r})")
+                touches.append(f"{alias.asname or alias.name}.__dict__")
+        else:
+            lines.append(statement)
+    if touches:
+        lines.insert(0, LAZY_HELPER)
+    if use:
+        lines.extend(touches)               # First attribute access: the real import
+    return "\n".join(lines)
+
+
+# =============================================================================
+# MEASURING
+# =============================================================================
+
+def run_importtime(snippet):
+    """
+    Runs the snippet under -X importtime in a fresh interpreter.
+
+    Returns:
+        tuple: (list of {"module", "self_us", "cumulative_us", "depth"},
+                error message or None)
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", snippet],
+                          capture_output=True, text=True)
+    rows, errors = [], []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            errors.append(line)
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append({
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                # importtime indents nested imports by 2 spaces per level
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            })
+        except ValueError:
+            continue  # The header line
+    error = errors[-1] if proc.returncode and errors else None
+    return rows, error
+
+
+def time_startup(snippet, repeat):
+    """Median wall time (seconds) to start Python and run the snippet."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", snippet], capture_output=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def profile_script(path, lazy=(), top=10, repeat=5):
+    """Prints the import profile of one entry point (eager vs lazy)."""
+    statements, nested = find_imports(path)
+    eager = make_snippet(statements)
+    rows, error = run_importtime(eager)
+    # Python's own startup imports (encodings, site...) come first, at
+    # the top level; everything the script added comes after them
+    baseline = {r["module"] for r in run_importtime("pass")[0]}
+    added = [r for r in rows if r["module"] not in baseline]
+
+    print(f"\n📄 {path}")
+    print("-" * 70)
+    if error:
+        print(f"⚠️  {error}")
+    print(f"{'Direct import':<34} {'Cumulative':>12}")
+    direct = [r for r in added if r["depth"] == 0]
+    for r in direct:
+        print(f"  {r['module']:<32} {r['cumulative_us'] / 1000:>10.1f}ms")
+    print(f"  {'TOTAL (' + str(len(added)) + ' modules)':<32} "
+          f"{sum(r['self_us'] for r in added) / 1000:>10.1f}ms")
+
+    print(f"\n{'Heaviest modules (self time)':<34} {'Self':>12}")
+    for r in sorted(added, key=lambda r: r["self_us"], reverse=True)[:top]:
+        print(f"  {r['module']:<32} {r['self_us'] / 1000:>10.1f}ms")
+
+    if nested:
+        print("\nImports inside functions (paid on first call, not at startup):")
+        for lineno, statement in nested:
+            print(f"  line {lineno}: {statement}")
+
+    base = time_startup("pass", repeat)
+    before = time_startup(eager, repeat)
+    print(f"\n⏱️  Startup (median of {repeat}): bare python {base * 1000:.1f}ms, "
+          f"with imports {before * 1000:.1f}ms")
+    if lazy:
+        after = time_startup(make_snippet(statements, lazy), repeat)
+        used = time_startup(make_snippet(statements, lazy, use=True), repeat)
+        print(f"   with lazy {', '.join(lazy)}, never used: {after * 1000:.1f}ms "
+              f"({(before - after) * 1000:+.1f}ms saved)")
+        print(f"   with lazy {', '.join(lazy)}, then used:  {used * 1000:.1f}ms "
+              f"({(before - used) * 1000:+.1f}ms saved)")
+
+
+# =============================================================================
+# SPAWNED WORKERS: EAGER vs LAZY HEAVY IMPORTS
+# =============================================================================
+#
+# Stand-ins for requests/aiohttp that ship with Python, so the benchmark
+# runs everywhere: all of them are imported at the top of this module when
+# a benchmark child asks for it (DEMO_IMPORTS=eager|lazy), so every spawned
+# worker pays for them while re-importing the main module.
+
+HEAVY_MODULES = ["asyncio", "http.server", "urllib.request", "email.mime.multipart",
+                 "xml.dom.minidom", "decimal", "logging.handlers", "ssl", "json",
+                 "unittest.mock", "tarfile", "zipfile"]
+
+if os.environ.get("DEMO_IMPORTS") == "eager":
+    for _name in HEAVY_MODULES:
+        importlib.import_module(_name)
+elif os.environ.get("DEMO_IMPORTS") == "lazy":
+    for _name in HEAVY_MODULES:
+        lazy_import(_name)
+
+
+def cpu_heavy(n):
+    """A worker task that needs none of the heavy modules."""
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+def spawn_child(workers):
+    """Runs in a benchmark child: time a spawn pool's first results."""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+        list(pool.map(cpu_heavy, [10_000] * workers))
+    print(time.perf_counter() - start)
+
+
+def spawn_benchmark(workers, repeat):
+    print("=" * 70)
+    print(f"🚀 SPAWNED WORKERS: {workers} workers, {len(HEAVY_MODULES)} heavy "
+          f"modules at the top of the main module")
+    print("=" * 70)
+    results = {}
+    for mode in ("none", "eager", "lazy"):
+        env = dict(os.environ, DEMO_IMPORTS=mode)
+        times = []
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, __file__, "--spawn-child", str(workers)],
+                                 capture_output=True, text=True, env=env, check=True)
+            times.append(float(out.stdout.strip().splitlines()[-1]))
+        results[mode] = statistics.median(times)
+    labels = {"none": "no heavy imports", "eager": "eager imports (before)",
+              "lazy": "lazy imports (after)"}
+    for mode, seconds in results.items():
+        print(f"  {labels[mode]:<26} {seconds * 1000:>8.1f}ms to start {workers} "
+              f"workers and get results")
+    saved = results["eager"] - results["lazy"]
+    print(f"\n💡 Lazy imports save {saved * 1000:.1f}ms per pool start "
+          f"(~{saved / workers * 1000:.1f}ms per spawned worker)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Profile the import cost of demo entry points.")
+    parser.add_argument("scripts", nargs="*", help="demo scripts to profile")
+    parser.add_argument("--lazy", action="append", default=[],
+                        help="module to import lazily in the 'after' run; repeatable")
+    parser.add_argument("--top", type=int, default=10, help="heaviest modules to list")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions")
+    parser.add_argument("--spawn-benchmark", action="store_true",
+                        help="time spawned workers with eager vs lazy imports")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--spawn-child", type=int, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.spawn_child:
+        spawn_child(args.spawn_child)
+        return
+    for script in args.scripts:
+        profile_script(script, lazy=args.lazy, top=args.top, repeat=args.repeat)
+    if args.spawn_benchmark:
+        print()
+        spawn_benchmark(args.workers, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
+
+
+# =============================================================================
+# EXAMPLE OUTPUT
+# =============================================================================
+#
+# $ python import_profile.py "2. Asyncio/03_async_three.py" --lazy aiohttp \
+#       --top 5 --spawn-benchmark
+#
+# 📄 2. Asyncio/03_async_three.py
+# ----------------------------------------------------------------------
+# Direct import                        Cumulative
+#   asyncio                                39.4ms
+#   aiohttp                               189.5ms
+#   TOTAL (211 modules)                   229.0ms
+#
+# Heaviest modules (self time)               Self
+#   aiohttp.connector                      62.8ms
+#   frozenlist._frozenlist                 13.4ms
+#   aiohttp.tracing                         8.3ms
+#   attr._make                              5.3ms
+#   attr.validators                         5.3ms
+#
+# ⏱️  Startup (median of 5): bare python 38.3ms, with imports 231.6ms
+#    with lazy aiohttp, never used: 82.7ms (+148.9ms saved)
+#    with lazy aiohttp, then used:  232.1ms (-0.5ms saved)
+#
+# ======================================================================
+# 🚀 SPAWNED WORKERS: 4 workers, 12 heavy modules at the top of the main module
+# ======================================================================
+#   no heavy imports              441.8ms to start 4 workers and get results
+#   eager imports (before)        698.2ms to start 4 workers and get results
+#   lazy imports (after)          500.6ms to start 4 workers and get results
+#
+# 💡 Lazy imports save 197.6ms per pool start (~49.4ms per spawned worker)
+#
+# 03_async_three.py USES aiohttp, so lazy saves it nothing: the import just
+# moves to the first session. The saving is real only for processes that
+# never touch the module - like the spawned workers above.
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. -X importtime shows where startup time goes, module by module
+# 2. Measure only the imports: no need to run (or wait for) the demo
+# 3. With "spawn", every worker re-imports the main module's imports
+# 4. LazyLoader defers a module until first use - unused means free,
+#    used means the same cost, paid later
+# 5. Keep imports at the top of the file: lazy is a tool for heavy,
+#    optional dependencies, not for `time`
+#
+# =============================================================================
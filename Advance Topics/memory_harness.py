@@ -0,0 +1,439 @@
+"""
+=============================================================================
+MEMORY HARNESS: HOW MUCH MEMORY DOES EACH DEMO (AND EACH WORKER) USE?
+=============================================================================
+
+Why a Harness?
+--------------
+Every lesson reports TIME, none reports MEMORY. Yet memory is what runs
+out first when you scale a demo up:
+
+    08_thread_lock.py       10 threads       → what does one thread cost?
+    07_thread_download.py   resp.content     → every URL's body in RAM
+    02_async_two.py         gather(...)      → what does one task cost?
+    09_process_one.py       Process(...)     → a whole interpreter each
+
+This harness runs ANY demo unchanged and measures it from the outside:
+
+    python memory_harness.py "1. MultiThreading, MultiProcessing and GIL/08_thread_lock.py"
+    python memory_harness.py "2. Asyncio/02_async_two.py" --top 5 --report mem.md
+    python memory_harness.py demo.py --budget thread=0.5 --budget task=0.01
+
+What It Measures:
+-----------------
+    tracemalloc   Python heap: peak, growth, and WHICH LINES allocate
+                  (a snapshot at the start, one near the PEAK, one at exit)
+    RSS sampling  The whole process as the OS sees it (/proc, every 10ms),
+                  including thread stacks and C libraries
+    Workers       Peak live threads, asyncio tasks and child processes,
+                  and the heap growth shared out among the threads and
+                  tasks → a rough memory cost PER WORKER, which --budget
+                  checks (exit code 1 if a budget is exceeded, so it can
+                  guard CI)
+
+    ┌──────────────┐ runpy  ┌──────────────────────────────────────────┐
+    │ memory       │ ─────► │ demo's __main__ (unchanged)              │
+    │ harness      │        └──────────────────────────────────────────┘
+    │  sampler ────┼──► every 10ms: RSS, threads, tasks, children,
+    │  thread      │             snapshot when the heap hits a new peak
+    └──────────────┘
+
+Notes:
+------
+  - The demo runs IN the harness process (child processes are forked from
+    it), so its own imports count as heap growth too
+  - tracemalloc slows allocation-heavy code down (often 2-4x); compare
+    memory between runs, not wall times
+  - Child process memory comes from sampling /proc/<pid>/status, so very
+    short-lived children may be missed
+
+=============================================================================
+"""
+
+import argparse          # Command-line switches
+import asyncio           # To count live tasks
+import json              # For --report *.json
+import os                # For getpid() and paths
+import runpy             # Runs the demo as __main__
+import sys               # argv for the demo
+import sysconfig         # Where the standard library and packages live
+import threading         # The sampler thread and thread counts
+import time              # Sampling interval and wall time
+import tracemalloc       # Python heap tracing
+from multiprocessing import active_children
+
+# Stack depth recorded per allocation: deep enough to walk out of the
+# standard library (threading, asyncio, requests...) back to the demo's line
+TRACE_FRAMES = 25
+
+# Code that is NOT the demo: the harness, the stdlib and installed packages
+NOT_DEMO = tuple(os.path.realpath(p) for p in {
+    os.path.abspath(__file__),
+    *(sysconfig.get_paths()[key]
+      for key in ("stdlib", "platstdlib", "purelib", "platlib")),
+})
+
+
+# =============================================================================
+# READING MEMORY FROM /proc
+# =============================================================================
+
+def read_status(pid="self"):
+    """Returns {"VmRSS": bytes, "VmHWM": bytes} for a process (empty if gone)."""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    values[key] = int(rest.split()[0]) * 1024
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        pass
+    return values
+
+
+# =============================================================================
+# COUNTING LIVE ASYNCIO TASKS
+# =============================================================================
+#
+# The sampler thread can't ask another thread's event loop for its tasks,
+# so we count them where they are born: every gather()/create_task() ends
+# up in BaseEventLoop.create_task().
+
+class TaskCounter:
+    def __init__(self):
+        self.live = 0
+        self.peak = 0
+        self._original = None
+
+    def install(self):
+        self._original = original = asyncio.BaseEventLoop.create_task
+        counter = self
+
+        def create_task(loop, *args, **kwargs):
+            task = original(loop, *args, **kwargs)
+            counter.live += 1
+            counter.peak = max(counter.peak, counter.live)
+            task.add_done_callback(counter._done)
+            return task
+
+        asyncio.BaseEventLoop.create_task = create_task
+
+    def _done(self, task):
+        self.live -= 1
+
+    def uninstall(self):
+        if self._original is not None:
+            asyncio.BaseEventLoop.create_task = self._original
+
+
+# =============================================================================
+# THE SAMPLER
+# =============================================================================
+
+class Sampler(threading.Thread):
+    """
+    Samples RSS, worker counts and child RSS every `interval` seconds, and
+    takes a tracemalloc snapshot whenever the heap grows past its previous
+    peak by `snapshot_step` (at most once per 20 intervals).
+    """
+
+    def __init__(self, interval, tasks, snapshot_step=0.10):
+        super().__init__(name="memory-sampler", daemon=True)
+        self.interval = interval
+        self.tasks = tasks
+        self.snapshot_step = snapshot_step
+        self.stop = threading.Event()
+        self.peak_rss = 0
+        self.peak_threads = 0
+        self.peak_children = 0
+        self.child_peak_rss = {}         # pid → peak RSS seen
+        self.peak_snapshot = None
+        self._snapshot_at = 0
+        self._last_snapshot = 0.0
+
+    def run(self):
+        while not self.stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        self.peak_rss = max(self.peak_rss, read_status().get("VmRSS", 0))
+        # Don't count the sampler itself
+        self.peak_threads = max(self.peak_threads, threading.active_count() - 1)
+        children = active_children()
+        self.peak_children = max(self.peak_children, len(children))
+        for child in children:
+            rss = read_status(child.pid).get("VmRSS", 0)
+            self.child_peak_rss[child.pid] = max(self.child_peak_rss.get(child.pid, 0), rss)
+
+        current = tracemalloc.get_traced_memory()[0]
+        now = time.perf_counter()
+        if (current > self._snapshot_at * (1 + self.snapshot_step)
+                and now - self._last_snapshot > self.interval * 20):
+            self.peak_snapshot = tracemalloc.take_snapshot()
+            self._snapshot_at = current
+            self._last_snapshot = now
+
+
+# =============================================================================
+# RUNNING ONE DEMO
+# =============================================================================
+
+def _demo_frame(traceback):
+    """The most recent frame that belongs to the demo (None if there is none)."""
+    for frame in reversed(traceback):            # Most recent call first
+        name = frame.filename
+        if name.startswith("<"):                 # <frozen ...>, <string>
+            continue
+        if not os.path.realpath(name).startswith(NOT_DEMO):
+            return frame
+    return None
+
+
+def _by_demo_line(snapshot):
+    """Groups allocations by the demo line that (directly or not) made them."""
+    totals = {}
+    for stat in snapshot.statistics("traceback"):
+        frame = _demo_frame(stat.traceback)
+        if frame is None:
+            continue    # Harness, sampler or interpreter internals
+        size, count = totals.get((frame.filename, frame.lineno), (0, 0))
+        totals[(frame.filename, frame.lineno)] = (size + stat.size, count + stat.count)
+    return totals
+
+
+def top_lines(snapshot, baseline, limit):
+    """
+    The `limit` demo lines whose allocations grew most since baseline.
+
+    Allocations made inside the stdlib or a package (threading.Thread(),
+    requests.get()...) are charged to the demo line that called them.
+    """
+    before, after = _by_demo_line(baseline), _by_demo_line(snapshot)
+    rows = []
+    for (filename, lineno), (size, count) in after.items():
+        old_size, old_count = before.get((filename, lineno), (0, 0))
+        if size > old_size:
+            rows.append({
+                "file": os.path.relpath(filename),
+                "line": lineno,
+                "size_diff": size - old_size,
+                "count_diff": count - old_count,
+            })
+    rows.sort(key=lambda row: row["size_diff"], reverse=True)
+    return rows[:limit]
+
+
+def profile_demo(path, argv=(), interval=0.01, top=10):
+    """
+    Runs the demo at `path` as __main__ under tracemalloc and the sampler.
+
+    Returns:
+        dict: the memory report for this demo
+    """
+    tasks = TaskCounter()
+    tasks.install()
+    tracemalloc.start(TRACE_FRAMES)
+    baseline = tracemalloc.take_snapshot()
+    base_traced = tracemalloc.get_traced_memory()[0]
+    base_rss = read_status().get("VmRSS", 0)
+    base_threads = threading.active_count()
+
+    sampler = Sampler(interval, tasks)
+    sampler.start()
+    saved_argv = sys.argv
+    sys.argv = [path, *argv]
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            status = f"exit {exc.code}"
+    except BaseException as exc:      # Report the crash, keep the numbers
+        status = f"error: {type(exc).__name__}: {exc}"
+    finally:
+        wall = time.perf_counter() - start
+        sys.argv = saved_argv
+        sampler.stop.set()
+        sampler.join()
+        sampler.sample()
+        final = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        tasks.uninstall()
+
+    heap_growth = peak - base_traced
+    workers = {
+        "thread": max(0, sampler.peak_threads - base_threads),
+        "task": tasks.peak,
+        "process": sampler.peak_children,
+    }
+    # Threads and tasks share this process's heap: split the growth across
+    # ALL of them, instead of charging the whole of it to each kind
+    in_process = workers["thread"] + workers["task"]
+    per_worker = {kind: heap_growth / in_process
+                  for kind, count in workers.items() if count and kind != "process"}
+    if sampler.child_peak_rss:
+        per_worker["process"] = max(sampler.child_peak_rss.values())
+
+    return {
+        "demo": path,
+        "status": status,
+        "wall_s": round(wall, 3),
+        "rss_start": base_rss,
+        "rss_peak": max(sampler.peak_rss, base_rss),
+        "heap_peak_growth": heap_growth,
+        "heap_retained": current - base_traced,
+        "workers": workers,
+        "per_worker": {k: int(v) for k, v in per_worker.items()},
+        "top_at_peak": top_lines(sampler.peak_snapshot or final, baseline, top),
+        "top_retained": top_lines(final, baseline, top),
+    }
+
+
+def check_budgets(report, budgets):
+    """Returns a list of (kind, measured bytes, budget bytes, ok)."""
+    results = []
+    for kind, budget_mb in budgets.items():
+        measured = report["per_worker"].get(kind)
+        if measured is None:
+            continue
+        budget = budget_mb * 1024 * 1024
+        results.append((kind, measured, budget, measured <= budget))
+    return results
+
+
+# =============================================================================
+# REPORTS
+# =============================================================================
+
+def mb(n):
+    return f"{n / 1024 / 1024:,.2f} MB"
+
+
+PLURALS = {"thread": "threads", "task": "tasks", "process": "processes"}
+
+
+def format_report(report, budget_results):
+    """The report as Markdown (also fine to read in a terminal)."""
+    lines = [
+        f"## {report['demo']}",
+        "",
+        f"- Status: {report['status']} ({report['wall_s']:.2f}s)",
+        f"- RSS: {mb(report['rss_start'])} → peak {mb(report['rss_peak'])}",
+        f"- Python heap: peak +{mb(report['heap_peak_growth'])}, "
+        f"retained at exit +{mb(report['heap_retained'])}",
+        "- Peak workers: " + ", ".join(f"{PLURALS[kind]} {n}"
+                                      for kind, n in report["workers"].items()),
+    ]
+    for kind, value in report["per_worker"].items():
+        what = "peak child RSS" if kind == "process" else "heap growth / worker"
+        lines.append(f"- Per {kind}: ~{mb(value)} ({what})")
+    for kind, measured, budget, ok in budget_results:
+        mark = "✅" if ok else "❌"
+        lines.append(f"- Budget {kind}: {mb(measured)} / {mb(budget)} {mark}")
+
+    for title, key in (("Top allocators at peak", "top_at_peak"),
+                       ("Still allocated at exit", "top_retained")):
+        lines += ["", f"### {title}", "",
+                  "| Size | Blocks | Line |", "|---:|---:|---|"]
+        for row in report[key]:
+            lines.append(f"| {row['size_diff'] / 1024:+,.1f} KB | {row['count_diff']:+,} "
+                         f"| {row['file']}:{row['line']} |")
+    return "\n".join(lines) + "\n"
+
+
+def parse_budget(text):
+    kind, _, value = text.partition("=")
+    if kind not in ("thread", "task", "process") or not value:
+        raise argparse.ArgumentTypeError("use thread=MB, task=MB or process=MB")
+    return kind, float(value)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run demos under tracemalloc + RSS sampling and report memory.")
+    parser.add_argument("demos", nargs="+", help="demo scripts to run")
+    parser.add_argument("--top", type=int, default=10,
+                        help="allocating lines to show per report")
+    parser.add_argument("--interval", type=float, default=0.01,
+                        help="sampling interval in seconds")
+    parser.add_argument("--budget", type=parse_budget, action="append", default=[],
+                        help="per-worker budget, e.g. thread=0.5 (MB); repeatable")
+    parser.add_argument("--report", help="also write the report (.md or .json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    budgets = dict(args.budget)
+    reports, texts, over_budget = [], [], False
+
+    for demo in args.demos:
+        print(f"\n🧪 Running {demo} under the memory harness...\n", flush=True)
+        report = profile_demo(demo, interval=args.interval, top=args.top)
+        results = check_budgets(report, budgets)
+        report["budgets"] = [{"kind": k, "measured": m, "budget": b, "ok": ok}
+                             for k, m, b, ok in results]
+        over_budget |= not all(ok for *_, ok in results)
+        reports.append(report)
+        texts.append(format_report(report, results))
+        print("\n" + texts[-1])
+
+    if args.report:
+        with open(args.report, "w") as f:
+            if args.report.endswith(".json"):
+                json.dump(reports, f, indent=2)
+            else:
+                f.write("# Memory report\n\n" + "\n".join(texts))
+        print(f"📄 Report written to {args.report}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# =============================================================================
+# EXAMPLE OUTPUT
+# =============================================================================
+#
+# $ python memory_harness.py "1. MultiThreading, .../08_thread_lock.py" --top 3 \
+#       --budget thread=0.05
+#
+# ## 1. MultiThreading, MultiProcessing and GIL/08_thread_lock.py
+#
+# - Status: ok (7.78s)
+# - RSS: 22.11 MB → peak 23.05 MB
+# - Python heap: peak +0.17 MB, retained at exit +0.11 MB
+# - Peak workers: threads 10, tasks 0, processes 0
+# - Per thread: ~0.02 MB (heap growth / worker)
+# - Budget thread: 0.02 MB / 0.05 MB ✅
+#
+# ### Top allocators at peak
+#
+# | Size | Blocks | Line |
+# |---:|---:|---|
+# | +24.2 KB | +220 | 1. MultiThreading, MultiProcessing and GIL/08_thread_lock.py:105 |
+# | +3.3 KB | +26 | 1. MultiThreading, MultiProcessing and GIL/08_thread_lock.py:109 |
+# | +0.5 KB | +12 | 1. MultiThreading, MultiProcessing and GIL/08_thread_lock.py:73 |
+#
+# Line 105 is the list comprehension creating the 10 Thread objects: the
+# allocations inside threading.py are charged to the demo line that caused
+# them. With 02_multiprocessing.py the report shows "Per process: ~16 MB
+# (peak child RSS)" - about 800 times the cost of a thread's Python heap.
+#
+# =============================================================================
+
+# =============================================================================
+# KEY TAKEAWAYS
+# =============================================================================
+#
+# 1. tracemalloc answers "which LINE allocates?"; RSS answers "how big is
+#    the process really?" - you need both
+# 2. Snapshot near the PEAK: transient buffers are gone by the end
+# 3. Heap growth / peak workers gives a first per-worker cost to budget
+# 4. Processes cost a whole interpreter each; threads and tasks far less
+#
+# =============================================================================